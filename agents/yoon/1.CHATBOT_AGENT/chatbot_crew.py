@@ -1,32 +1,39 @@
 import os
-from crewai import Crew, Agent, Task
+from crewai import Crew, Agent, Task, LLM
 from crewai.project import CrewBase, task, crew
 from env import OPENAI_API_KEY, GEMINI_API_KEY
-from tools import naver_search_tool, google_search_tool
-from db import get_conversation_context
+from tools import federated_search_tool
 
 os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
 os.environ["GEMINI_API_KEY"] = GEMINI_API_KEY
 
+DEFAULT_LLM_MODEL = "gemini/gemini-2.0-flash-lite"
+
 
 @CrewBase
 class ChatBotCrew:
+    # 크루는 풀에서 재사용되므로 채팅별 값(메시지, 대화 맥락)은 kickoff inputs 로만 전달합니다.
+    # 필요한 inputs: message, conversation_context
+    def __init__(self, llm_model: str = DEFAULT_LLM_MODEL):
+        self.llm = LLM(model=llm_model)
+
     # agent 데코레이터 없이 만들었으므로 cerwai의 룰을 어긴 것임. 하지만 유연한 코드 작성을 위해 그 룰을 지킬 필요는 없어보임.
     # 대표적인 예시로써 agents.yaml 을 자동으로 불러와서 충돌이 발생할 수 있음. 따라서 agents.yaml과 tasks.yaml은 삭제해야 함.
     def create_agent(self) -> Agent:
         return Agent(
             role="전문 소통 분석가",
             goal="사용자의 질문을 심층적으로 분석하고, 가장 정확하고 유용한 정보를 찾아내어 전달한다.",
-            backstory=f"""
+            backstory="""
             당신은 최첨단 AI 기술과 깊이 있는 데이터 분석 능력을 겸비한 전문 정보 분석가입니다.
             어떤 질문이든 그 본질을 파악하고, 웹 검색과 같은 강력한 도구를 활용하여 사용자에게 가장 필요한 맞춤형 답변을 제공하는 것을 사명으로 삼고 있습니다.
 
-            {get_conversation_context()}
+            {conversation_context}
 
             **중요**: 위 대화 기록을 참고해서 이전 질문들을 기억하고 개인화된 답변을 제공하세요.
             """,
-            llm="gemini/gemini-2.0-flash-lite",
-            tools=[naver_search_tool, google_search_tool],
+            llm=self.llm,
+            # 네이버/구글/웹 검색을 한 번의 도구 호출로 병렬 수행합니다.
+            tools=[federated_search_tool],
         )
 
     @task
@@ -0,0 +1,73 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Hashable, Iterator
+from crewai import Crew
+
+# 크루 풀 설정
+MAX_IDLE_CREWS_PER_CONFIG = 4  # 설정별로 보관할 대기 크루 수 (CrewRunner 워커 수와 맞춤)
+
+
+class CrewPool:
+    """
+    미리 만들어 둔 크루를 설정별로 보관하고 요청마다 빌려주는 풀입니다.
+
+    크루 객체는 동시에 두 요청이 같이 쓸 수 없으므로 checkout 동안은 한 요청이 독점하고,
+    끝나면 다시 풀에 돌려놓습니다. 실행 중 예외가 난 크루는 상태를 믿을 수 없으므로 버립니다.
+    요청별 값은 kickoff(inputs=...) 로 전달해야 합니다.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., Crew],
+        max_idle: int = MAX_IDLE_CREWS_PER_CONFIG,
+    ):
+        self._factory = factory
+        self.max_idle = max_idle
+        self._idle: dict[Hashable, list[Crew]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"created": 0, "reused": 0, "discarded": 0}
+
+    @staticmethod
+    def _key(config: dict) -> Hashable:
+        return tuple(sorted(config.items()))
+
+    def warm(self, count: int, **config) -> None:
+        """설정에 맞는 크루를 count 개까지 미리 만들어 둡니다."""
+        key = self._key(config)
+        while True:
+            with self._lock:
+                if len(self._idle.get(key, [])) >= min(count, self.max_idle):
+                    return
+            crew = self._factory(**config)
+            with self._lock:
+                self._stats["created"] += 1
+                self._idle.setdefault(key, []).append(crew)
+
+    @contextmanager
+    def checkout(self, **config) -> Iterator[Crew]:
+        key = self._key(config)
+        with self._lock:
+            idle = self._idle.get(key)
+            crew = idle.pop() if idle else None
+            self._stats["reused" if crew is not None else "created"] += 1
+
+        if crew is None:
+            crew = self._factory(**config)
+
+        try:
+            yield crew
+        except BaseException:
+            with self._lock:
+                self._stats["discarded"] += 1
+            raise
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(crew)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle"] = sum(len(crews) for crews in self._idle.values())
+        return stats
@@ -1,53 +1,399 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
-from datetime import datetime
+import atexit
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable
+from memory_compactor import summarize_turns
 
+# 저장소 설정 ("firebase" 또는 "sqlite", 환경 변수 CONVERSATION_STORE 로 선택)
+CONVERSATION_STORE = os.getenv("CONVERSATION_STORE", "firebase")
+FIREBASE_CREDENTIAL_PATH = "crewai-43359-firebase-adminsdk-fbsvc-cdcf23933c.json"
+SQLITE_DB_PATH = os.getenv("CONVERSATION_DB_PATH", "data/conversations.db")
 
-class FirebaseDB:
+# 대화 기록 쓰기 설정
+WRITE_BATCH_SIZE = 20  # 이만큼 쌓이면 바로 기록 (Firestore batch 최대 500건)
+WRITE_FLUSH_INTERVAL_SECONDS = 2.0  # 쌓인 기록을 최소 이 간격으로 기록
+MAX_PENDING_WRITES = 5000  # 저장소 장애 시 메모리에 보관할 최대 기록 수
 
-    def __init__(self):
-        cred = credentials.Certificate(
-            "crewai-43359-firebase-adminsdk-fbsvc-cdcf23933c.json"
-        )
+# 대화 맥락 설정
+CONTEXT_WINDOW = 10  # 맥락에 그대로 넣는 최근 대화 수 (요약되지 않은 대화가 이만큼 쌓이면 요약 시작)
+MAX_UNSUMMARIZED_TURNS = 200  # 요약이 계속 실패할 때 채팅별로 메모리에 보관할 요약 전 대화 상한
+VERBATIM_TURNS = 4  # 요약 후에도 그대로 남겨 둘 최근 대화 수
+CONTEXT_CACHE_MAX_CHATS = 1024  # 메모리에 맥락을 유지할 최대 채팅 수 (LRU)
+
+
+class ConversationBackend(ABC):
+    """
+    대화 기록 저장소 인터페이스입니다.
+    기록은 {"chat_id", "user_message", "bot_response", "timestamp"} 형태의 dict 입니다.
+    """
+
+    @abstractmethod
+    def write(self, records: list[dict]) -> None:
+        """기록들을 한 번에 저장합니다. 실패하면 예외를 발생시킵니다."""
+
+    @abstractmethod
+    def load_recent(self, chat_id: int, limit: int) -> list[dict]:
+        """채팅의 최근 limit 개 기록을 오래된 순으로 반환합니다."""
+
+    @abstractmethod
+    def load_summary(self, chat_id: int) -> dict | None:
+        """채팅의 누적 요약 {"summary", "covered_until"} 을 반환합니다."""
+
+    @abstractmethod
+    def save_summary(self, chat_id: int, summary: str, covered_until: datetime) -> None:
+        """covered_until 시각까지의 대화를 요약한 내용을 저장합니다."""
+
+
+class FirebaseBackend(ConversationBackend):
+
+    def __init__(self, credential_path: str = FIREBASE_CREDENTIAL_PATH):
+        # SQLite 만 쓰는 환경에서는 firebase 패키지가 없어도 되도록 여기서 불러옵니다.
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+
+        cred = credentials.Certificate(credential_path)
         firebase_admin.initialize_app(cred)
 
+        self._firestore = firestore
         self.db = firestore.client()
         self.collection_name = "conversation_history"
+        self.summary_collection_name = "conversation_summaries"
+
+    def write(self, records: list[dict]) -> None:
+        collection = self.db.collection(self.collection_name)
+        batch = self.db.batch()
+        for doc_data in records:
+            batch.set(collection.document(), doc_data)
+        batch.commit()
+
+    def load_recent(self, chat_id: int, limit: int) -> list[dict]:
+        # chat_id + timestamp 복합 색인이 필요합니다.
+        docs = (
+            self.db.collection(self.collection_name)
+            .where(filter=self._firestore.FieldFilter("chat_id", "==", chat_id))
+            .order_by("timestamp", direction="DESCENDING")
+            .limit(limit)
+            .stream()
+        )
+        return list(reversed([doc.to_dict() for doc in docs]))
+
+    def load_summary(self, chat_id: int) -> dict | None:
+        doc = self.db.collection(self.summary_collection_name).document(str(chat_id)).get()
+        return doc.to_dict() if doc.exists else None
+
+    def save_summary(self, chat_id: int, summary: str, covered_until: datetime) -> None:
+        self.db.collection(self.summary_collection_name).document(str(chat_id)).set(
+            {"summary": summary, "covered_until": covered_until}
+        )
+
+
+class SQLiteBackend(ConversationBackend):
+    """네트워크 없이 동작하는 로컬 저장소입니다. (단일 노드 배포, 오프라인 부하 테스트용)"""
+
+    def __init__(self, db_path: str = SQLITE_DB_PATH):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS conversation_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id INTEGER NOT NULL,
+                user_message TEXT NOT NULL,
+                bot_response TEXT NOT NULL,
+                timestamp TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_conversation_chat_timestamp
+                ON conversation_history (chat_id, timestamp);
+            CREATE TABLE IF NOT EXISTS conversation_summaries (
+                chat_id INTEGER PRIMARY KEY,
+                summary TEXT NOT NULL,
+                covered_until TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def write(self, records: list[dict]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO conversation_history "
+                "(chat_id, user_message, bot_response, timestamp) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        doc_data["chat_id"],
+                        doc_data["user_message"],
+                        doc_data["bot_response"],
+                        doc_data["timestamp"].isoformat(),
+                    )
+                    for doc_data in records
+                ],
+            )
+            self._conn.commit()
+
+    def load_recent(self, chat_id: int, limit: int) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chat_id, user_message, bot_response, timestamp "
+                "FROM conversation_history WHERE chat_id = ? "
+                "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (chat_id, limit),
+            ).fetchall()
+        return [
+            {
+                "chat_id": row[0],
+                "user_message": row[1],
+                "bot_response": row[2],
+                "timestamp": datetime.fromisoformat(row[3]),
+            }
+            for row in reversed(rows)
+        ]
+
+    def load_summary(self, chat_id: int) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, covered_until FROM conversation_summaries "
+                "WHERE chat_id = ?",
+                (chat_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"summary": row[0], "covered_until": datetime.fromisoformat(row[1])}
+
+    def save_summary(self, chat_id: int, summary: str, covered_until: datetime) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO conversation_summaries VALUES (?, ?, ?)",
+                (chat_id, summary, covered_until.isoformat()),
+            )
+            self._conn.commit()
+
+
+class ConversationStore:
+    """
+    저장소 종류와 관계없이 같은 방식으로 대화 기록을 다루는 계층입니다.
 
-    def save_conversation(self, user_message: str, bot_response: str):
+    - 응답 경로에서 저장소를 기다리지 않도록 기록은 버퍼에 모아 백그라운드 스레드에서 일괄 저장합니다.
+    - 채팅별 최근 대화는 메모리 LRU 에 유지하고, 없을 때만 저장소에서 불러옵니다.
+    - 요약되지 않은 대화가 CONTEXT_WINDOW 개 쌓이면 최근 VERBATIM_TURNS 개만 남기고
+      나머지를 누적 요약에 합칩니다. 요약은 백그라운드에서 수행되어 응답을 막지 않고,
+      맥락 길이는 대화가 길어져도 요약 + 최근 CONTEXT_WINDOW 개 대화로 제한됩니다.
+    - 대화는 요약에 포함된 뒤에만 메모리에서 빠지므로, 요약이 실패해도 다음 대화에서
+      밀린 대화까지 함께 다시 요약합니다.
+    """
+
+    def __init__(
+        self,
+        backend: ConversationBackend,
+        summarizer: Callable[[str, list[dict]], str] = summarize_turns,
+    ):
+        self.backend = backend
+        self.summarizer = summarizer
+        self._compactor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="memory-compactor"
+        )
+
+        self._pending: list[dict] = []
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._flush_loop, name="conversation-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+        # chat_id -> {"turns": 요약되지 않은 대화 deque, "summary": 누적 요약,
+        #             "context": 만들어 둔 맥락 문자열, "compacting": 요약 진행 여부}
+        self._contexts: OrderedDict[int, dict] = OrderedDict()
+        self._contexts_lock = threading.Lock()
+
+    def save_conversation(self, chat_id: int, user_message: str, bot_response: str):
         doc_data = {
+            "chat_id": chat_id,
             "user_message": user_message,
             "bot_response": bot_response,
-            "timestamp": datetime.now(),
+            "timestamp": datetime.now(timezone.utc),
         }
 
-        self.db.collection(self.collection_name).add(doc_data)
+        with self._pending_lock:
+            self._pending.append(doc_data)
+            pending = len(self._pending)
 
-    def get_conversation_context(self, limit=10):
-        docs = list(
-            self.db.collection(self.collection_name)
-            .order_by("timestamp", direction="ASCENDING")
-            .limit(limit)
-            .stream()
+        # 메모리의 맥락은 저장소를 다시 조회하지 않고 증분으로 갱신합니다.
+        with self._contexts_lock:
+            entry = self._contexts.get(chat_id)
+            if entry is not None:
+                entry["turns"].append(doc_data)
+                entry["context"] = None
+                self._contexts.move_to_end(chat_id)
+                self._maybe_compact(chat_id, entry)
+
+        if pending >= WRITE_BATCH_SIZE:
+            self._wakeup.set()
+
+    def flush(self):
+        """버퍼에 쌓인 기록을 일괄 저장합니다. 실패하면 다음 flush 때 다시 시도합니다."""
+        with self._flush_lock:
+            with self._pending_lock:
+                records, self._pending = self._pending, []
+
+            for start in range(0, len(records), WRITE_BATCH_SIZE):
+                try:
+                    self.backend.write(records[start : start + WRITE_BATCH_SIZE])
+                except Exception as e:
+                    with self._pending_lock:
+                        self._pending = (records[start:] + self._pending)[
+                            -MAX_PENDING_WRITES:
+                        ]
+                    print(f"대화 기록 저장 실패 ({len(records) - start}건 재시도 예정): {e}")
+                    return
+
+    def close(self):
+        """백그라운드 기록을 멈추고 남은 기록을 모두 저장합니다. 여러 번 호출해도 안전합니다."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._writer.join()
+        self.flush()
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wakeup.wait(WRITE_FLUSH_INTERVAL_SECONDS)
+            self._wakeup.clear()
+            if self._pending:
+                self.flush()
+
+    def get_conversation_context(self, chat_id: int) -> str:
+        """
+        채팅의 최근 CONTEXT_WINDOW 개 대화를 오래된 순으로 정리해 반환합니다.
+        메모리에 있으면 바로 반환하고, 없을 때만 저장소에서 불러옵니다.
+        """
+        with self._contexts_lock:
+            entry = self._contexts.get(chat_id)
+            if entry is not None:
+                self._contexts.move_to_end(chat_id)
+                if entry["context"] is None:
+                    entry["context"] = self._format_context(entry)
+                return entry["context"]
+
+        loaded = self._load_entry(chat_id)
+
+        with self._contexts_lock:
+            # 불러오는 동안 다른 스레드가 먼저 채웠다면 그 값을 사용합니다.
+            entry = self._contexts.setdefault(chat_id, loaded)
+            self._contexts.move_to_end(chat_id)
+            while len(self._contexts) > CONTEXT_CACHE_MAX_CHATS:
+                self._contexts.popitem(last=False)
+            self._maybe_compact(chat_id, entry)
+            if entry["context"] is None:
+                entry["context"] = self._format_context(entry)
+            return entry["context"]
+
+    def _load_entry(self, chat_id: int) -> dict:
+        stored = self.backend.load_summary(chat_id) or {}
+        covered_until = stored.get("covered_until")
+
+        # 이미 요약에 포함된 대화는 제외합니다.
+        turns = deque(
+            (
+                turn
+                for turn in self.backend.load_recent(chat_id, MAX_UNSUMMARIZED_TURNS)
+                if covered_until is None or turn["timestamp"] > covered_until
+            ),
+            maxlen=MAX_UNSUMMARIZED_TURNS,
         )
 
-        if not docs:
+        # 아직 저장소에 기록되지 않은 대화도 맥락에 포함합니다.
+        with self._pending_lock:
+            turns.extend(
+                doc_data for doc_data in self._pending if doc_data["chat_id"] == chat_id
+            )
+
+        return {
+            "turns": turns,
+            "summary": stored.get("summary", ""),
+            "context": None,
+            "compacting": False,
+        }
+
+    # self._contexts_lock 을 잡은 상태에서만 호출됩니다.
+    def _maybe_compact(self, chat_id: int, entry: dict) -> None:
+        if entry["compacting"] or len(entry["turns"]) < CONTEXT_WINDOW:
+            return
+
+        folded = list(entry["turns"])[:-VERBATIM_TURNS]
+        entry["compacting"] = True
+        self._compactor.submit(self._compact, chat_id, entry, entry["summary"], folded)
+
+    def _compact(
+        self, chat_id: int, entry: dict, previous_summary: str, folded: list[dict]
+    ) -> None:
+        try:
+            summary = self.summarizer(previous_summary, folded)
+            self.backend.save_summary(chat_id, summary, folded[-1]["timestamp"])
+        except Exception as e:
+            print(f"대화 요약 실패 (다음 대화에서 다시 시도): {e}")
+            with self._contexts_lock:
+                entry["compacting"] = False
+            return
+
+        with self._contexts_lock:
+            # 요약하는 동안 추가된 대화는 남겨 둡니다.
+            folded_ids = {id(turn) for turn in folded}
+            while entry["turns"] and id(entry["turns"][0]) in folded_ids:
+                entry["turns"].popleft()
+            entry["summary"] = summary
+            entry["context"] = None
+            entry["compacting"] = False
+
+    @staticmethod
+    def _format_context(entry: dict) -> str:
+        if not entry["turns"] and not entry["summary"]:
             return "이전 대화 없음"
 
-        context = "=== 최근 대화 기록 ===\n"
-        for i, chat in enumerate(docs, 1):
-            context += f"{i}. 사용자: {chat.get("user_message")}\n"
-            context += f"     봇: {chat.get("bot_response")}\n\n"
+        lines = []
+        if entry["summary"]:
+            lines.append("=== 이전 대화 요약 ===")
+            lines.append(entry["summary"] + "\n")
+        lines.append("=== 최근 대화 기록 ===")
+        # 요약이 밀려 있어도 맥락에는 최근 CONTEXT_WINDOW 개만 넣습니다.
+        recent = list(entry["turns"])[-CONTEXT_WINDOW:]
+        for i, chat in enumerate(recent, 1):
+            lines.append(f"{i}. 사용자: {chat.get('user_message')}")
+            lines.append(f"     봇: {chat.get('bot_response')}\n")
+        return "\n".join(lines) + "\n"
+
+
+def create_backend(kind: str = CONVERSATION_STORE) -> ConversationBackend:
+    if kind == "firebase":
+        return FirebaseBackend()
+    if kind == "sqlite":
+        return SQLiteBackend()
+    raise ValueError(
+        f"알 수 없는 CONVERSATION_STORE 값입니다: {kind} (firebase 또는 sqlite)"
+    )
+
 
-        return context
+db = ConversationStore(create_backend())
 
 
-db = FirebaseDB()
+def add_to_conversation(chat_id, user_message, bot_response):
+    db.save_conversation(chat_id, user_message, bot_response)
 
 
-def add_to_conversation(user_message, bot_response):
-    db.save_conversation(user_message, bot_response)
+def get_conversation_context(chat_id):
+    return db.get_conversation_context(chat_id)
 
 
-def get_conversation_context():
-    return db.get_conversation_context()
+def flush_conversations():
+    db.close()
@@ -0,0 +1,147 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+LATENCY_BUDGET_SECONDS = 6.0  # 이 시간 안에 응답한 프로바이더 결과만 병합
+RRF_K = 60  # Reciprocal Rank Fusion 상수 (Cormack et al. 권장값)
+MAX_RESULTS = 10
+TRACKING_PARAMS = {"fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "ref", "spm"}
+
+# 프로바이더 호출은 블로킹 I/O이므로 프로세스 전체에서 하나의 풀을 공유합니다.
+# 예산을 넘긴 호출은 기다리지 않고 결과만 버립니다.
+_executor = ThreadPoolExecutor(max_workers=12, thread_name_prefix="federated-search")
+
+
+def normalize_url(url: str) -> str:
+    """중복 제거용 URL 키를 만듭니다. (스킴, www, 트래킹 파라미터, 프래그먼트 무시)"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return f"{host}{path}" + (f"?{urlencode(query)}" if query else "")
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: dict[str, list[dict]], k: int = RRF_K, limit: int = MAX_RESULTS
+) -> list[dict]:
+    """프로바이더별 순위 리스트를 URL 기준으로 합치고 RRF 점수로 정렬합니다."""
+    merged: dict[str, dict] = {}
+
+    for provider, results in ranked_lists.items():
+        for rank, item in enumerate(results, 1):
+            url = item.get("url", "")
+            if not url:
+                continue
+
+            key = normalize_url(url)
+            entry = merged.get(key)
+            if entry is None:
+                entry = {
+                    "title": item.get("title", "No Title"),
+                    "url": url,
+                    "content": item.get("content", ""),
+                    "sources": [],
+                    "score": 0.0,
+                }
+                merged[key] = entry
+            elif len(item.get("content", "")) > len(entry["content"]):
+                entry["content"] = item["content"]
+
+            if provider not in entry["sources"]:
+                entry["sources"].append(provider)
+            entry["score"] += 1.0 / (k + rank)
+
+    fused = sorted(merged.values(), key=lambda entry: entry["score"], reverse=True)
+    for entry in fused:
+        entry["score"] = round(entry["score"], 5)
+    return fused[:limit]
+
+
+def _collect(provider: str, result: Any, ranked_lists: dict, statuses: dict) -> None:
+    # 각 프로바이더는 성공 시 {"results": [...]} dict, 실패 시 에러 문자열을 반환합니다.
+    if isinstance(result, dict):
+        ranked_lists[provider] = result.get("results", [])
+        statuses[provider] = "ok"
+    elif result is None:
+        statuses[provider] = "empty"
+    else:
+        statuses[provider] = str(result)
+
+
+def _build_result(query: str, ranked_lists: dict, statuses: dict, started: float):
+    results = reciprocal_rank_fusion(ranked_lists)
+    return {
+        "query": query,
+        "results_count": len(results),
+        "providers": statuses,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000),
+        "results": results,
+    }
+
+
+def federated_search(
+    query: str,
+    providers: dict[str, Callable[[str], Any]],
+    budget: float = LATENCY_BUDGET_SECONDS,
+):
+    """모든 프로바이더를 동시에 호출하고 예산 시간 내 도착한 결과만 병합합니다."""
+    started = time.perf_counter()
+    futures = {
+        _executor.submit(search, query): provider
+        for provider, search in providers.items()
+    }
+    done, not_done = wait(futures, timeout=budget)
+
+    ranked_lists: dict[str, list[dict]] = {}
+    statuses: dict[str, str] = {}
+
+    for future in done:
+        provider = futures[future]
+        try:
+            _collect(provider, future.result(), ranked_lists, statuses)
+        except Exception as e:
+            statuses[provider] = f"error: {e}"
+
+    for future in not_done:
+        future.cancel()
+        statuses[futures[future]] = "timeout"
+
+    return _build_result(query, ranked_lists, statuses, started)
+
+
+async def afederated_search(
+    query: str,
+    providers: dict[str, Callable[[str], Awaitable[Any]]],
+    budget: float = LATENCY_BUDGET_SECONDS,
+):
+    """federated_search 의 asyncio 버전입니다."""
+    started = time.perf_counter()
+    tasks = {
+        asyncio.ensure_future(search(query)): provider
+        for provider, search in providers.items()
+    }
+    done, pending = await asyncio.wait(tasks, timeout=budget)
+
+    ranked_lists: dict[str, list[dict]] = {}
+    statuses: dict[str, str] = {}
+
+    for task in done:
+        provider = tasks[task]
+        try:
+            _collect(provider, task.result(), ranked_lists, statuses)
+        except Exception as e:
+            statuses[provider] = f"error: {e}"
+
+    for task in pending:
+        task.cancel()
+        statuses[tasks[task]] = "timeout"
+
+    return _build_result(query, ranked_lists, statuses, started)
@@ -0,0 +1,46 @@
+from http_client import http_client
+from env import FIRECRAWL_API_KEY
+
+FIRECRAWL_SEARCH_URL = "https://api.firecrawl.dev/v2/search"
+FIRECRAWL_SEARCH_TIMEOUT_MS = 8000  # Firecrawl 서버가 검색을 포기하는 시간 (클라이언트 read timeout 보다 짧게)
+
+
+def _search_request(query: str, limit: int) -> tuple[dict[str, str], dict]:
+    headers = {
+        "Authorization": f"Bearer {FIRECRAWL_API_KEY}",
+        "Content-Type": "application/json",
+    }
+    payload = {
+        "query": query,
+        "limit": limit,
+        "timeout": FIRECRAWL_SEARCH_TIMEOUT_MS,
+        "integration": "crewai",
+    }
+    return headers, payload
+
+
+def _parse_search_response(data: dict) -> list[dict]:
+    if not data.get("success"):
+        raise RuntimeError(f"Firecrawl search failed: {data.get('error', data)}")
+    return (data.get("data") or {}).get("web") or []
+
+
+def firecrawl_search(query: str, limit: int) -> list[dict]:
+    """
+    Firecrawl 웹 검색 결과(web) 목록을 반환합니다.
+
+    SDK 는 요청마다 타임아웃 없이 requests.post 를 호출하므로, 공유 HTTP 클라이언트의
+    keep-alive 세션과 connect / read 타임아웃으로 REST API 를 직접 호출합니다.
+    (예산을 넘겨 버려진 연합 검색 호출도 타임아웃이 지나면 워커를 반납합니다.)
+    """
+    headers, payload = _search_request(query, limit)
+    return _parse_search_response(
+        http_client.post_json(FIRECRAWL_SEARCH_URL, payload, headers=headers)
+    )
+
+
+async def afirecrawl_search(query: str, limit: int) -> list[dict]:
+    headers, payload = _search_request(query, limit)
+    return _parse_search_response(
+        await http_client.apost_json(FIRECRAWL_SEARCH_URL, payload, headers=headers)
+    )
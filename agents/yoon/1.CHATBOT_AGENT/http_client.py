@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import weakref
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+# 커넥션 풀 설정
+POOL_CONNECTIONS = 10  # 동기 세션이 유지할 호스트별 풀 개수
+POOL_MAXSIZE = 20  # 동기 세션에서 호스트당 유지할 최대 keep-alive 커넥션 수
+ASYNC_POOL_LIMIT = 100  # 비동기 세션 전체 동시 커넥션 수
+ASYNC_LIMIT_PER_HOST = 20  # 비동기 세션 호스트당 동시 커넥션 수
+CONNECT_TIMEOUT = 3.05  # 초
+READ_TIMEOUT = 10.0  # 초
+
+
+class HttpClient:
+    """
+    검색 도구들이 공유하는 keep-alive 커넥션 풀 HTTP 클라이언트입니다.
+
+    동기 호출은 requests.Session 하나를, 비동기 호출은 이벤트 루프마다
+    aiohttp.ClientSession 하나를 재사용하여 매 요청마다 TLS 핸드셰이크를
+    반복하지 않도록 합니다.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = POOL_CONNECTIONS,
+        pool_maxsize: int = POOL_MAXSIZE,
+        async_pool_limit: int = ASYNC_POOL_LIMIT,
+        async_limit_per_host: int = ASYNC_LIMIT_PER_HOST,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.async_pool_limit = async_pool_limit
+        self.async_limit_per_host = async_limit_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
+        # aiohttp 세션은 생성된 이벤트 루프에 묶이므로 루프별로 관리합니다.
+        self._async_sessions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize,
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def _async_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._async_sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.async_pool_limit,
+                limit_per_host=self.async_limit_per_host,
+            )
+            timeout = aiohttp.ClientTimeout(
+                sock_connect=self.connect_timeout,
+                sock_read=self.read_timeout,
+            )
+            session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._async_sessions[loop] = session
+        return session
+
+    def get_json(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        params: dict | None = None,
+    ) -> dict:
+        response = self.session.get(
+            url,
+            headers=headers,
+            params=params,
+            timeout=(self.connect_timeout, self.read_timeout),
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def aget_json(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        params: dict | None = None,
+    ) -> dict:
+        session = self._async_session()
+        async with session.get(url, headers=headers, params=params) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    def post_json(
+        self,
+        url: str,
+        json: dict,
+        headers: dict[str, str] | None = None,
+    ) -> dict:
+        response = self.session.post(
+            url,
+            json=json,
+            headers=headers,
+            timeout=(self.connect_timeout, self.read_timeout),
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def apost_json(
+        self,
+        url: str,
+        json: dict,
+        headers: dict[str, str] | None = None,
+    ) -> dict:
+        session = self._async_session()
+        async with session.post(url, json=json, headers=headers) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    def close(self) -> None:
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        session = self._async_sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+
+http_client = HttpClient()
@@ -1,3 +1,4 @@
+import asyncio
 from telegram import Update
 from telegram.ext import (
     ApplicationBuilder,
@@ -7,7 +8,31 @@ from telegram.ext import (
 )
 from env import TELEGRAM_BOT_TOKEN
 from chatbot_crew import ChatBotCrew
-from db import add_to_conversation
+from crew_pool import CrewPool
+from crew_runner import CREW_WORKERS, CrewRunner, CrewRunnerBusy
+from db import add_to_conversation, flush_conversations, get_conversation_context
+
+crew_runner = CrewRunner()
+
+# 메시지마다 Agent / Task / Crew / LLM 을 새로 만들지 않도록 워커 수만큼 미리 만들어 둡니다.
+chatbot_crew_pool = CrewPool(lambda **config: ChatBotCrew(**config).crew())
+chatbot_crew_pool.warm(CREW_WORKERS)
+
+
+def run_chatbot_crew(chat_id: int, user_message: str) -> str:
+    """워커 스레드에서 크루를 실행하고 대화 기록을 저장합니다."""
+    with chatbot_crew_pool.checkout() as crew:
+        result = crew.kickoff(
+            inputs={
+                "message": user_message,
+                "conversation_context": get_conversation_context(chat_id),
+            }
+        )
+
+    bot_response = result.raw
+    add_to_conversation(chat_id, user_message, bot_response)
+
+    return bot_response
 
 
 async def handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -16,18 +41,39 @@ async def handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         return
 
     user_message = update.message.text
+    chat_id = update.message.chat_id
 
-    chatbot_crew = ChatBotCrew()
+    try:
+        bot_response = await crew_runner.run(
+            chat_id, run_chatbot_crew, chat_id, user_message
+        )
+    except CrewRunnerBusy:
+        await update.message.reply_text(
+            "⏳ 지금은 요청이 많아 바로 답변드리기 어렵습니다. 잠시 후 다시 시도해주세요."
+        )
+        return
+    except asyncio.TimeoutError:
+        await update.message.reply_text(
+            "⌛ 답변 생성 시간이 초과되었습니다. 다시 시도해주세요."
+        )
+        return
 
-    result = chatbot_crew.crew().kickoff(inputs={"message": user_message})
+    await update.message.reply_text(bot_response)
 
-    bot_response = result.raw
-    add_to_conversation(user_message, bot_response)
 
-    await update.message.reply_text(bot_response)
+async def on_shutdown(_) -> None:
+    # 종료 전에 버퍼에 남은 대화 기록을 모두 저장합니다.
+    await asyncio.to_thread(flush_conversations)
 
 
-app = ApplicationBuilder().token(TELEGRAM_BOT_TOKEN).build()
+# 핸들러가 크루 실행을 기다리는 동안에도 다른 채팅의 업데이트를 처리하도록 동시 처리를 켭니다.
+app = (
+    ApplicationBuilder()
+    .token(TELEGRAM_BOT_TOKEN)
+    .concurrent_updates(True)
+    .post_shutdown(on_shutdown)
+    .build()
+)
 
 app.add_handler(MessageHandler(filters.TEXT, handler))
 
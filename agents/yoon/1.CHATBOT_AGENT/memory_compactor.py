@@ -0,0 +1,37 @@
+import os
+from crewai import LLM
+from env import GEMINI_API_KEY
+
+os.environ["GEMINI_API_KEY"] = GEMINI_API_KEY
+
+# 요약 설정
+SUMMARY_LLM_MODEL = "gemini/gemini-2.0-flash-lite"
+MAX_SUMMARY_CHARS = 1500  # 요약이 길어져 맥락이 다시 커지지 않도록 제한
+
+summary_llm = LLM(model=SUMMARY_LLM_MODEL, temperature=0)
+
+
+def summarize_turns(previous_summary: str, turns: list[dict]) -> str:
+    """
+    기존 요약에 새 대화들을 합쳐 하나의 누적 요약을 만듭니다.
+    전체 대화를 다시 읽지 않고 (이전 요약 + 이번에 밀려난 대화) 만 사용합니다.
+    """
+    conversation = "\n".join(
+        f"사용자: {turn.get('user_message')}\n봇: {turn.get('bot_response')}"
+        for turn in turns
+    )
+    prompt = f"""
+    아래는 사용자와 챗봇의 이전 대화 요약과 그 이후의 대화입니다.
+    둘을 합쳐 앞으로의 답변에 필요한 정보만 남긴 하나의 요약을 한국어로 작성하세요.
+    - 사용자의 관심사, 선호, 개인 정보, 아직 해결되지 않은 질문을 우선 남깁니다.
+    - 인사말이나 이미 끝난 잡담은 생략합니다.
+    - {MAX_SUMMARY_CHARS}자 이내의 글머리표 목록으로 작성하고, 요약만 출력하세요.
+
+    [이전 요약]
+    {previous_summary or "없음"}
+
+    [이후 대화]
+    {conversation}
+    """
+    summary = summary_llm.call(prompt)
+    return str(summary).strip()[:MAX_SUMMARY_CHARS]
@@ -1,17 +1,22 @@
 from typing import Type
 from crewai.tools import BaseTool
-from firecrawl import Firecrawl
-import requests
 import re
 from pydantic import BaseModel, Field
+from http_client import http_client
+from federated_search import federated_search, afederated_search
+from search_cache import search_cache
+from firecrawl_client import firecrawl_search, afirecrawl_search
 from env import (
-    FIRECRAWL_API_KEY,
     NAVER_API_CLIENT_ID,
     NAVER_API_SECRET_KEY,
     GOOGLE_SEARCH_API_KEY,
     GOOGLE_SEARCH_CX,
 )
 
+NAVER_SEARCH_URL = "https://openapi.naver.com/v1/search/webkr"
+GOOGLE_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+WEB_SEARCH_LIMIT = 5
+
 
 class NaverSearchToolInput(BaseModel):
     """Input schema for NaverSearchTool."""
@@ -22,6 +27,93 @@ class NaverSearchToolInput(BaseModel):
     )
 
 
+def _naver_request(query: str, display: int):
+    headers = {
+        "X-Naver-Client-Id": NAVER_API_CLIENT_ID,
+        "X-Naver-Client-Secret": NAVER_API_SECRET_KEY,
+        "Content-Type": "application/json",
+    }
+
+    params = {"query": query, "display": min(display, 100)}  # API limit is 100
+
+    print(f"[DEBUG] Making request to Naver API with query: {query}")
+
+    return headers, params
+
+
+def _parse_naver_response(query: str, data: dict):
+    print(f"[DEBUG] Raw response type: {type(data)}")
+    print(f"[DEBUG] Raw response: {data}")
+
+    if "items" not in data or not data["items"]:
+        return f"No search results found for query: {query}"
+
+    search_results = []
+
+    for item in data["items"]:
+        title = item.get("title", "No Title")
+        # Remove HTML tags from title
+        title = re.sub(r"<[^>]+>", "", title)
+
+        url = item.get("link", "")
+        description = item.get("description", "")
+        # Remove HTML tags from description
+        description = re.sub(r"<[^>]+>", "", description)
+
+        search_results.append(
+            {
+                "title": title,
+                "url": url,
+                "content": (
+                    description[:500] + "..." if len(description) > 500 else description
+                ),
+            }
+        )
+
+    result = {
+        "query": query,
+        "results_count": len(search_results),
+        "total": data.get("total", 0),
+        "results": search_results,
+    }
+
+    print("DEBUG : ", result)
+
+    return result
+
+
+def _naver_search(query: str, display: int = 10):
+    try:
+        headers, params = _naver_request(query, display)
+        data = search_cache.get_or_fetch(
+            "naver",
+            query,
+            params["display"],
+            lambda: http_client.get_json(
+                NAVER_SEARCH_URL, headers=headers, params=params
+            ),
+        )
+        return _parse_naver_response(query, data)
+    except Exception as e:
+        return f"Error searching for query '{query}': {e}"
+
+
+async def _anaver_search(query: str, display: int = 10):
+    try:
+        headers, params = _naver_request(query, display)
+        data = await search_cache.aget_or_fetch(
+            "naver",
+            query,
+            params["display"],
+            lambda: http_client.aget_json(
+                NAVER_SEARCH_URL, headers=headers, params=params
+            ),
+        )
+        return _parse_naver_response(query, data)
+    except Exception as e:
+        return f"Error searching for query '{query}': {e}"
+
+
 class NaverSearchTool(BaseTool):
     name: str = "naver_search_tool"
     description: str = (
@@ -30,75 +122,94 @@ class NaverSearchTool(BaseTool):
     args_schema: Type[BaseModel] = NaverSearchToolInput
 
     def _run(self, query: str, display: int = 10):
-        try:
-            url = "https://openapi.naver.com/v1/search/webkr"
-            headers = {
-                "X-Naver-Client-Id": NAVER_API_CLIENT_ID,
-                "X-Naver-Client-Secret": NAVER_API_SECRET_KEY,
-                "Content-Type": "application/json",
-            }
+        return _naver_search(query, display)
 
-            params = {"query": query, "display": min(display, 100)}  # API limit is 100
+    async def _arun(self, query: str, display: int = 10):
+        return await _anaver_search(query, display)
 
-            print(f"[DEBUG] Making request to Naver API with query: {query}")
 
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-
-            data = response.json()
-
-            print(f"[DEBUG] Raw response type: {type(data)}")
-            print(f"[DEBUG] Raw response: {data}")
-
-            if "items" not in data or not data["items"]:
-                return f"No search results found for query: {query}"
+class GoogleSearchToolInput(BaseModel):
+    """Input schema for GoogleSearchTool."""
 
-            search_results = []
+    query: str = Field(..., description="The search query to look for.")
+    num: int = Field(
+        default=10, description="Number of search results to display (max 10)."
+    )
 
-            for item in data["items"]:
-                title = item.get("title", "No Title")
-                # Remove HTML tags from title
-                title = re.sub(r"<[^>]+>", "", title)
 
-                url = item.get("link", "")
-                description = item.get("description", "")
-                # Remove HTML tags from description
-                description = re.sub(r"<[^>]+>", "", description)
+def _google_request(query: str, num: int):
+    params = {
+        "key": GOOGLE_SEARCH_API_KEY,
+        "cx": GOOGLE_SEARCH_CX,
+        "q": query,
+        "num": min(num, 10),  # API limit is 10
+    }
 
-                search_results.append(
-                    {
-                        "title": title,
-                        "url": url,
-                        "content": (
-                            description[:500] + "..."
-                            if len(description) > 500
-                            else description
-                        ),
-                    }
-                )
+    print(f"[DEBUG] Making request to Google Custom Search API with query: {query}")
 
-            result = {
-                "query": query,
-                "results_count": len(search_results),
-                "total": data.get("total", 0),
-                "results": search_results,
-            }
+    return params
 
-            print("DEBUG : ", result)
 
-            return result
+def _parse_google_response(query: str, data: dict):
+    print(f"[DEBUG] Raw response type: {type(data)}")
+    print(f"[DEBUG] Raw response: {data}")
 
-        except Exception as e:
-            return f"Error searching for query '{query}': {e}"
+    if "items" not in data or not data["items"]:
+        return f"No search results found for query: {query}"
 
+    search_results = []
 
-class GoogleSearchToolInput(BaseModel):
-    """Input schema for GoogleSearchTool."""
+    for item in data["items"]:
+        title = item.get("title", "No Title")
+        url = item.get("link", "")
+        snippet = item.get("snippet", "")
 
-    query: str = Field(..., description="The search query to look for.")
-    num: int = Field(
-        default=10, description="Number of search results to display (max 10)."
-    )
+        search_results.append(
+            {
+                "title": title,
+                "url": url,
+                "content": (snippet[:500] + "..." if len(snippet) > 500 else snippet),
+            }
+        )
+
+    result = {
+        "query": query,
+        "results_count": len(search_results),
+        "total": data.get("searchInformation", {}).get("totalResults", 0),
+        "results": search_results,
+    }
+
+    print("DEBUG : ", result)
+
+    return result
+
+
+def _google_search(query: str, num: int = 10):
+    try:
+        params = _google_request(query, num)
+        data = search_cache.get_or_fetch(
+            "google",
+            query,
+            params["num"],
+            lambda: http_client.get_json(GOOGLE_SEARCH_URL, params=params),
+        )
+        return _parse_google_response(query, data)
+    except Exception as e:
+        return f"Error searching for query '{query}': {e}"
+
+
+async def _agoogle_search(query: str, num: int = 10):
+    try:
+        params = _google_request(query, num)
+        data = await search_cache.aget_or_fetch(
+            "google",
+            query,
+            params["num"],
+            lambda: http_client.aget_json(GOOGLE_SEARCH_URL, params=params),
+        )
+        return _parse_google_response(query, data)
+    except Exception as e:
+        return f"Error searching for query '{query}': {e}"
 
 
 class GoogleSearchTool(BaseTool):
@@ -109,95 +220,63 @@ class GoogleSearchTool(BaseTool):
     args_schema: Type[BaseModel] = GoogleSearchToolInput
 
     def _run(self, query: str, num: int = 10):
-        try:
-            url = "https://www.googleapis.com/customsearch/v1"
-            params = {
-                "key": GOOGLE_SEARCH_API_KEY,
-                "cx": GOOGLE_SEARCH_CX,
-                "q": query,
-                "num": min(num, 10),  # API limit is 10
-            }
-
-            print(
-                f"[DEBUG] Making request to Google Custom Search API with query: {query}"
-            )
+        return _google_search(query, num)
 
-            response = requests.get(url, params=params)
-            response.raise_for_status()
+    async def _arun(self, query: str, num: int = 10):
+        return await _agoogle_search(query, num)
 
-            data = response.json()
 
-            print(f"[DEBUG] Raw response type: {type(data)}")
-            print(f"[DEBUG] Raw response: {data}")
-
-            if "items" not in data or not data["items"]:
-                return f"No search results found for query: {query}"
-
-            search_results = []
-
-            for item in data["items"]:
-                title = item.get("title", "No Title")
-                url = item.get("link", "")
-                snippet = item.get("snippet", "")
-
-                search_results.append(
-                    {
-                        "title": title,
-                        "url": url,
-                        "content": (
-                            snippet[:500] + "..." if len(snippet) > 500 else snippet
-                        ),
-                    }
-                )
+def _web_search(query: str):
+    return search_cache.get_or_fetch(
+        "firecrawl", query, WEB_SEARCH_LIMIT, lambda: _fetch_web_search(query)
+    )
 
-            result = {
-                "query": query,
-                "results_count": len(search_results),
-                "total": data.get("searchInformation", {}).get("totalResults", 0),
-                "results": search_results,
-            }
 
-            print("DEBUG : ", result)
+async def _aweb_search(query: str):
+    return await search_cache.aget_or_fetch(
+        "firecrawl",
+        query,
+        WEB_SEARCH_LIMIT,
+        lambda: _afetch_web_search(query),
+    )
 
-            return result
 
-        except Exception as e:
-            return f"Error searching for query '{query}': {e}"
+def _fetch_web_search(query: str):
+    return _parse_web_search(query, firecrawl_search(query, WEB_SEARCH_LIMIT))
 
 
-def _web_search(query: str):
-    firecrawl = Firecrawl(api_key=FIRECRAWL_API_KEY)
+async def _afetch_web_search(query: str):
+    return _parse_web_search(query, await afirecrawl_search(query, WEB_SEARCH_LIMIT))
 
-    response = firecrawl.search(query, limit=5, integration="crewai")
 
-    if not response:
+def _parse_web_search(query: str, web: list[dict]):
+    if not web:
         return f"No search results found for query: {query}"
 
     search_results = []
 
-    if response.web:
-        for result in response.web:
-            title = getattr(result, "title", "No Title")
-            url = getattr(result, "url", "")
-            description = getattr(result, "description", "")
-
-            search_results.append(
-                {
-                    "title": title,
-                    "url": url,
-                    "content": (
-                        description[:500] + "..."
-                        if len(description) > 500
-                        else description
-                    ),
-                }
-            )
-        search_result = {
-            "query": query,
-            "results_count": len(search_results),
-            "results": search_results,
-        }
-        return search_result
+    for result in web:
+        title = result.get("title") or "No Title"
+        url = result.get("url", "")
+        description = result.get("description") or ""
+
+        search_results.append(
+            {
+                "title": title,
+                "url": url,
+                "content": (
+                    description[:500] + "..."
+                    if len(description) > 500
+                    else description
+                ),
+            }
+        )
+    search_result = {
+        "query": query,
+        "results_count": len(search_results),
+        "results": search_results,
+    }
+    return search_result
 
 
 class WebSearchToolInput(BaseModel):
@@ -216,8 +295,46 @@ class WebSearchTool(BaseTool):
     def _run(self, query: str):
         return _web_search(query)
 
+    async def _arun(self, query: str):
+        return await _aweb_search(query)
+
+
+class FederatedSearchToolInput(BaseModel):
+    """Input schema for FederatedSearchTool."""
+
+    query: str = Field(..., description="The search query to look for.")
+
+
+class FederatedSearchTool(BaseTool):
+    name: str = "federated_search_tool"
+    description: str = (
+        "Searches Naver, Google and the web at the same time and returns one merged, deduplicated and ranked list of results with titles, URLs, content snippets and the providers that returned each result."
+    )
+    args_schema: Type[BaseModel] = FederatedSearchToolInput
+
+    def _run(self, query: str):
+        return federated_search(
+            query,
+            {
+                "naver": _naver_search,
+                "google": _google_search,
+                "web": _web_search,
+            },
+        )
+
+    async def _arun(self, query: str):
+        return await afederated_search(
+            query,
+            {
+                "naver": _anaver_search,
+                "google": _agoogle_search,
+                "web": _aweb_search,
+            },
+        )
+
 
 web_search_tool = WebSearchTool()
 naver_search_tool = NaverSearchTool()
 google_search_tool = GoogleSearchTool()
+federated_search_tool = FederatedSearchTool()
 # print(_web_search("블랙핑크"))
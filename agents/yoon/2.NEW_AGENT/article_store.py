@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# 기사 저장소 설정
+ARTICLE_DB_PATH = "data/news_articles.db"
+SIMHASH_MAX_DISTANCE = 3  # 64비트 simhash 해밍 거리가 이 값 이하면 같은 기사로 판단
+DEDUP_WINDOW_SECONDS = 48 * 60 * 60  # 유사 기사 비교 대상 기간
+SHINGLE_SIZE = 3
+SCRAPE_CACHE_SECONDS = 60 * 60  # 스크랩한 본문 재사용 기간
+TRACKING_PARAMS = {"fbclid", "gclid", "ref", "from", "rss", "feed"}
+
+
+def canonical_link(url: str) -> str:
+    """스킴, www, 트래킹 파라미터, 프래그먼트를 제거한 비교용 링크를 만듭니다."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m.", "mobile."):
+        if host.startswith(prefix):
+            host = host[len(prefix) :]
+            break
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return f"{host}{path}" + (f"?{urlencode(query)}" if query else "")
+
+
+def _normalize_text(text: str) -> str:
+    text = re.sub(r"<[^>]+>", " ", text)
+    text = re.sub(r"\[[^\]]*\]", " ", text)  # [속보], [단독] 같은 말머리 제거
+    return re.sub(r"\W+", "", text.lower())
+
+
+def simhash(text: str) -> int:
+    """글자 단위 shingle 로 64비트 simhash 를 계산합니다. (한국어는 띄어쓰기가 불규칙해 글자 단위를 사용)"""
+    normalized = _normalize_text(text)
+    if len(normalized) < SHINGLE_SIZE:
+        shingles = {normalized} if normalized else set()
+    else:
+        shingles = {
+            normalized[i : i + SHINGLE_SIZE]
+            for i in range(len(normalized) - SHINGLE_SIZE + 1)
+        }
+
+    weights = [0] * 64
+    for shingle in shingles:
+        value = int.from_bytes(
+            hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def _to_signed(value: int) -> int:
+    # SQLite INTEGER 는 부호 있는 64비트이므로 변환해서 저장합니다.
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class ArticleStore:
+    """
+    RSS 기사를 SQLite 에 증분 저장하면서 중복을 제거하는 저장소입니다.
+
+    같은 정규화 링크는 한 번만 저장하고, 제목+요약의 simhash 가 최근 기사와
+    가까우면 (다른 언론사의 전재 기사 등) 중복으로 표시합니다.
+    """
+
+    def __init__(self, db_path: str = ARTICLE_DB_PATH):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                canonical_link TEXT NOT NULL UNIQUE,
+                link TEXT NOT NULL,
+                title TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                published TEXT NOT NULL,
+                source TEXT NOT NULL,
+                simhash INTEGER NOT NULL,
+                duplicate_of INTEGER,
+                first_seen REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_first_seen
+                ON articles (first_seen);
+            CREATE TABLE IF NOT EXISTS scraped_pages (
+                canonical_link TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                scraped_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def ingest(self, articles: list[dict]) -> list[dict]:
+        """
+        기사 목록을 저장하고, 이번에 처음 본 고유 기사만 반환합니다.
+        이미 저장된 링크나 최근 기사와 거의 같은 기사는 반환하지 않습니다.
+        """
+        now = time.time()
+        new_articles = []
+
+        with self._lock:
+            recent = [
+                (row["id"], _to_unsigned(row["simhash"]))
+                for row in self._conn.execute(
+                    "SELECT id, simhash FROM articles "
+                    "WHERE duplicate_of IS NULL AND first_seen >= ?",
+                    (now - DEDUP_WINDOW_SECONDS,),
+                )
+            ]
+
+            for article in articles:
+                link = article.get("link", "")
+                title = article.get("title", "")
+                summary = article.get("summary", "")
+                key = canonical_link(link) if link else f"title:{_normalize_text(title)}"
+
+                exists = self._conn.execute(
+                    "SELECT 1 FROM articles WHERE canonical_link = ?", (key,)
+                ).fetchone()
+                if exists:
+                    continue
+
+                fingerprint = simhash(f"{title} {summary}")
+                duplicate_of = next(
+                    (
+                        article_id
+                        for article_id, other in recent
+                        if (fingerprint ^ other).bit_count() <= SIMHASH_MAX_DISTANCE
+                    ),
+                    None,
+                )
+
+                cursor = self._conn.execute(
+                    "INSERT INTO articles (canonical_link, link, title, summary, "
+                    "published, source, simhash, duplicate_of, first_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        link,
+                        title,
+                        summary,
+                        article.get("published", ""),
+                        article.get("source", ""),
+                        _to_signed(fingerprint),
+                        duplicate_of,
+                        now,
+                    ),
+                )
+
+                if duplicate_of is None:
+                    recent.append((cursor.lastrowid, fingerprint))
+                    new_articles.append(article)
+
+            self._conn.commit()
+
+        return new_articles
+
+    def recent(self, sources: list[str], limit: int) -> list[dict]:
+        """지정한 언론사들의 최근 고유 기사를 최신순으로 반환합니다."""
+        if not sources:
+            return []
+
+        placeholders = ", ".join("?" for _ in sources)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title, link, summary, published, source FROM articles "
+                f"WHERE duplicate_of IS NULL AND source IN ({placeholders}) "
+                "ORDER BY first_seen DESC, id DESC LIMIT ?",
+                (*sources, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_scraped(
+        self, url: str, max_age: float = SCRAPE_CACHE_SECONDS
+    ) -> dict | None:
+        """max_age 초 이내에 스크랩한 본문이 있으면 반환합니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM scraped_pages "
+                "WHERE canonical_link = ? AND scraped_at >= ?",
+                (canonical_link(url), time.time() - max_age),
+            ).fetchone()
+        return json.loads(row["payload"]) if row else None
+
+    def save_scraped(self, url: str, page: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scraped_pages VALUES (?, ?, ?)",
+                (
+                    canonical_link(url),
+                    json.dumps(page, ensure_ascii=False),
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+
+
+article_store = ArticleStore()
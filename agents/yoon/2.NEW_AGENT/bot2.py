@@ -1,72 +1,72 @@
 from telegram import Update
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.error import Forbidden
+from telegram.ext import Application, CommandHandler, ContextTypes, JobQueue
+from crewai.events import crewai_event_bus, LLMStreamChunkEvent
 from datetime import datetime, time, timedelta
+from typing import Callable
+import asyncio
 import re
+import threading
 import pytz
 from env import TELEGRAM_BOT_TOKEN
 from news_crew import NewsCrew
+from briefing_service import BriefingService
+from crew_runner import CrewRunner, CrewRunnerBusy
+from schedule_store import schedule_store
+from delivery import (
+    MAX_MESSAGE_LENGTH,
+    STREAM_MIN_CHARS,
+    message_sender,
+    split_message,
+)
 
 # 상수 정의
 KOREA_TZ = pytz.timezone("Asia/Seoul")
 DAILY_INTERVAL_SECONDS = 24 * 60 * 60
-MAX_MESSAGE_LENGTH = 3000  # 텔레그램 메시지 분할 기준 (요구사항: 3000자)
+SLOT_JOB_PREFIX = "slot:"  # 예약 시간(HH:MM)마다 하나의 작업만 등록
 
 
-def kickoff_crew() -> str:
-    """뉴스 크루로부터 뉴스 브리핑을 가져옵니다."""
-    news_crew = NewsCrew()
-    result = news_crew.crew().kickoff()
-    return result.raw
+# 스트리밍 중인 크루 실행의 콜백 (id(LLM) -> on_chunk), kickoff 동안에만 등록
+_stream_lock = threading.Lock()
+_stream_callbacks: dict[int, Callable[[str], None]] = {}
 
 
-def split_message(text: str, max_length: int = MAX_MESSAGE_LENGTH) -> list[str]:
-    """
-    긴 메시지를 여러 개의 짧은 메시지로 분할합니다.
+@crewai_event_bus.on(LLMStreamChunkEvent)
+def _forward_stream_chunk(source, event: LLMStreamChunkEvent) -> None:
+    """스트림 조각을 해당 LLM 을 실행 중인 크루의 on_chunk 로 전달합니다."""
+    with _stream_lock:
+        on_chunk = _stream_callbacks.get(id(source))
+    if on_chunk is not None:
+        on_chunk(event.chunk)
 
-    Args:
-        text: 분할할 텍스트
-        max_length: 최대 메시지 길이 (기본값: 3000)
 
-    Returns:
-        분할된 메시지 리스트
+def kickoff_crew(on_chunk: Callable[[str], None] | None = None) -> str:
     """
-    if len(text) <= max_length:
-        return [text]
-
-    messages = []
-    current_message = ""
-
-    # 줄 단위로 분할하여 처리 (가독성 유지)
-    lines = text.split("\n")
-
-    for line in lines:
-        # 현재 줄을 추가했을 때 길이가 초과하는지 확인
-        if len(current_message + "\n" + line) > max_length:
-            # 현재 메시지가 비어있지 않으면 저장
-            if current_message:
-                messages.append(current_message)
-                current_message = ""
-
-            # 한 줄 자체가 너무 긴 경우 강제로 분할
-            if len(line) > max_length:
-                while len(line) > max_length:
-                    messages.append(line[:max_length])
-                    line = line[max_length:]
-                current_message = line
-            else:
-                current_message = line
-        else:
-            # 현재 메시지에 추가
-            if current_message:
-                current_message += "\n" + line
-            else:
-                current_message = line
+    뉴스 크루로부터 뉴스 브리핑을 가져옵니다.
+    on_chunk 가 주어지면 큐레이터 LLM 의 스트림 조각을 생성되는 대로 전달합니다.
+    (스트리밍은 큐레이터 LLM 에만 켜져 있으므로 다른 에이전트의 조각은 들어오지 않습니다.)
+    실행마다 LLM 인스턴스가 새로 만들어지므로 동시에 실행되는 크루끼리 조각이 섞이지 않습니다.
+    """
+    crew = NewsCrew().crew()
+    if on_chunk is None:
+        return crew.kickoff().raw
+
+    streaming_llms = {
+        id(agent.llm) for agent in crew.agents if getattr(agent.llm, "stream", False)
+    }
+    with _stream_lock:
+        _stream_callbacks.update(dict.fromkeys(streaming_llms, on_chunk))
+    try:
+        return crew.kickoff().raw
+    finally:
+        with _stream_lock:
+            for llm_id in streaming_llms:
+                _stream_callbacks.pop(llm_id, None)
 
-    # 마지막 메시지 저장
-    if current_message:
-        messages.append(current_message)
 
-    return messages
+# 크루 실행은 제한된 워커 풀에서 처리하고, 모든 채팅이 브리핑 서비스를 공유 (크루는 시간 창마다 한 번만 실행)
+crew_runner = CrewRunner()
+briefing_service = BriefingService(kickoff_crew, crew_runner)
 
 
 async def send_long_message(
@@ -87,17 +87,53 @@ async def send_long_message(
     for i, message in enumerate(messages):
         if i == 0:
             # 첫 번째 메시지
-            await context.bot.send_message(
-                chat_id=chat_id, text=f"📰 오늘의 뉴스 브리핑:\n\n{message}"
+            await message_sender.send(
+                context.bot, chat_id, f"📰 오늘의 뉴스 브리핑:\n\n{message}"
             )
         else:
             # 두 번째 메시지부터 페이지 번호 표시 (2/N 형식)
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text=f"({i+1}/{total_messages})\n\n{message}",
+            await message_sender.send(
+                context.bot, chat_id, f"({i+1}/{total_messages})\n\n{message}"
             )
 
 
+async def stream_briefing_message(
+    context: ContextTypes.DEFAULT_TYPE, chat_id: int
+) -> None:
+    """
+    큐레이터가 완성한 섹션을 모아 STREAM_MIN_CHARS 이상이 되면 바로 전송합니다.
+    전체 개수를 미리 알 수 없으므로 두 번째 메시지부터 (2) 형식으로 번호를 표시합니다.
+
+    Args:
+        context: 텔레그램 컨텍스트
+        chat_id: 채팅 ID
+    """
+    buffer: list[str] = []
+    buffer_length = 0
+    sent = 0
+
+    async def flush() -> None:
+        nonlocal buffer, buffer_length, sent
+        for message in split_message("\n\n".join(buffer)):
+            sent += 1
+            header = "📰 오늘의 뉴스 브리핑:" if sent == 1 else f"({sent})"
+            await message_sender.send(context.bot, chat_id, f"{header}\n\n{message}")
+        buffer, buffer_length = [], 0
+
+    try:
+        async for section in briefing_service.stream_briefing():
+            if buffer and buffer_length + len(section) + 2 > MAX_MESSAGE_LENGTH:
+                await flush()
+            buffer.append(section)
+            buffer_length += len(section) + 2
+            if buffer_length >= STREAM_MIN_CHARS:
+                await flush()
+    finally:
+        # 생성이 중간에 실패해도 이미 받은 섹션은 전달합니다.
+        if buffer:
+            await flush()
+
+
 def parse_time_string(time_str: str) -> time:
     """
     HH:MM 형식의 시간 문자열을 파싱합니다.
@@ -163,6 +199,33 @@ def format_time_remaining(seconds: float) -> str:
         return f"{minutes}분 후"
 
 
+def ensure_slot_job(job_queue: JobQueue, slot: str) -> None:
+    """
+    예약 시간(HH:MM) 작업이 없으면 등록합니다.
+    구독자 수와 관계없이 예약 시간마다 타이머는 하나만 유지됩니다.
+    """
+    if job_queue.get_jobs_by_name(SLOT_JOB_PREFIX + slot):
+        return
+
+    _, seconds_until = calculate_next_run_time(parse_time_string(slot))
+    job_queue.run_repeating(
+        scheduled_news_job,
+        interval=DAILY_INTERVAL_SECONDS,
+        first=seconds_until,
+        name=SLOT_JOB_PREFIX + slot,
+        data=slot,
+    )
+
+
+def release_slot_job(job_queue: JobQueue, slot: str) -> None:
+    """예약 시간에 남은 구독자가 없으면 작업을 제거합니다."""
+    if schedule_store.subscribers(slot):
+        return
+
+    for job in job_queue.get_jobs_by_name(SLOT_JOB_PREFIX + slot):
+        job.schedule_removal()
+
+
 # ====================================
 # 명령어 핸들러 함수들
 # ====================================
@@ -203,13 +266,18 @@ async def get_news(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     )
 
     try:
-        # 2. kickoff_crew() 함수를 호출하여 뉴스 데이터 가져오기
-        result = kickoff_crew()
-        chat_id = update.effective_chat.id
-
-        # 3. send_long_message 함수를 통해 분할 전송
-        await send_long_message(context, chat_id, result)
+        # 2. 공유 브리핑 서비스에서 섹션이 완성되는 대로 받아 분할 전송
+        #    (캐시 / 진행 중인 생성 결과 재사용)
+        await stream_briefing_message(context, update.effective_chat.id)
 
+    except CrewRunnerBusy:
+        await update.message.reply_text(
+            "⏳ 지금은 요청이 많아 브리핑을 준비할 수 없습니다. 잠시 후 다시 시도해주세요."
+        )
+    except asyncio.TimeoutError:
+        await update.message.reply_text(
+            "⌛ 뉴스 브리핑 생성 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."
+        )
     except Exception as e:
         await update.message.reply_text(
             f"❌ 뉴스 브리핑을 가져오는 중 오류가 발생했습니다: {str(e)}"
@@ -244,24 +312,19 @@ async def set_schedule(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     try:
         # 시간 파싱
         schedule_time = parse_time_string(context.args[0])
+        slot = schedule_time.strftime("%H:%M")
         chat_id = update.effective_chat.id
 
-        # 스케줄 관리: 기존 스케줄 제거 (한 사용자당 하나의 스케줄만 허용)
-        current_jobs = context.job_queue.get_jobs_by_name(str(chat_id))
-        for job in current_jobs:
-            job.schedule_removal()
+        # 스케줄 저장 (한 사용자당 하나의 스케줄만 허용, 재시작 후에도 유지)
+        previous_slot = schedule_store.set(chat_id, slot)
 
         # 다음 실행 시간 계산
         target_time, seconds_until = calculate_next_run_time(schedule_time)
 
-        # 새 스케줄 설정
-        context.job_queue.run_repeating(
-            scheduled_news_job,
-            interval=DAILY_INTERVAL_SECONDS,
-            first=seconds_until,
-            chat_id=chat_id,
-            name=str(chat_id),
-        )
+        # 예약 시간 작업 등록 (같은 시간 구독자들은 하나의 작업을 공유)
+        ensure_slot_job(context.job_queue, slot)
+        if previous_slot and previous_slot != slot:
+            release_slot_job(context.job_queue, previous_slot)
 
         # 확인 메시지 전송 (다음 실행 시간 및 남은 시간 포함)
         time_remaining = format_time_remaining(seconds_until)
@@ -288,7 +351,10 @@ async def check_schedule(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         return
 
     chat_id = update.effective_chat.id
-    current_jobs = context.job_queue.get_jobs_by_name(str(chat_id))
+    slot = schedule_store.get(chat_id)
+    current_jobs = (
+        context.job_queue.get_jobs_by_name(SLOT_JOB_PREFIX + slot) if slot else []
+    )
 
     # 예외 처리: 예약된 스케줄이 없는 경우
     if not current_jobs:
@@ -329,19 +395,18 @@ async def cancel_schedule(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         return
 
     chat_id = update.effective_chat.id
-    current_jobs = context.job_queue.get_jobs_by_name(str(chat_id))
+    slot = schedule_store.remove(chat_id)
 
     # 예외 처리: 취소할 스케줄이 없는 경우
-    if not current_jobs:
+    if not slot:
         await update.message.reply_text(
             "⚠️ 예약된 스케줄이 없습니다.\n\n"
             "💡 /schedule HH:MM 명령어로 스케줄을 설정할 수 있습니다."
         )
         return
 
-    # 모든 스케줄 취소
-    for job in current_jobs:
-        job.schedule_removal()
+    # 마지막 구독자였다면 예약 시간 작업도 제거
+    release_slot_job(context.job_queue, slot)
 
     # 확인 메시지
     await update.message.reply_text(
@@ -357,32 +422,71 @@ async def cancel_schedule(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 async def scheduled_news_job(context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     스케줄된 시간에 실행되는 작업
-    매일 정해진 시간에 뉴스 브리핑을 전송합니다.
+    매일 정해진 시간에 해당 시간 구독자 모두에게 뉴스 브리핑을 전송합니다.
+    브리핑은 한 번만 생성되고, 섹션이 완성되는 대로 모든 구독자에게 전달됩니다.
     """
-    if not context.job or not context.job.chat_id:
+    if not context.job or not context.job.data:
         return
 
-    chat_id = context.job.chat_id
+    slot = context.job.data
+    subscribers = schedule_store.subscribers(slot)
+    if not subscribers:
+        context.job.schedule_removal()
+        return
 
-    # 시작 메시지 전송
-    await context.bot.send_message(
-        chat_id=chat_id, text="🕙 예정된 시간입니다! 뉴스 브리핑을 시작합니다..."
+    # 한 채팅의 전송 실패가 다른 구독자 전송을 멈추지 않도록 예외를 모아서 받습니다.
+    await asyncio.gather(
+        *(send_scheduled_briefing(context, chat_id) for chat_id in subscribers),
+        return_exceptions=True,
     )
 
-    try:
-        # 뉴스 브리핑 가져오기
-        result = kickoff_crew()
 
-        # 긴 메시지 분할 전송
-        await send_long_message(context, chat_id, result)
+async def send_scheduled_briefing(
+    context: ContextTypes.DEFAULT_TYPE, chat_id: int
+) -> None:
+    """예약된 구독자 한 명에게 뉴스 브리핑을 전송합니다."""
+    try:
+        # 시작 메시지 전송
+        await message_sender.send(
+            context.bot, chat_id, "🕙 예정된 시간입니다! 뉴스 브리핑을 시작합니다..."
+        )
+    except Forbidden:
+        # 봇을 차단했거나 나간 채팅은 구독을 정리합니다.
+        schedule_store.remove(chat_id)
+        return
 
+    try:
+        # 뉴스 브리핑을 섹션 단위로 전송 (같은 시간대 구독자들은 한 번 생성된 브리핑을 공유)
+        await stream_briefing_message(context, chat_id)
+
+    except CrewRunnerBusy:
+        await message_sender.send(
+            context.bot,
+            chat_id,
+            "⏳ 지금은 요청이 많아 예약된 브리핑을 준비하지 못했습니다. /get 으로 다시 받아보세요.",
+        )
+    except asyncio.TimeoutError:
+        await message_sender.send(
+            context.bot,
+            chat_id,
+            "⌛ 뉴스 브리핑 생성 시간이 초과되었습니다. /get 으로 다시 받아보세요.",
+        )
+    except Forbidden:
+        schedule_store.remove(chat_id)
     except Exception as e:
-        await context.bot.send_message(
-            chat_id=chat_id,
-            text=f"❌ 뉴스 브리핑을 가져오는 중 오류가 발생했습니다: {str(e)}"
+        await message_sender.send(
+            context.bot,
+            chat_id,
+            f"❌ 뉴스 브리핑을 가져오는 중 오류가 발생했습니다: {str(e)}",
         )
 
 
+async def restore_schedules(app: Application) -> None:
+    """봇 시작 시 저장된 예약 시간마다 작업을 다시 등록합니다."""
+    for slot in schedule_store.slots():
+        ensure_slot_job(app.job_queue, slot)
+
+
 # ====================================
 # 메인 실행 함수
 # ====================================
@@ -391,8 +495,14 @@ def run_bot() -> None:
     """
     텔레그램 봇을 시작합니다.
     """
-    # Application 빌드
-    app = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    # Application 빌드 (브리핑을 기다리는 동안에도 다른 채팅을 처리하도록 동시 처리 활성화)
+    app = (
+        Application.builder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .concurrent_updates(True)
+        .post_init(restore_schedules)
+        .build()
+    )
 
     # 명령어 핸들러 등록
     handlers = [
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from typing import AsyncIterator, Callable
+from crew_runner import CrewRunner
+from delivery import SectionStream, split_message
+
+BRIEFING_FRESHNESS_SECONDS = 30 * 60  # 이 시간 안에 만든 브리핑은 모든 채팅에 재사용
+BRIEFING_RUN_KEY = "news_briefing"
+BRIEFING_TIMEOUT_SECONDS = 20 * 60  # 뉴스 크루는 검색 / 편집 / 큐레이션을 거치므로 채팅 응답보다 길게 기다림
+
+
+class BriefingService:
+    """
+    뉴스 브리핑을 한 번 생성해 여러 채팅이 함께 쓰도록 하는 서비스입니다.
+
+    - 크루 실행은 CrewRunner 의 워커 스레드에서 수행되어 이벤트 루프를 막지 않습니다.
+      (대기열 초과 시 CrewRunnerBusy, 시간 초과 시 asyncio.TimeoutError 가 전달됩니다.)
+    - producer 는 스트림 조각을 받을 콜백(on_chunk)을 인자로 받고, stream_briefing() 은
+      큐레이터가 섹션을 완성하는 대로 모든 구독 채팅에 내보냅니다.
+    - 생성 중에 들어온 요청은 새 크루를 띄우지 않고 진행 중인 결과를 함께 기다립니다. (single-flight)
+    - 생성된 브리핑은 freshness_seconds 동안 캐시되어 /get 과 예약 작업 모두에 그대로 제공됩니다.
+      기다리던 요청이 시간 초과로 끝나도 크루가 마저 완료되면 그 결과를 캐시합니다.
+    """
+
+    def __init__(
+        self,
+        producer: Callable[[Callable[[str], None]], str],
+        runner: CrewRunner,
+        freshness_seconds: float = BRIEFING_FRESHNESS_SECONDS,
+        timeout: float = BRIEFING_TIMEOUT_SECONDS,
+    ):
+        self._producer = producer
+        self._runner = runner
+        self.freshness_seconds = freshness_seconds
+        self.timeout = timeout
+        self._briefing: str | None = None
+        self._created_at = 0.0
+        self._inflight: asyncio.Future | None = None
+        self._stream: SectionStream | None = None
+
+    def cached_briefing(self) -> str | None:
+        """신선한 브리핑이 있으면 반환하고, 없으면 None 을 반환합니다."""
+        if self._briefing is None:
+            return None
+        if time.monotonic() - self._created_at >= self.freshness_seconds:
+            return None
+        return self._briefing
+
+    async def get_briefing(self, force_refresh: bool = False) -> str:
+        if not force_refresh:
+            briefing = self.cached_briefing()
+            if briefing is not None:
+                return briefing
+
+        self._ensure_inflight()
+
+        # 요청한 핸들러가 취소되더라도 공유 중인 크루 실행은 계속되도록 shield 합니다.
+        return await asyncio.shield(self._inflight)
+
+    async def stream_briefing(self, force_refresh: bool = False) -> AsyncIterator[str]:
+        """
+        브리핑을 섹션 단위로 내보냅니다.
+        신선한 캐시가 있으면 바로 내보내고, 없으면 생성 중인 스트림을 구독합니다.
+        생성이 실패하면 이미 내보낸 섹션 이후에 예외를 전달합니다.
+        """
+        if not force_refresh:
+            briefing = self.cached_briefing()
+            if briefing is not None:
+                for section in split_message(briefing):
+                    yield section
+                return
+
+        self._ensure_inflight()
+        inflight = self._inflight
+        async for section in self._stream.sections():
+            yield section
+        await asyncio.shield(inflight)
+
+    def _ensure_inflight(self) -> None:
+        if self._inflight is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+        self._stream = SectionStream(loop)
+        self._inflight = asyncio.ensure_future(
+            self._runner.run(
+                BRIEFING_RUN_KEY,
+                self._produce,
+                loop,
+                self._stream.feed,
+                time.monotonic(),
+                timeout=self.timeout,
+            )
+        )
+        self._inflight.add_done_callback(self._on_done)
+
+    def _produce(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        on_chunk: Callable[[str], None],
+        requested_at: float,
+    ) -> str:
+        """워커 스레드에서 실행됩니다. 결과는 기다리는 요청이 시간 초과로 끝났더라도 캐시합니다."""
+        # 앞선 크루가 시간 초과 뒤에 끝나 이 요청 이후의 브리핑을 남겼다면 크루를 다시 띄우지 않습니다.
+        briefing, created_at = self._briefing, self._created_at
+        if briefing is not None and created_at >= requested_at:
+            return briefing
+
+        briefing = self._producer(on_chunk)
+        loop.call_soon_threadsafe(self._store, briefing)
+        return briefing
+
+    def _store(self, briefing: str) -> None:
+        self._briefing = briefing
+        self._created_at = time.monotonic()
+
+    def _on_done(self, future: asyncio.Future) -> None:
+        stream, self._stream = self._stream, None
+        self._inflight = None
+        if future.cancelled() or future.exception() is not None:
+            stream.finish()
+            return
+        stream.finish(future.result())
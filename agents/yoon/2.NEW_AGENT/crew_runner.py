@@ -0,0 +1,99 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable
+
+# 크루 실행 설정
+CREW_WORKERS = 4  # 동시에 실행할 크루 수
+MAX_PENDING_RUNS = 16  # 실행 중 + 대기 중인 전체 요청 상한
+MAX_PENDING_PER_CHAT = 2  # 한 채팅에서 쌓일 수 있는 요청 상한
+CREW_TIMEOUT_SECONDS = 5 * 60
+
+
+class CrewRunnerBusy(Exception):
+    """대기열이 가득 차서 요청을 받을 수 없을 때 발생합니다."""
+
+
+class CrewRunner:
+    """
+    텔레그램 핸들러에서 블로킹 크루 실행을 제한된 스레드 풀로 넘기는 실행기입니다.
+
+    - 같은 채팅(key)의 요청은 순서대로 하나씩 실행됩니다.
+    - 전체 / 채팅별 대기 요청이 상한을 넘으면 CrewRunnerBusy 를 발생시킵니다.
+    - timeout 이 지나면 asyncio.TimeoutError 를 발생시키고, 아직 시작하지 않은 작업은 취소합니다.
+      이미 실행 중인 크루는 스레드를 강제로 멈출 수 없으므로 끝날 때까지 슬롯과 key 의 잠금을 차지해,
+      시간 초과 뒤에 들어온 같은 key 의 요청도 앞선 크루가 끝난 다음에 실행됩니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = CREW_WORKERS,
+        max_pending: int = MAX_PENDING_RUNS,
+        max_pending_per_chat: int = MAX_PENDING_PER_CHAT,
+        timeout: float = CREW_TIMEOUT_SECONDS,
+    ):
+        self.max_pending = max_pending
+        self.max_pending_per_chat = max_pending_per_chat
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="crew-runner"
+        )
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._chat_locks: dict[Hashable, asyncio.Lock] = {}
+        self._chat_pending: dict[Hashable, int] = {}
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _acquire(self, key: Hashable) -> None:
+        with self._pending_lock:
+            if self._pending >= self.max_pending:
+                raise CrewRunnerBusy("전체 대기열이 가득 찼습니다.")
+            if self._chat_pending.get(key, 0) >= self.max_pending_per_chat:
+                raise CrewRunnerBusy("이 채팅의 이전 요청이 아직 처리 중입니다.")
+            self._pending += 1
+            self._chat_pending[key] = self._chat_pending.get(key, 0) + 1
+
+    def _release(self, key: Hashable) -> None:
+        # 워커 스레드의 done 콜백에서도 호출되므로 잠금으로 보호합니다.
+        with self._pending_lock:
+            self._pending -= 1
+            self._chat_pending[key] -= 1
+            if self._chat_pending[key] == 0:
+                del self._chat_pending[key]
+                self._chat_locks.pop(key, None)
+
+    async def run(
+        self,
+        key: Hashable,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: float | None = None,
+    ) -> Any:
+        self._acquire(key)
+
+        lock = self._chat_locks.setdefault(key, asyncio.Lock())
+        try:
+            await lock.acquire()
+        except BaseException:
+            self._release(key)
+            raise
+
+        loop = asyncio.get_running_loop()
+        work: Future = self._executor.submit(func, *args)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(work), timeout or self.timeout
+            )
+        finally:
+            # 시작 전이면 취소되고, 실행 중이면 끝날 때 잠금과 슬롯을 반납합니다.
+            work.cancel()
+            work.add_done_callback(
+                lambda _: loop.call_soon_threadsafe(self._finish, key, lock)
+            )
+
+    def _finish(self, key: Hashable, lock: asyncio.Lock) -> None:
+        lock.release()
+        self._release(key)
@@ -1,53 +1,287 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
+import atexit
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+from collections import OrderedDict, deque
 from datetime import datetime
 
+# 저장소 설정 ("firebase" 또는 "sqlite", 환경 변수 CONVERSATION_STORE 로 선택)
+CONVERSATION_STORE = os.getenv("CONVERSATION_STORE", "firebase")
+FIREBASE_CREDENTIAL_PATH = "crewai-43359-firebase-adminsdk-fbsvc-cdcf23933c.json"
+SQLITE_DB_PATH = os.getenv("CONVERSATION_DB_PATH", "data/conversations.db")
 
-class FirebaseDB:
+# 대화 기록 쓰기 설정
+WRITE_BATCH_SIZE = 20  # 이만큼 쌓이면 바로 기록 (Firestore batch 최대 500건)
+WRITE_FLUSH_INTERVAL_SECONDS = 2.0  # 쌓인 기록을 최소 이 간격으로 기록
+MAX_PENDING_WRITES = 5000  # 저장소 장애 시 메모리에 보관할 최대 기록 수
 
-    def __init__(self):
-        cred = credentials.Certificate(
-            "crewai-43359-firebase-adminsdk-fbsvc-cdcf23933c.json"
-        )
+# 대화 맥락 설정
+CONTEXT_WINDOW = 10  # 채팅별로 참고할 최근 대화 수
+CONTEXT_CACHE_MAX_CHATS = 1024  # 메모리에 맥락을 유지할 최대 채팅 수 (LRU)
+
+
+class ConversationBackend(ABC):
+    """
+    대화 기록 저장소 인터페이스입니다.
+    기록은 {"chat_id", "user_message", "bot_response", "timestamp"} 형태의 dict 입니다.
+    """
+
+    @abstractmethod
+    def write(self, records: list[dict]) -> None:
+        """기록들을 한 번에 저장합니다. 실패하면 예외를 발생시킵니다."""
+
+    @abstractmethod
+    def load_recent(self, chat_id: int, limit: int) -> list[dict]:
+        """채팅의 최근 limit 개 기록을 오래된 순으로 반환합니다."""
+
+
+class FirebaseBackend(ConversationBackend):
+
+    def __init__(self, credential_path: str = FIREBASE_CREDENTIAL_PATH):
+        # SQLite 만 쓰는 환경에서는 firebase 패키지가 없어도 되도록 여기서 불러옵니다.
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+
+        cred = credentials.Certificate(credential_path)
         firebase_admin.initialize_app(cred)
 
+        self._firestore = firestore
         self.db = firestore.client()
         self.collection_name = "conversation_history"
 
-    def save_conversation(self, user_message: str, bot_response: str):
+    def write(self, records: list[dict]) -> None:
+        collection = self.db.collection(self.collection_name)
+        batch = self.db.batch()
+        for doc_data in records:
+            batch.set(collection.document(), doc_data)
+        batch.commit()
+
+    def load_recent(self, chat_id: int, limit: int) -> list[dict]:
+        # chat_id + timestamp 복합 색인이 필요합니다.
+        docs = (
+            self.db.collection(self.collection_name)
+            .where(filter=self._firestore.FieldFilter("chat_id", "==", chat_id))
+            .order_by("timestamp", direction="DESCENDING")
+            .limit(limit)
+            .stream()
+        )
+        return list(reversed([doc.to_dict() for doc in docs]))
+
+
+class SQLiteBackend(ConversationBackend):
+    """네트워크 없이 동작하는 로컬 저장소입니다. (단일 노드 배포, 오프라인 부하 테스트용)"""
+
+    def __init__(self, db_path: str = SQLITE_DB_PATH):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS conversation_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id INTEGER NOT NULL,
+                user_message TEXT NOT NULL,
+                bot_response TEXT NOT NULL,
+                timestamp TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_conversation_chat_timestamp
+                ON conversation_history (chat_id, timestamp);
+            """
+        )
+        self._conn.commit()
+
+    def write(self, records: list[dict]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO conversation_history "
+                "(chat_id, user_message, bot_response, timestamp) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        doc_data["chat_id"],
+                        doc_data["user_message"],
+                        doc_data["bot_response"],
+                        doc_data["timestamp"].isoformat(),
+                    )
+                    for doc_data in records
+                ],
+            )
+            self._conn.commit()
+
+    def load_recent(self, chat_id: int, limit: int) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chat_id, user_message, bot_response, timestamp "
+                "FROM conversation_history WHERE chat_id = ? "
+                "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (chat_id, limit),
+            ).fetchall()
+        return [
+            {
+                "chat_id": row[0],
+                "user_message": row[1],
+                "bot_response": row[2],
+                "timestamp": datetime.fromisoformat(row[3]),
+            }
+            for row in reversed(rows)
+        ]
+
+
+class ConversationStore:
+    """
+    저장소 종류와 관계없이 같은 방식으로 대화 기록을 다루는 계층입니다.
+
+    - 응답 경로에서 저장소를 기다리지 않도록 기록은 버퍼에 모아 백그라운드 스레드에서 일괄 저장합니다.
+    - 채팅별 최근 대화는 메모리 LRU 에 유지하고, 없을 때만 저장소에서 불러옵니다.
+    """
+
+    def __init__(self, backend: ConversationBackend):
+        self.backend = backend
+
+        self._pending: list[dict] = []
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._flush_loop, name="conversation-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+        # chat_id -> {"turns": 최근 대화 deque, "context": 만들어 둔 맥락 문자열}
+        self._contexts: OrderedDict[int, dict] = OrderedDict()
+        self._contexts_lock = threading.Lock()
+
+    def save_conversation(self, chat_id: int, user_message: str, bot_response: str):
         doc_data = {
+            "chat_id": chat_id,
             "user_message": user_message,
             "bot_response": bot_response,
             "timestamp": datetime.now(),
         }
 
-        self.db.collection(self.collection_name).add(doc_data)
+        with self._pending_lock:
+            self._pending.append(doc_data)
+            pending = len(self._pending)
 
-    def get_conversation_context(self, limit=10):
-        docs = list(
-            self.db.collection(self.collection_name)
-            .order_by("timestamp", direction="ASCENDING")
-            .limit(limit)
-            .stream()
+        # 메모리의 맥락은 저장소를 다시 조회하지 않고 증분으로 갱신합니다.
+        with self._contexts_lock:
+            entry = self._contexts.get(chat_id)
+            if entry is not None:
+                entry["turns"].append(doc_data)
+                entry["context"] = None
+                self._contexts.move_to_end(chat_id)
+
+        if pending >= WRITE_BATCH_SIZE:
+            self._wakeup.set()
+
+    def flush(self):
+        """버퍼에 쌓인 기록을 일괄 저장합니다. 실패하면 다음 flush 때 다시 시도합니다."""
+        with self._flush_lock:
+            with self._pending_lock:
+                records, self._pending = self._pending, []
+
+            for start in range(0, len(records), WRITE_BATCH_SIZE):
+                try:
+                    self.backend.write(records[start : start + WRITE_BATCH_SIZE])
+                except Exception as e:
+                    with self._pending_lock:
+                        self._pending = (records[start:] + self._pending)[
+                            -MAX_PENDING_WRITES:
+                        ]
+                    print(f"대화 기록 저장 실패 ({len(records) - start}건 재시도 예정): {e}")
+                    return
+
+    def close(self):
+        """백그라운드 기록을 멈추고 남은 기록을 모두 저장합니다. 여러 번 호출해도 안전합니다."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._writer.join()
+        self.flush()
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wakeup.wait(WRITE_FLUSH_INTERVAL_SECONDS)
+            self._wakeup.clear()
+            if self._pending:
+                self.flush()
+
+    def get_conversation_context(self, chat_id: int) -> str:
+        """
+        채팅의 최근 CONTEXT_WINDOW 개 대화를 오래된 순으로 정리해 반환합니다.
+        메모리에 있으면 바로 반환하고, 없을 때만 저장소에서 불러옵니다.
+        """
+        with self._contexts_lock:
+            entry = self._contexts.get(chat_id)
+            if entry is not None:
+                self._contexts.move_to_end(chat_id)
+                if entry["context"] is None:
+                    entry["context"] = self._format_context(entry["turns"])
+                return entry["context"]
+
+        turns = self._load_turns(chat_id)
+
+        with self._contexts_lock:
+            # 불러오는 동안 다른 스레드가 먼저 채웠다면 그 값을 사용합니다.
+            entry = self._contexts.setdefault(
+                chat_id, {"turns": turns, "context": None}
+            )
+            self._contexts.move_to_end(chat_id)
+            while len(self._contexts) > CONTEXT_CACHE_MAX_CHATS:
+                self._contexts.popitem(last=False)
+            if entry["context"] is None:
+                entry["context"] = self._format_context(entry["turns"])
+            return entry["context"]
+
+    def _load_turns(self, chat_id: int) -> deque:
+        turns = deque(
+            self.backend.load_recent(chat_id, CONTEXT_WINDOW), maxlen=CONTEXT_WINDOW
         )
 
-        if not docs:
+        # 아직 저장소에 기록되지 않은 대화도 맥락에 포함합니다.
+        with self._pending_lock:
+            turns.extend(
+                doc_data for doc_data in self._pending if doc_data["chat_id"] == chat_id
+            )
+        return turns
+
+    @staticmethod
+    def _format_context(turns: deque) -> str:
+        if not turns:
             return "이전 대화 없음"
 
-        context = "=== 최근 대화 기록 ===\n"
-        for i, chat in enumerate(docs, 1):
-            context += f"{i}. 사용자: {chat.get("user_message")}\n"
-            context += f"     봇: {chat.get("bot_response")}\n\n"
+        lines = ["=== 최근 대화 기록 ==="]
+        for i, chat in enumerate(turns, 1):
+            lines.append(f"{i}. 사용자: {chat.get('user_message')}")
+            lines.append(f"     봇: {chat.get('bot_response')}\n")
+        return "\n".join(lines) + "\n"
+
+
+def create_backend(kind: str = CONVERSATION_STORE) -> ConversationBackend:
+    if kind == "firebase":
+        return FirebaseBackend()
+    if kind == "sqlite":
+        return SQLiteBackend()
+    raise ValueError(
+        f"알 수 없는 CONVERSATION_STORE 값입니다: {kind} (firebase 또는 sqlite)"
+    )
+
 
-        return context
+db = ConversationStore(create_backend())
 
 
-db = FirebaseDB()
+def add_to_conversation(chat_id, user_message, bot_response):
+    db.save_conversation(chat_id, user_message, bot_response)
 
 
-def add_to_conversation(user_message, bot_response):
-    db.save_conversation(user_message, bot_response)
+def get_conversation_context(chat_id):
+    return db.get_conversation_context(chat_id)
 
 
-def get_conversation_context():
-    return db.get_conversation_context()
+def flush_conversations():
+    db.close()
@@ -0,0 +1,221 @@
+import asyncio
+import re
+import time
+import weakref
+from datetime import timedelta
+from telegram import Bot
+from telegram.error import RetryAfter
+
+# 메시지 전송 설정
+MAX_MESSAGE_LENGTH = 3000  # 텔레그램 메시지 분할 기준 (요구사항: 3000자, 텔레그램 한도는 4096자)
+STREAM_MIN_CHARS = 1500  # 스트리밍 시 이 길이만큼 섹션이 모이면 바로 전송
+PER_CHAT_INTERVAL_SECONDS = 1.0  # 같은 채팅에 연속 전송할 때의 최소 간격
+GLOBAL_MESSAGES_PER_SECOND = 25  # 봇 전체 전송 속도 (텔레그램 권장 한도 30건/초 이하)
+MAX_SEND_RETRIES = 3
+FINAL_ANSWER_MARKER = "Final Answer:"
+SECTION_SEPARATOR = re.compile(r"^\s*[=─━-]{10,}\s*$")
+
+
+def split_message(text: str, max_length: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """
+    긴 메시지를 여러 개의 짧은 메시지로 분할합니다.
+
+    줄 단위로 버퍼에 모으고 길이를 누적 계산하므로 전체 길이에 대해 선형 시간에 동작합니다.
+    한 줄이 max_length 보다 길면 강제로 잘라서 분할합니다.
+
+    Args:
+        text: 분할할 텍스트
+        max_length: 최대 메시지 길이 (기본값: 3000)
+
+    Returns:
+        분할된 메시지 리스트
+    """
+    if len(text) <= max_length:
+        return [text]
+
+    messages = []
+    buffer: list[str] = []
+    buffer_length = 0  # "\n".join(buffer) 의 길이
+
+    for line in text.split("\n"):
+        # 한 줄 자체가 너무 긴 경우 강제로 분할
+        while len(line) > max_length:
+            if buffer:
+                messages.append("\n".join(buffer))
+                buffer, buffer_length = [], 0
+            messages.append(line[:max_length])
+            line = line[max_length:]
+
+        added_length = len(line) + (1 if buffer else 0)
+        if buffer and buffer_length + added_length > max_length:
+            messages.append("\n".join(buffer))
+            buffer, buffer_length = [], 0
+            added_length = len(line)
+
+        buffer.append(line)
+        buffer_length += added_length
+
+    if buffer and buffer_length:
+        messages.append("\n".join(buffer))
+
+    return messages
+
+
+class SectionStream:
+    """
+    워커 스레드에서 들어오는 LLM 스트림 조각을 섹션 단위로 모아 여러 구독자에게 전달합니다.
+
+    - "Final Answer:" 이후의 텍스트만 리포트로 취급하고, 구분선(===, ───)을 만나면 섹션을 내보냅니다.
+    - 스트림이 오지 않은 경우 (스트리밍 미지원 등) finish() 에 전달된 최종 결과로 섹션을 만듭니다.
+    - 생성된 섹션은 모두 보관하므로 늦게 구독한 채팅도 처음부터 받습니다.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._sections: list[str] = []
+        self._started = False
+        self._partial_line = ""
+        self._current: list[str] = []
+        self._done = False
+        self._changed = asyncio.Condition()
+
+    def feed(self, chunk: str) -> None:
+        """스트림 조각을 추가합니다. 어떤 스레드에서 호출해도 안전합니다."""
+        self._loop.call_soon_threadsafe(self._feed, chunk)
+
+    def _feed(self, chunk: str) -> None:
+        if self._done:
+            return
+
+        lines = (self._partial_line + chunk).split("\n")
+        self._partial_line = lines.pop()
+        emitted = False
+
+        for line in lines:
+            if not self._started:
+                if FINAL_ANSWER_MARKER not in line:
+                    continue
+                self._started = True
+                line = line.split(FINAL_ANSWER_MARKER, 1)[1].lstrip()
+
+            self._current.append(line)
+            if SECTION_SEPARATOR.match(line):
+                emitted = self._emit_current() or emitted
+
+        if emitted:
+            self._loop.create_task(self._notify())
+
+    def finish(self, final_text: str | None = None) -> None:
+        """생성이 끝났음을 알립니다. 이벤트 루프 스레드에서 호출해야 합니다."""
+        if self._done:
+            return
+
+        if self._started:
+            if self._partial_line:
+                self._current.append(self._partial_line)
+            self._emit_current()
+        elif final_text:
+            self._sections.append(final_text.strip())
+
+        self._done = True
+        self._loop.create_task(self._notify())
+
+    def _emit_current(self) -> bool:
+        section = "\n".join(self._current).strip()
+        self._current = []
+        if not section or SECTION_SEPARATOR.match(section):
+            # 구분선만 있는 섹션은 다음 섹션 앞에 붙여 보냅니다.
+            if section:
+                self._current.append(section)
+            return False
+        self._sections.append(section)
+        return True
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def sections(self):
+        """지금까지 생성된 섹션부터 순서대로 내보내고, 스트림이 끝나면 종료합니다."""
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda: index < len(self._sections) or self._done
+                )
+                pending = self._sections[index:]
+                done = self._done
+            for section in pending:
+                yield section
+            index += len(pending)
+            if done and index >= len(self._sections):
+                return
+
+
+class MessageSender:
+    """
+    텔레그램 전송 속도 제한을 지키며 메시지를 보내는 전송기입니다.
+
+    - 같은 채팅에는 PER_CHAT_INTERVAL_SECONDS 간격으로, 순서대로 전송합니다.
+    - 봇 전체 전송 속도를 GLOBAL_MESSAGES_PER_SECOND 이하로 맞춥니다.
+    - 429 (RetryAfter) 응답을 받으면 안내된 시간만큼 기다린 뒤 다시 보냅니다.
+    """
+
+    def __init__(
+        self,
+        per_chat_interval: float = PER_CHAT_INTERVAL_SECONDS,
+        messages_per_second: float = GLOBAL_MESSAGES_PER_SECOND,
+        max_retries: int = MAX_SEND_RETRIES,
+    ):
+        self.per_chat_interval = per_chat_interval
+        self.global_interval = 1 / messages_per_second
+        self.max_retries = max_retries
+        self._chat_locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._chat_next: dict[int, float] = {}
+        self._global_next = 0.0
+
+    async def _wait_global_slot(self) -> None:
+        # 다음 전송 가능 시각을 먼저 예약하므로 잠금 없이도 동시 전송이 간격을 지킵니다.
+        now = time.monotonic()
+        slot = max(now, self._global_next)
+        self._global_next = slot + self.global_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def send(self, bot: Bot, chat_id: int, text: str) -> None:
+        lock = self._chat_locks.get(chat_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._chat_locks[chat_id] = lock
+
+        async with lock:
+            delay = self._chat_next.get(chat_id, 0.0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            for attempt in range(self.max_retries + 1):
+                await self._wait_global_slot()
+                try:
+                    await bot.send_message(chat_id=chat_id, text=text)
+                    break
+                except RetryAfter as e:
+                    if attempt == self.max_retries:
+                        raise
+                    retry_after = e.retry_after
+                    if isinstance(retry_after, timedelta):
+                        retry_after = retry_after.total_seconds()
+                    # 텔레그램이 요구한 시간 동안은 다른 채팅 전송도 멈춥니다.
+                    self._global_next = max(
+                        self._global_next, time.monotonic() + retry_after
+                    )
+                    await asyncio.sleep(retry_after)
+
+            self._chat_next[chat_id] = time.monotonic() + self.per_chat_interval
+            if len(self._chat_next) > 10_000:
+                now = time.monotonic()
+                self._chat_next = {
+                    key: value for key, value in self._chat_next.items() if value > now
+                }
+
+
+message_sender = MessageSender()
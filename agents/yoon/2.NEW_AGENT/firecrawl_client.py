@@ -0,0 +1,18 @@
+import threading
+from firecrawl import Firecrawl
+from env import FIRECRAWL_API_KEY
+
+_firecrawl: Firecrawl | None = None
+_firecrawl_lock = threading.Lock()
+
+
+def get_firecrawl() -> Firecrawl:
+    """프로세스 전체에서 공유하는 Firecrawl 클라이언트를 처음 호출될 때 한 번만 생성합니다."""
+    global _firecrawl
+
+    if _firecrawl is None:
+        with _firecrawl_lock:
+            if _firecrawl is None:
+                _firecrawl = Firecrawl(api_key=FIRECRAWL_API_KEY)
+
+    return _firecrawl
@@ -1,7 +1,12 @@
-from crewai import Crew, Agent, Task
+from crewai import Crew, Agent, Task, LLM
 from crewai.project import CrewBase, task, agent, crew
 from env import OPENAI_API_KEY
-from tools import web_search_tool, global_news_rss_tool, korean_news_rss_tool
+from tools import (
+    web_search_tool,
+    batch_scrape_tool,
+    global_news_rss_tool,
+    korean_news_rss_tool,
+)
 
 import os
 
@@ -42,7 +47,7 @@ class NewsCrew:
             2. **도구 호출 결과를 기다리고 받은 실제 데이터만 사용**해야 합니다.
             3. **절대로 임의의 뉴스나 예시 데이터를 생성하지 마세요.**
             4. RSS 도구에서 받은 데이터를 중요도와 관련성에 따라 정렬하세요 (최신순 우선).
-            5. 중복된 기사를 제거하세요.
+            5. 도구가 이미 중복 기사를 제거한 결과를 반환하므로 별도의 중복 제거는 하지 마세요.
             6. 상위 {FETCH_NEWS_COUNT}개의 가장 핫한 이슈 기사를 선별하세요.
 
             **경고: 이 작업은 실제 뉴스 수집이므로 반드시 global_news_rss_tool을 호출해야 하며,
@@ -80,7 +85,7 @@ class NewsCrew:
             2. **도구 호출 결과를 기다리고 받은 실제 데이터만 사용**해야 합니다.
             3. **절대로 임의의 뉴스나 예시 데이터를 생성하지 마세요.**
             4. RSS 도구에서 받은 데이터를 중요도와 시의성에 따라 분석하세요.
-            5. 중복 기사 및 유사 기사를 제거하세요.
+            5. 도구가 이미 중복 기사 및 유사 기사를 제거한 결과를 반환하므로 별도의 중복 제거는 하지 마세요.
             6. 상위 {FETCH_NEWS_COUNT}개의 가장 핫한 한국 뉴스를 선별하세요.
 
             **경고: 이 작업은 실제 뉴스 수집이므로 반드시 korean_news_rss_tool을 호출해야 하며,
@@ -120,7 +125,7 @@ class NewsCrew:
             """,
             llm="openai/o4-mini",
             verbose=True,
-            tools=[web_search_tool],
+            tools=[batch_scrape_tool, web_search_tool],
         )
 
     @task
@@ -137,7 +142,8 @@ class NewsCrew:
                - 각 기사의 link 필드에 있는 URL에 접근하여 실제 기사 본문을 추출합니다.
 
             2. **기사 본문 추출**:
-               - 각 뉴스 링크에 접속하여 기사의 실제 본문 내용을 추출합니다.
+               - 모든 기사의 link URL 목록을 batch_scrape_tool에 한 번에 전달하여 본문을 병렬로 가져옵니다.
+               - 기사마다 web_search_tool을 따로 호출하지 마세요. (batch_scrape_tool이 실패한 URL만 필요 시 재시도)
                - 광고, 관련 기사, 댓글 등 불필요한 내용은 제외하고 핵심 기사 내용만 추출합니다.
                - 제목, 날짜, 본문, 출처를 명확히 구분하여 추출합니다.
 
@@ -190,7 +196,8 @@ class NewsCrew:
             독자들에게 가장 가치 있는 뉴스만을 엄선합니다.
             최종적으로 보기 좋은 형태의 리포트를 작성하여 독자들이 쉽게 이해할 수 있도록 정리합니다.
             """,
-            llm="openai/o4-mini",
+            # 리포트를 섹션 단위로 먼저 보내기 위해 큐레이터만 스트리밍으로 생성
+            llm=LLM(model="openai/o4-mini", stream=True),
             verbose=True,
         )
 
@@ -302,5 +309,7 @@ class NewsCrew:
             verbose=True,
         )
 
-news_crew = NewsCrew()
-news_crew.crew().kickoff()
+
+if __name__ == "__main__":
+    news_crew = NewsCrew()
+    news_crew.crew().kickoff()
@@ -0,0 +1,146 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+
+# RSS 수집 설정
+FEED_DEADLINE_SECONDS = 15.0  # 전체 피드 수집 마감 시간
+FEED_TIMEOUT_SECONDS = 10.0  # 피드 하나당 요청 타임아웃
+MAX_FEED_WORKERS = 10
+
+
+class RssEngine:
+    """
+    여러 RSS 피드를 동시에 수집하는 엔진입니다.
+
+    - 모든 피드를 스레드 풀에서 병렬로 가져오고, 전체 마감 시간이 지나면
+      도착한 피드 결과만 반환합니다.
+    - 피드별 ETag / Last-Modified 를 기억해 조건부 요청을 보내고,
+      304 Not Modified 응답이면 직전에 파싱한 기사를 그대로 재사용합니다.
+    """
+
+    def __init__(
+        self,
+        deadline: float = FEED_DEADLINE_SECONDS,
+        feed_timeout: float = FEED_TIMEOUT_SECONDS,
+        max_workers: int = MAX_FEED_WORKERS,
+    ):
+        self.deadline = deadline
+        self.feed_timeout = feed_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="rss-engine"
+        )
+        self._session = requests.Session()
+        self._session.mount(
+            "https://", HTTPAdapter(pool_connections=max_workers, pool_maxsize=2)
+        )
+        self._session.mount(
+            "http://", HTTPAdapter(pool_connections=max_workers, pool_maxsize=2)
+        )
+        # feed_url -> {"etag", "last_modified", "entries"}
+        self._validators: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _fetch_feed(self, source_name: str, feed_url: str, each: int) -> dict:
+        started = time.perf_counter()
+        try:
+            status, entries = self._request_feed(source_name, feed_url)
+        except Exception as e:
+            return {
+                "status": "error",
+                "articles": [],
+                "elapsed_ms": round((time.perf_counter() - started) * 1000),
+                "error": str(e),
+            }
+
+        return {
+            "status": status,
+            "articles": entries[:each],
+            "elapsed_ms": round((time.perf_counter() - started) * 1000),
+        }
+
+    def _request_feed(self, source_name: str, feed_url: str) -> tuple[str, list]:
+        with self._lock:
+            cached = self._validators.get(feed_url, {})
+
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = self._session.get(
+            feed_url, headers=headers, timeout=min(self.feed_timeout, self.deadline)
+        )
+
+        if response.status_code == 304 and "entries" in cached:
+            entries = cached["entries"]
+            status = "not_modified"
+        elif response.status_code == 200:
+            feed = feedparser.parse(response.content)
+            entries = [
+                {
+                    "title": getattr(entry, "title", "No Title"),
+                    "link": getattr(entry, "link", ""),
+                    "summary": getattr(entry, "summary", "No Summary"),
+                    "published": getattr(entry, "published", ""),
+                    "source": source_name,
+                }
+                for entry in feed.entries
+            ]
+            with self._lock:
+                self._validators[feed_url] = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "entries": entries,
+                }
+            status = "ok"
+        else:
+            raise RuntimeError(f"HTTP {response.status_code}")
+
+        return status, entries
+
+    def fetch(self, rss_feeds: dict[str, str], each: int = 10) -> dict:
+        """
+        모든 피드를 병렬로 수집합니다.
+
+        Returns:
+            {"articles": [...], "feeds": {source_name: {status, elapsed_ms, articles, error}}}
+        """
+        started = time.perf_counter()
+        futures = {
+            self._executor.submit(self._fetch_feed, source_name, feed_url, each): source_name
+            for source_name, feed_url in rss_feeds.items()
+        }
+        _, not_done = wait(futures, timeout=self.deadline)
+
+        all_articles = []
+        feed_stats = {}
+
+        # 피드 순서를 유지하기 위해 입력 순서대로 결과를 모읍니다.
+        for future, source_name in futures.items():
+            if future in not_done:
+                future.cancel()
+                feed_stats[source_name] = {
+                    "status": "timeout",
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000),
+                    "articles": 0,
+                }
+                continue
+
+            result = future.result()
+            all_articles.extend(result["articles"])
+            feed_stats[source_name] = {
+                "status": result["status"],
+                "elapsed_ms": result["elapsed_ms"],
+                "articles": len(result["articles"]),
+            }
+            if "error" in result:
+                feed_stats[source_name]["error"] = result["error"]
+
+        return {"articles": all_articles, "feeds": feed_stats}
+
+
+rss_engine = RssEngine()
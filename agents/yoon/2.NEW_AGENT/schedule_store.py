@@ -0,0 +1,87 @@
+import os
+import sqlite3
+import threading
+import time
+
+# 스케줄 저장소 설정
+SCHEDULE_DB_PATH = "data/schedules.db"
+
+
+class ScheduleStore:
+    """
+    채팅별 예약 시간(HH:MM)을 SQLite 에 저장하는 저장소입니다.
+
+    봇을 재시작해도 구독이 유지되도록 시작 시 slots() 로 예약 시간을 불러오고,
+    같은 시간을 고른 구독자들은 subscribers(slot) 로 한 번에 조회합니다.
+    한 채팅은 하나의 예약 시간만 가질 수 있습니다.
+    """
+
+    def __init__(self, db_path: str = SCHEDULE_DB_PATH):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS subscriptions (
+                chat_id INTEGER PRIMARY KEY,
+                slot TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_subscriptions_slot
+                ON subscriptions (slot);
+            """
+        )
+        self._conn.commit()
+
+    def get(self, chat_id: int) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT slot FROM subscriptions WHERE chat_id = ?", (chat_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, chat_id: int, slot: str) -> str | None:
+        """채팅의 예약 시간을 저장하고, 이전 예약 시간이 있으면 반환합니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT slot FROM subscriptions WHERE chat_id = ?", (chat_id,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO subscriptions VALUES (?, ?, ?)",
+                (chat_id, slot, time.time()),
+            )
+            self._conn.commit()
+        return row[0] if row else None
+
+    def remove(self, chat_id: int) -> str | None:
+        """채팅의 예약을 삭제하고, 삭제된 예약 시간을 반환합니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT slot FROM subscriptions WHERE chat_id = ?", (chat_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "DELETE FROM subscriptions WHERE chat_id = ?", (chat_id,)
+            )
+            self._conn.commit()
+        return row[0]
+
+    def subscribers(self, slot: str) -> list[int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chat_id FROM subscriptions WHERE slot = ?", (slot,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def slots(self) -> list[str]:
+        """구독자가 한 명 이상 있는 예약 시간 목록을 반환합니다."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT slot FROM subscriptions ORDER BY slot"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+schedule_store = ScheduleStore()
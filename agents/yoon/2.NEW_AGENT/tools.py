@@ -1,37 +1,41 @@
 from typing import Type, Any
+from concurrent.futures import ThreadPoolExecutor, wait
 from crewai.tools import BaseTool
-from firecrawl import Firecrawl
-import feedparser
-import requests
 from pydantic import BaseModel, Field
-from env import (
-    FIRECRAWL_API_KEY,
+from firecrawl_client import get_firecrawl
+from rss_engine import rss_engine
+from article_store import article_store
+
+SCRAPE_TIMEOUT_SECONDS = 30.0  # URL 하나당 스크랩 타임아웃
+MAX_SCRAPE_WORKERS = 8
+MAX_SCRAPE_CONTENT_CHARS = 4000  # 한 번의 도구 응답이 너무 커지지 않도록 본문 길이 제한
+
+_scrape_executor = ThreadPoolExecutor(
+    max_workers=MAX_SCRAPE_WORKERS, thread_name_prefix="batch-scrape"
 )
 
 
 def _get_rss(rss_feeds: dict[str, str], each: int = 10):
-    all_articles = []
-
-    for source_name, feed_url in rss_feeds.items():
-        try:
-            response = requests.get(feed_url, timeout=10)
-            if response.status_code == 200:
-                feed = feedparser.parse(response.content)
-
-                for entry in feed.entries[:each]:
-                    article = {
-                        "title": getattr(entry, "title", "No Title"),
-                        "link": getattr(entry, "link", ""),
-                        "summary": getattr(entry, "summary", "No Summary"),
-                        "published": getattr(entry, "published", ""),
-                        "source": source_name,
-                    }
-                    all_articles.append(article)
-
-        except Exception:
-            continue
+    # 모든 피드를 동시에 수집하고, 실패/지연된 피드는 feeds 통계에 기록됩니다.
+    return rss_engine.fetch(rss_feeds, each)
+
+
+def _get_new_articles(rss_feeds: dict[str, str], each: int = 10):
+    """
+    RSS 를 수집해 기사 저장소에 반영하고, 지난 브리핑 이후 새로 들어온 고유 기사만 반환합니다.
+    새 기사가 없으면 저장소의 최근 고유 기사로 대신합니다.
+    """
+    rss = _get_rss(rss_feeds, each)
+    new_articles = article_store.ingest(rss["articles"])
+    articles = new_articles or article_store.recent(
+        list(rss_feeds), each * len(rss_feeds)
+    )
 
-    return all_articles
+    return {
+        "articles": articles,
+        "new_articles": len(new_articles),
+        "feeds": rss["feeds"],
+    }
 
 
 class GlobalNewsRssToolInput(BaseModel):
@@ -55,7 +59,7 @@ class GlobalNewsRssTool(BaseTool):
             "CNN": "https://rss.cnn.com/rss/edition.rss",
         }
 
-        return _get_rss(global_rss_feeds, each)
+        return _get_new_articles(global_rss_feeds, each)
 
 
 class KoreanNewsRssToolInput(BaseModel):
@@ -83,7 +87,80 @@ class KoreanNewsRssTool(BaseTool):
             "한국경제": "https://www.hankyung.com/feed/all-news",
         }
 
-        return _get_rss(korean_rss_feeds, each)
+        return _get_new_articles(korean_rss_feeds, each)
+
+
+def _scrape(url: str, timeout: float = SCRAPE_TIMEOUT_SECONDS):
+    try:
+        cached = article_store.get_scraped(url)
+        if cached is not None:
+            return cached
+
+        app = get_firecrawl()
+
+        response: Any = app.scrape(url, timeout=int(timeout * 1000))
+
+        if not response:
+            return f"Failed to scrape content from URL: {url}"
+
+        title = "No Title"
+        content = ""
+
+        if hasattr(response, "metadata") and response.metadata:
+            metadata = response.metadata
+            if isinstance(metadata, dict):
+                title = metadata.get("title", "No Title")
+            else:
+                title = getattr(metadata, "title", None) or "No Title"
+
+        if hasattr(response, "content"):
+            content = response.content
+        elif hasattr(response, "text"):
+            content = response.text
+        elif hasattr(response, "markdown"):
+            content = response.markdown
+
+        result = {"title": title, "url": url, "content": content}
+        article_store.save_scraped(url, result)
+
+        return result
+    except Exception as e:
+        return f"Error scraping URL {url}: {e}"
+
+
+def _batch_scrape(urls: list[str], timeout: float = SCRAPE_TIMEOUT_SECONDS):
+    # 중복 URL 은 한 번만 스크랩하고, 입력 순서대로 결과를 반환합니다.
+    unique_urls = list(dict.fromkeys(url for url in urls if url))
+    futures = {
+        _scrape_executor.submit(_scrape, url, timeout): url for url in unique_urls
+    }
+    # 풀보다 URL 이 많으면 대기열이 생기므로, 라운드 수만큼 마감 시간을 늘려줍니다.
+    rounds = -(-len(unique_urls) // MAX_SCRAPE_WORKERS) or 1
+    _, not_done = wait(futures, timeout=timeout * rounds + 5)
+
+    articles = []
+    failed = []
+
+    for future, url in futures.items():
+        if future in not_done:
+            future.cancel()
+            failed.append({"url": url, "error": "timeout"})
+            continue
+
+        result = future.result()
+        if isinstance(result, dict):
+            content = result.get("content") or ""
+            if len(content) > MAX_SCRAPE_CONTENT_CHARS:
+                result = {**result, "content": content[:MAX_SCRAPE_CONTENT_CHARS] + "..."}
+            articles.append(result)
+        else:
+            failed.append({"url": url, "error": str(result)})
+
+    return {
+        "results_count": len(articles),
+        "results": articles,
+        "failed": failed,
+    }
 
 
 class WebSearchToolInput(BaseModel):
@@ -99,34 +176,28 @@ class WebSearchTool(BaseTool):
     args_schema: Type[BaseModel] = WebSearchToolInput
 
     def _run(self, url: str):
-        try:
-            app = Firecrawl(api_key=FIRECRAWL_API_KEY)
-
-            response: Any = app.scrape(url)
+        return _scrape(url)
 
-            if not response:
-                return f"Failed to scrape content from URL: {url}"
 
-            title = "No Title"
-            content = ""
+class BatchScrapeToolInput(BaseModel):
 
-            if hasattr(response, "metadata") and response.metadata:
-                title = response.metadata.get("title", "No Title")
+    urls: list[str] = Field(
+        ..., description="The list of article URLs to scrape content from."
+    )
 
-            if hasattr(response, "content"):
-                content = response.content
-            elif hasattr(response, "text"):
-                content = response.text
-            elif hasattr(response, "markdown"):
-                content = response.markdown
 
-            result = {"title": title, "url": url, "content": content}
+class BatchScrapeTool(BaseTool):
+    name: str = "batch_scrape_tool"
+    description: str = (
+        "Batch Web Content Scraper Tool. Scrapes many URLs at once in parallel and returns the title and body text of every article in a single call, plus the URLs that could not be scraped."
+    )
+    args_schema: Type[BaseModel] = BatchScrapeToolInput
 
-            return result
-        except Exception as e:
-            return f"Error scraping URL {url}: {e}"
+    def _run(self, urls: list[str]):
+        return _batch_scrape(urls)
 
 
 web_search_tool = WebSearchTool()
+batch_scrape_tool = BatchScrapeTool()
 global_news_rss_tool = GlobalNewsRssTool()
 korean_news_rss_tool = KoreanNewsRssTool()
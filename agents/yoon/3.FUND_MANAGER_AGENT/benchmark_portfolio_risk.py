@@ -0,0 +1,60 @@
+"""
+portfolio_metrics 의 계산 시간을 종목 수 x 가격 이력 길이별로 측정합니다.
+네트워크 없이 무작위 가격 경로를 만들어 사용하므로 다운로드 시간은 포함되지 않습니다.
+
+실행: uv run python benchmark_portfolio_risk.py [반복 횟수]
+"""
+
+import statistics
+import sys
+import time
+import numpy as np
+import pandas as pd
+from portfolio_risk import TRADING_DAYS, portfolio_metrics
+
+DEFAULT_ITERATIONS = 20
+UNIVERSE_SIZES = [5, 20, 50, 200]
+HISTORY_YEARS = [1, 3, 10]
+
+
+def synthetic_closes(tickers: int, years: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    days = years * TRADING_DAYS
+    returns = rng.normal(0.0004, 0.015, size=(days, tickers))
+    return pd.DataFrame(
+        100 * np.exp(np.cumsum(returns, axis=0)),
+        index=pd.bdate_range("2015-01-01", periods=days),
+        columns=[f"T{i:03d}" for i in range(tickers)],
+    )
+
+
+def measure(tickers: int, years: int, iterations: int) -> None:
+    closes = synthetic_closes(tickers, years)
+    weights = {ticker: 1 / tickers for ticker in closes.columns}
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        portfolio_metrics(closes, weights)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    samples.sort()
+    print(
+        f"{tickers:>4} tickers x {years:>2}y "
+        f"mean {statistics.mean(samples):8.2f} ms  "
+        f"p50 {samples[len(samples) // 2]:8.2f} ms  "
+        f"max {samples[-1]:8.2f} ms"
+    )
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS
+
+    print(f"반복 횟수: {iterations}")
+    for tickers in UNIVERSE_SIZES:
+        for years in HISTORY_YEARS:
+            measure(tickers, years, iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+import numpy as np
+import pandas as pd
+from market_data import market_data
+
+# 팩터 점수 설정
+MAX_INFO_WORKERS = 8  # info 동시 조회 수 (캐시에 없는 티커만 실제로 요청합니다)
+SCORE_SCALE = 10.0  # 기존 LLM 평가와 같은 0-10점 척도
+
+# 가치/배당 전략의 기본 스크리닝 유니버스 (S&P 500 대형 우량주 / 배당주)
+STABLE_UNIVERSE = [
+    "JNJ", "PG", "KO", "PEP", "WMT", "COST", "MCD", "CL", "KMB", "GIS",
+    "MDLZ", "HSY", "PM", "MO", "ABT", "MRK", "PFE", "ABBV", "AMGN", "BMY",
+    "UNH", "MDT", "JPM", "BAC", "WFC", "USB", "PNC", "BLK", "CB", "TRV",
+    "NEE", "DUK", "SO", "D", "AEP", "XEL", "ED", "WEC", "VZ", "T",
+    "XOM", "CVX", "HD", "LOW", "TGT", "MMM", "HON", "ITW", "CAT", "UPS",
+    "LMT", "RTX", "GD", "IBM", "CSCO", "TXN", "ADP", "O", "PLD", "AMT",
+]
+
+# info 키 -> 팩터 입력 컬럼 이름
+FUNDAMENTAL_FIELDS = {
+    "longName": "name",
+    "sector": "sector",
+    "revenueGrowth": "revenue_growth",
+    "earningsGrowth": "earnings_growth",
+    "trailingPE": "pe",
+    "forwardPE": "forward_pe",
+    "priceToBook": "pb",
+    "returnOnEquity": "roe",
+    "profitMargins": "profit_margin",
+    "operatingMargins": "operating_margin",
+    "debtToEquity": "debt_to_equity",
+    "dividendYield": "dividend_yield",
+    "fiveYearAvgDividendYield": "five_year_avg_dividend_yield",
+    "payoutRatio": "payout_ratio",
+    "beta": "beta",
+}
+
+# 점수표에 함께 남겨 프롬프트와 단계별 결과에 그대로 쓰는 원시 지표 (종류 -> 컬럼)
+RAW_METRICS = {
+    "growth": ["revenue_growth", "earnings_growth", "pe", "forward_pe"],
+    "stability": ["debt_to_equity", "pe", "roe", "dividend_yield"],
+    "dividend": ["dividend_yield", "five_year_avg_dividend_yield", "payout_ratio"],
+}
+_RAW_COLUMNS = list(dict.fromkeys(column for columns in RAW_METRICS.values() for column in columns))
+
+# 팩터 -> {입력 컬럼: (가중치, 값이 클수록 좋은지)}
+FACTORS = {
+    "growth": {
+        "revenue_growth": (0.35, True),
+        "earnings_growth": (0.35, True),
+        "momentum": (0.30, True),
+    },
+    "value": {
+        "earnings_yield": (0.40, True),
+        "forward_earnings_yield": (0.30, True),
+        "book_to_price": (0.30, True),
+    },
+    "quality": {
+        "roe": (0.25, True),
+        "profit_margin": (0.20, True),
+        "operating_margin": (0.15, True),
+        "debt_to_equity": (0.20, False),
+        "volatility": (0.20, False),
+    },
+    "dividend": {
+        "dividend_yield": (0.40, True),
+        "five_year_avg_dividend_yield": (0.20, True),
+        "payout_ratio": (0.20, False),
+        "beta": (0.20, False),
+    },
+}
+
+_info_executor = ThreadPoolExecutor(
+    max_workers=MAX_INFO_WORKERS, thread_name_prefix="factor-scores"
+)
+
+
+def _fetch_info(ticker: str) -> dict:
+    try:
+        return market_data.info(ticker)
+    except Exception:
+        return {}
+
+
+def load_fundamentals(tickers: list[str], period: str = "1y") -> pd.DataFrame:
+    """
+    티커별 팩터 입력값을 한 표로 모읍니다.
+    가격 이력은 일괄 다운로드하고 info 는 시장 데이터 캐시를 거쳐 동시에 조회합니다.
+    """
+    tickers = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers if ticker.strip()))
+    if not tickers:
+        return pd.DataFrame()
+
+    histories = market_data.history(tickers, period)
+    infos = dict(zip(tickers, _info_executor.map(_fetch_info, tickers)))
+
+    frame = pd.DataFrame.from_records(
+        [
+            {column: infos[ticker].get(key) for key, column in FUNDAMENTAL_FIELDS.items()}
+            for ticker in tickers
+        ],
+        index=tickers,
+    )
+    for column in frame.columns.difference(["name", "sector"]):
+        frame[column] = pd.to_numeric(frame[column], errors="coerce")
+
+    closes = pd.DataFrame(
+        {
+            ticker: histories[ticker]["Close"]
+            for ticker in tickers
+            if not histories[ticker].empty
+        }
+    )
+    if not closes.empty:
+        frame["momentum"] = closes.ffill().iloc[-1] / closes.bfill().iloc[0] - 1
+        frame["volatility"] = closes.pct_change().std() * np.sqrt(252)
+    else:
+        frame["momentum"] = np.nan
+        frame["volatility"] = np.nan
+
+    frame.index.name = "ticker"
+    return frame
+
+
+def score_fundamentals(fundamentals: pd.DataFrame) -> pd.DataFrame:
+    """
+    팩터 입력 표를 growth / value / quality / dividend 점수(0-10점)로 바꿉니다.
+
+    각 지표를 유니버스 안에서 백분위 순위로 바꾼 뒤 가중 평균하므로 결과는
+    입력이 같으면 항상 같고, 단위가 다른 지표도 같은 척도로 합칠 수 있습니다.
+    값이 없는 지표는 해당 티커의 가중치에서 빠지며, 배당이 없는 기업의 배당 점수는 0점입니다.
+    RAW_METRICS 의 원시 지표는 점수 옆에 그대로 남깁니다.
+    """
+    if fundamentals.empty:
+        return pd.DataFrame(columns=["name", "sector", *FACTORS, *_RAW_COLUMNS])
+
+    inputs = fundamentals.copy()
+    # P/E, P/B 는 역수로 바꿔 적자 기업(음수 P/E)이 가장 비싼 쪽으로 정렬되게 합니다.
+    inputs["earnings_yield"] = 1 / inputs["pe"]
+    inputs["forward_earnings_yield"] = 1 / inputs["forward_pe"]
+    inputs["book_to_price"] = 1 / inputs["pb"]
+    inputs = inputs.replace([np.inf, -np.inf], np.nan)
+
+    scores = inputs[["name", "sector"]].copy()
+    for factor, metrics in FACTORS.items():
+        weights = pd.Series({column: weight for column, (weight, _) in metrics.items()})
+        ranks = pd.DataFrame(
+            {
+                column: inputs[column].rank(pct=True, ascending=higher_is_better)
+                for column, (_, higher_is_better) in metrics.items()
+            }
+        )
+        weighted = ranks.mul(weights).sum(axis=1)
+        available = ranks.notna().mul(weights).sum(axis=1)
+        scores[factor] = (weighted / available.replace(0, np.nan)) * SCORE_SCALE
+
+    scores.loc[~(inputs["dividend_yield"] > 0), "dividend"] = 0.0
+    scores = scores.round(1)
+    scores[_RAW_COLUMNS] = fundamentals[_RAW_COLUMNS].round(4)
+    return scores
+
+
+def score_universe(tickers: list[str], period: str = "1y") -> pd.DataFrame:
+    return score_fundamentals(load_fundamentals(tickers, period))
+
+
+def format_scores(scores: pd.DataFrame, columns: list[str] | None = None) -> str:
+    """프롬프트에 넣을 점수표 문자열 (값이 없으면 N/A)"""
+    table = scores if columns is None else scores[["name", *columns]]
+    return table.to_string(na_rep="N/A")
+
+
+def raw_metrics(
+    scores: dict[str, dict[str, Any]], ticker: str, kind: str
+) -> dict[str, float | None]:
+    """점수표(state.factor_scores)에서 티커의 RAW_METRICS[kind] 값을 꺼냅니다. 값이 없으면 None"""
+    row = scores.get(ticker, {})
+    return {
+        column: None if pd.isna(row.get(column)) else row[column]
+        for column in RAW_METRICS[kind]
+    }
@@ -1,14 +1,57 @@
+import asyncio
+import json
 import os
-from typing import Optional
+import time
+from typing import Any, Optional
+import pandas as pd
 from pydantic import BaseModel
 from crewai.flow.flow import Flow, listen, start, router, or_
 from crewai.agent import Agent
 from crewai import Crew, Task, CrewOutput
 from env import OPENAI_API_KEY
-from tools import web_search_tool, yahoo_finance_tool
+from tools import web_search_tool, yahoo_finance_tool, yahoo_finance_batch_tool
+from step_timer import timed_step, format_timings
+from step_checkpoint import checkpointed
+from strategy_classifier import strategy_classifier, parse_strategy
+from factor_scores import (
+    FACTORS,
+    RAW_METRICS,
+    STABLE_UNIVERSE,
+    format_scores,
+    raw_metrics,
+    score_universe,
+)
+from portfolio_risk import backtest_portfolio, format_risk_report
+from stage_outputs import (
+    DividendPick,
+    GrowthPick,
+    PortfolioPlan,
+    SectorTrend,
+    StabilityPick,
+    parse_stage_output,
+    stage_guardrail,
+    to_json,
+    write_stage_output,
+)
 
 os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
 
+# 병렬 분석 설정
+MAX_PARALLEL_ANALYSES = 4  # 동시에 실행할 분석 크루 수 (API rate limit 고려)
+DIVIDEND_GROUP_SIZE = 3  # 배당 분석 크루 하나가 맡는 기업 수
+STABLE_SCREEN_SIZE = 9  # 정량 스크리닝에서 배당 분석으로 넘길 기업 수
+
+
+async def kickoff_parallel(crews: list[Crew]) -> list[CrewOutput]:
+    """서로 독립적인 크루들을 MAX_PARALLEL_ANALYSES 개씩 동시에 실행하고, 입력 순서대로 결과를 반환합니다."""
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_ANALYSES)
+
+    async def run(crew: Crew) -> CrewOutput:
+        async with semaphore:
+            return await crew.kickoff_async()
+
+    return await asyncio.gather(*(run(crew) for crew in crews))
+
 
 class FundManagerState(BaseModel):
 
@@ -19,6 +62,7 @@ class FundManagerState(BaseModel):
 
     # 라우터의 의사결정
     strategy_type: str = ""
+    routing_method: str = ""  # rule (키워드 분류) / llm (LLM 라우터)
 
     # 분석 결과들
     tech_trends: Optional[CrewOutput] = None
@@ -26,12 +70,27 @@ class FundManagerState(BaseModel):
     stability_scores: Optional[CrewOutput] = None
     divide_scores: Optional[CrewOutput] = None
 
+    # 검증된 단계별 결과 (다음 단계 프롬프트에는 이 필드들만 넘깁니다)
+    sectors: list[SectorTrend] = []
+    growth_picks: list[GrowthPick] = []
+    stable_picks: list[StabilityPick] = []
+    dividend_picks: list[DividendPick] = []
+
+    # 정량 팩터 점수 (티커 -> 팩터별 점수, factor_scores.score_universe 결과)
+    factor_scores: dict[str, dict[str, Any]] = {}
+
     portfolio: Optional[CrewOutput] = None
+    portfolio_plan: Optional[PortfolioPlan] = None
+    risk_report: dict[str, Any] = {}  # portfolio_risk.backtest_portfolio 결과
+
+    # 단계별 실행 시간 (초)
+    step_timings: dict[str, float] = {}
 
 
 class FundManagerFlow(Flow[FundManagerState]):
 
     @start()
+    @timed_step
     def init_fund_analysis(self):
         if not self.state.investment_goal:
             raise ValueError("투자 목표를 입력해주세요")
@@ -41,9 +100,21 @@ class FundManagerFlow(Flow[FundManagerState]):
             raise ValueError("예산을 입력해주세요")
 
     @listen(init_fund_analysis)
+    @timed_step
+    @checkpointed("strategy_type", "routing_method")
     def analyze_investment_strategy(self):
         """사용자 목표 분석"""
 
+        # 키워드만으로 확실한 경우에는 LLM 을 호출하지 않습니다.
+        strategy = strategy_classifier.classify(
+            self.state.investment_goal, self.state.risk_preference
+        )
+        if strategy is not None:
+            self.state.strategy_type = strategy
+            self.state.routing_method = "rule"
+            return
+
+        started = time.perf_counter()
         strategy_router = Agent(
             role="투자 전략 라우터",
             backstory="투자 전문가로서 고객의 투자 목표와 성향을 정확히 파악하여 최적의 투자 전략팀에게 분석을 위임하는 것이 전문입니다.",
@@ -66,12 +137,11 @@ class FundManagerFlow(Flow[FundManagerState]):
             """
         )
 
+        strategy_classifier.record_llm(time.perf_counter() - started)
+
         # Agent 결과에서 전략 추출
-        analysis_text = str(analysis_result).lower()
-        if "growth" in analysis_text:
-            self.state.strategy_type = "growth"
-        else:
-            self.state.strategy_type = "value"
+        self.state.strategy_type = parse_strategy(str(analysis_result))
+        self.state.routing_method = "llm"
 
     @router(analyze_investment_strategy)
     def strategy_router(self):
@@ -81,6 +151,8 @@ class FundManagerFlow(Flow[FundManagerState]):
             return "value_analysis"
 
     @listen("growth_analysis")
+    @timed_step
+    @checkpointed("tech_trends", "sectors")
     def analyze_tech_trends(self):
         """기술 트렌드 분석가 - 성장주 분석팀 1단계"""
 
@@ -92,7 +164,7 @@ class FundManagerFlow(Flow[FundManagerState]):
             시장 리포트, 뉴스, 업계 분석을 통해 떠오르는 기술 분야와 관련 상장 기업을 종합적으로 분석합니다.
             """,
             goal="사용자의 투자 목표를 기반으로 기술 트렌드를 분석하고 투자 후보 기업을 식별하여 구조화된 데이터를 제공한다.",
-            tools=[web_search_tool],
+            tools=[web_search_tool, yahoo_finance_batch_tool, yahoo_finance_tool],
             verbose=True,
             llm="openai/o4-mini",
         )
@@ -165,7 +237,7 @@ class FundManagerFlow(Flow[FundManagerState]):
             agent=tech_analyst,
             expected_output="""A JSON array starting with [ and ending with ]. No markdown formatting, no code blocks, no additional text. Pure JSON only.""",
             context=[trend_research_task, company_discovery_task],
-            output_file="output/analyze_tech_trends.json",
+            guardrail=stage_guardrail(list[SectorTrend]),
         )
 
         tech_analysis_crew = Crew(
@@ -175,75 +247,98 @@ class FundManagerFlow(Flow[FundManagerState]):
         )
 
         self.state.tech_trends = tech_analysis_crew.kickoff()
+        self.state.sectors = parse_stage_output(self.state.tech_trends, list[SectorTrend])
+        write_stage_output(
+            "output/analyze_tech_trends.json", self.state.sectors, list[SectorTrend]
+        )
 
-    @listen(analyze_tech_trends)
-    def evaluate_growth_potential(self):
-        """성장성 평가 분석가 - 성장주 분석팀 2단계"""
-
-        growth_analyst = Agent(
+    def _growth_analyst(self) -> Agent:
+        return Agent(
             role="성장성 평가 전문 분석가",
             backstory="""
             기업의 재무 데이터와 시장 동향을 종합 분석하여 성장 잠재력을 정확히 평가하는 전문가입니다.
-            매출 성장률, R&D 투자, 시장 경쟁력, 미래 수익성을 다각도로 분석하여 투자 가치를 정량화합니다.
+            정량 점수의 근거가 되는 성장 동력, R&D 투자, 시장 경쟁력을 조사하여 투자 판단에 필요한 설명을 제공합니다.
             """,
-            goal="기술 트렌드 분석 결과를 바탕으로 각 기업의 성장 잠재력을 평가하고 투자 우선순위를 제공한다.",
-            tools=[web_search_tool, yahoo_finance_tool],
+            goal="정량 성장성 점수를 바탕으로 각 기업의 성장 동력과 투자 근거를 설명한다.",
+            tools=[web_search_tool, yahoo_finance_batch_tool, yahoo_finance_tool],
             verbose=True,
             llm="openai/o4-mini",
         )
 
-        # Task 1: 기업 재무 분석
-        financial_analysis_task = Task(
+    def _growth_sector_crew(self, sector_analysis: str, score_table: str) -> Crew:
+        """섹터 하나에 대한 성장성 서술 크루 (섹터별로 동시에 실행됩니다)"""
+
+        growth_analyst = self._growth_analyst()
+
+        # Task 1: 성장 동력 분석 (점수는 factor_scores 에서 이미 계산됨)
+        growth_narrative_task = Task(
             description=f"""
-            기술 트렌드 분석 결과: {self.state.tech_trends}
+            분석 대상 섹터: {sector_analysis}
 
-            각 후보 기업에 대해 성장성 관련 재무 지표를 분석하세요:
+            정량 점수표 (팩터 점수는 0-10점, 유니버스 내 백분위 기반 / 나머지 컬럼은 원시 재무 지표):
+            {score_table}
 
-            1. Yahoo Finance 도구로 각 티커의 정확한 재무 데이터 수집 (P/E 비율, 매출 성장률, ROE 등)
-            2. "기업명 재무실적" 웹 검색으로 최신 분기 실적 및 전망 정보 수집
-            3. "기업명 R&D 투자" 검색으로 혁신 투자 현황 분석
-            4. "기업명 시장 전망" 검색으로 미래 성장 가능성 평가
+            점수는 이미 재무 데이터로 계산되어 있습니다. 점수를 새로 매기지 말고,
+            각 기업의 점수를 설명하는 정성 정보를 조사하세요:
 
-            Yahoo Finance 도구 사용법:
-            - yahoo_finance_tool("NVDA") - NVIDIA 재무 데이터
-            - yahoo_finance_tool("MSFT", "2y") - Microsoft 2년 데이터
+            1. "기업명 재무실적" 웹 검색으로 최신 분기 실적 및 전망 정보 수집
+            2. "기업명 R&D 투자" 검색으로 혁신 투자 현황 분석
+            3. "기업명 시장 전망" 검색으로 미래 성장 가능성 평가
 
             결과는 기업별로 정리해주세요:
             - 티커 심볼과 회사명
-            - 매출 성장률 (YoY)
-            - R&D 투자 비율 또는 투자 규모
             - 주요 성장 동력
+            - R&D 투자 현황
             - 시장에서의 경쟁 우위
+            - 점수표의 강점 / 약점 팩터에 대한 설명
             """,
             agent=growth_analyst,
-            expected_output="기업별 재무 분석 보고서 (성장성 지표 중심)",
+            expected_output="기업별 성장 동력 및 점수 해설 보고서",
         )
 
-        # Task 2: 성장성 점수 산정
-        growth_scoring_task = Task(
-            description="""
-            앞선 재무 분석 결과를 바탕으로 각 기업의 성장 잠재력을 평가하세요:
-
-            평가 기준:
-            1. 매출 성장률 (30% 가중치) - 높을수록 좋음
-            2. R&D 투자 비율 (25% 가중치) - 지속적 혁신 능력
-            3. 시장 점유율 및 경쟁력 (25% 가중치) - 시장 지배력
-            4. 미래 성장 전망 (20% 가중치) - 산업 트렌드 적합성
-
-            각 기업에 대해:
-            - 성장 잠재력 점수 (1-10점 척도)
-            - 점수 산정 근거
-            - 주요 성장 동력
-            - 투자 시 기대 효과
-            """,
-            agent=growth_analyst,
-            expected_output="기업별 성장성 점수 및 평가 근거",
-            context=[financial_analysis_task],
+        return Crew(
+            agents=[growth_analyst],
+            tasks=[growth_narrative_task],
+            verbose=True,
         )
 
-        # Task 3: 결과 구조화
+    @listen(analyze_tech_trends)
+    @timed_step
+    @checkpointed("growth_scores", "growth_picks", "factor_scores", inputs=("sectors",))
+    async def evaluate_growth_potential(self):
+        """성장성 평가 분석가 - 성장주 분석팀 2단계"""
+
+        # 성장성 점수는 후보 전체를 한 유니버스로 보고 결정적으로 계산합니다.
+        tickers = [ticker for sector in self.state.sectors for ticker in sector.companies]
+        scores = await asyncio.to_thread(score_universe, tickers)
+        self.state.factor_scores = scores.to_dict("index")
+
+        # 섹터별 분석은 서로 독립적이므로 동시에 실행하고, 구조화 단계에서 합칩니다.
+        sector_crews = [
+            self._growth_sector_crew(
+                to_json(sector, SectorTrend, compact=True),
+                format_scores(
+                    scores[scores.index.isin(sector.companies)],
+                    [*FACTORS, *RAW_METRICS["growth"]],
+                ),
+            )
+            for sector in self.state.sectors
+        ]
+
+        sector_results = await kickoff_parallel(sector_crews)
+        sector_reports = "\n\n".join(result.raw for result in sector_results)
+
+        growth_analyst = self._growth_analyst()
+
+        # Task 2: 결과 구조화
         growth_data_structuring_task = Task(
-            description="""
+            description=f"""
+            정량 점수표 (팩터 점수는 0-10점 / 나머지 컬럼은 원시 재무 지표):
+            {format_scores(scores, [*FACTORS, *RAW_METRICS["growth"]])}
+
+            섹터별 성장성 분석 결과:
+            {sector_reports}
+
             앞선 분석 결과를 다음 단계에서 활용할 수 있도록 구조화하세요:
 
             다음 JSON 배열 형식으로 정확히 응답해주세요:
@@ -257,7 +352,6 @@ class FundManagerFlow(Flow[FundManagerState]):
                         "주요 성장 요인2"
                     ],
                     "financial_highlights": {{
-                        "revenue_growth": "매출 성장률 정보",
                         "rd_investment": "R&D 투자 정보",
                         "market_position": "시장 위치 정보"
                     }},
@@ -266,7 +360,8 @@ class FundManagerFlow(Flow[FundManagerState]):
             ]
 
             중요한 주의사항:
-            - growth_score는 숫자 형태 (소수점 1자리)
+            - growth_score는 점수표의 growth 값을 그대로 사용 (점수표에 없거나 N/A 이면 null)
+            - 매출/이익 성장률, P/E 같은 재무 수치는 점수표 값으로 자동 기록되므로 financial_highlights 에 쓰지 마세요
             - 실제 분석된 내용만 포함
             - 마크다운 코드 블록(```)을 사용하지 말고 순수한 JSON만 반환
             - JSON 앞뒤에 어떤 텍스트도 추가하지 마세요
@@ -274,118 +369,93 @@ class FundManagerFlow(Flow[FundManagerState]):
             """,
             agent=growth_analyst,
             expected_output="""A JSON array starting with [ and ending with ]. No markdown formatting, no code blocks, no additional text. Pure JSON only.""",
-            context=[financial_analysis_task, growth_scoring_task],
-            output_file="output/evaluate_growth_potential.json",
+            guardrail=stage_guardrail(list[GrowthPick]),
         )
 
         # Crew 생성 및 실행
         growth_analysis_crew = Crew(
             agents=[growth_analyst],
-            tasks=[
-                financial_analysis_task,
-                growth_scoring_task,
-                growth_data_structuring_task,
-            ],
+            tasks=[growth_data_structuring_task],
             verbose=True,
         )
 
         # Crew 실행
-        self.state.growth_scores = growth_analysis_crew.kickoff()
+        self.state.growth_scores = await growth_analysis_crew.kickoff_async()
+        self.state.growth_picks = parse_stage_output(
+            self.state.growth_scores, list[GrowthPick]
+        )
+        for pick in self.state.growth_picks:
+            pick.financial_highlights = {
+                **pick.financial_highlights,
+                **raw_metrics(self.state.factor_scores, pick.ticker, "growth"),
+            }
+        write_stage_output(
+            "output/evaluate_growth_potential.json",
+            self.state.growth_picks,
+            list[GrowthPick],
+        )
 
     @listen("value_analysis")
+    @timed_step
+    @checkpointed("stability_scores", "stable_picks", "factor_scores")
     def screen_stable_companies(self):
         """안정성 스크리너 - 가치/배당주 분석팀 1단계"""
 
+        # 유니버스 전체를 정량 점수로 먼저 걸러내고, LLM 은 선별된 기업의 설명만 작성합니다.
+        scores = score_universe(STABLE_UNIVERSE)
+        self.state.factor_scores = scores.to_dict("index")
+        candidates = (
+            scores[scores["dividend"] > 0]
+            .sort_values(["quality", "value"], ascending=False)
+            .head(STABLE_SCREEN_SIZE)
+        )
+
         stability_screener = Agent(
             role="안정성 스크리닝 전문 분석가",
             backstory="""
             재무적으로 안정되고 꾸준한 실적을 보이는 기업들을 선별하는 전문가입니다.
             부채 비율, 수익성, 배당 이력, 시장 지위를 종합적으로 분석하여 장기 투자에 적합한 안전한 기업들을 발굴합니다.
             """,
-            goal="사용자의 보수적 투자 목표에 맞춰 재무적으로 안정되고 장기간 꾸준한 실적을 낸 기업들을 선별한다.",
-            tools=[web_search_tool, yahoo_finance_tool],
+            goal="정량 스크리닝을 통과한 기업들이 보수적 투자 목표에 맞는 이유를 설명한다.",
+            tools=[web_search_tool, yahoo_finance_batch_tool, yahoo_finance_tool],
             verbose=True,
             llm="openai/o4-mini",
         )
 
-        # Task 1: 안정적 기업 발굴
-        stable_company_discovery_task = Task(
+        # Task 1: 안정성 근거 조사 (점수는 factor_scores 에서 이미 계산됨)
+        stability_narrative_task = Task(
             description=f"""
             사용자의 투자 목표: {self.state.investment_goal}
             투자 성향: {self.state.risk_preference}
 
-            보수적 투자에 적합한 안정적인 기업들을 발굴하세요:
-
-            1. "안정적인 배당주", "블루칩 주식", "S&P 500 대형주" 키워드로 웹 검색
-            2. "저PER 가치주", "우량 배당주", "디펜시브 주식" 검색으로 후보 발굴
-            3. 다음 섹터 우선 고려: 소비재, 유틸리티, 헬스케어, 금융
-            4. 나스닥/NYSE 상장 기업 중 시가총액 상위 기업 선별
-
-            결과는 다음 형식으로 정리해주세요:
-            - 발굴된 기업들의 티커 심볼과 회사명
-            - 각 기업이 속한 섹터
-            - 안정성 근거 (업계 지위, 사업 모델 등)
-            - 배당 지급 여부
-            """,
-            agent=stability_screener,
-            expected_output="안정적 기업 후보 리스트 (티커별 기본 정보 포함)",
-        )
-
-        # Task 2: 재무 안정성 분석
-        financial_stability_task = Task(
-            description="""
-            발굴된 기업들의 재무 안정성을 심층 분석하세요:
-
-            1. Yahoo Finance 도구로 각 후보 기업의 재무 데이터 수집
-            2. 다음 안정성 지표 중점 분석:
-               - 부채비율 (Debt-to-Equity): 0.5 미만 선호
-               - P/E 비율: 과도하지 않은 수준 (50 미만)
-               - ROE: 일관된 수익성 (5% 이상)
-               - 이익률: 안정적 영업이익률
-               - 배당수익률: 지속가능한 배당
+            S&P 500 우량주 {len(scores)}개를 정량 점수로 스크리닝한 상위 기업들입니다
+            (팩터 점수는 0-10점, quality = 수익성 / 부채 / 변동성, value = 이익수익률 / 장부가 대비 가격,
+            나머지 컬럼은 원시 재무 지표):
+            {format_scores(candidates, ["quality", "value", "dividend", *RAW_METRICS["stability"]])}
 
-            3. "기업명 재무건전성" 웹 검색으로 추가 정보 수집
-            4. "기업명 신용등급" 검색으로 신용도 확인
+            점수는 이미 재무 데이터로 계산되어 있습니다. 점수를 새로 매기지 말고,
+            각 기업의 안정성을 설명하는 정성 정보를 조사하세요:
 
-            Yahoo Finance 도구 활용:
-            - yahoo_finance_tool("JNJ") - Johnson & Johnson 데이터
-            - yahoo_finance_tool("KO") - Coca-Cola 데이터
+            1. "기업명 재무건전성" 웹 검색으로 추가 정보 수집
+            2. "기업명 신용등급" 검색으로 신용도 확인
+            3. 업계 지위와 사업 모델의 방어력 파악
 
             결과는 기업별로 정리해주세요:
-            - 주요 재무 지표와 안정성 평가
-            - 부채 수준과 수익성 분석
-            - 배당 정책과 지속가능성
-            """,
-            agent=stability_screener,
-            expected_output="기업별 재무 안정성 분석 보고서",
-            context=[stable_company_discovery_task],
-        )
-
-        # Task 3: 안정성 점수 산정
-        stability_scoring_task = Task(
-            description="""
-            재무 분석 결과를 바탕으로 각 기업의 안정성 점수를 산정하세요:
-
-            평가 기준:
-            1. 재무 건전성 (35% 가중치) - 부채비율, 유동비율, 이자보상배수
-            2. 수익 안정성 (30% 가중치) - 꾸준한 영업이익, ROE 일관성
-            3. 배당 정책 (20% 가중치) - 배당 지속성, 배당성장률
-            4. 시장 지위 (15% 가중치) - 업계 선도, 브랜드 파워
-
-            각 기업에 대해:
-            - 안정성 점수 (1-10점 척도)
-            - 점수 산정 근거
-            - 주요 안정 요소
+            - 티커 심볼, 회사명, 섹터
+            - 주요 안정 요소 (업계 지위, 사업 모델, 신용도 등)
+            - 점수표의 강점 / 약점 팩터에 대한 설명
             - 보수적 투자에 적합한 이유
             """,
             agent=stability_screener,
-            expected_output="기업별 안정성 점수 및 평가 근거",
-            context=[stable_company_discovery_task, financial_stability_task],
+            expected_output="기업별 안정성 근거 보고서",
         )
 
-        # Task 4: 결과 구조화
+        # Task 2: 결과 구조화
         stability_data_structuring_task = Task(
-            description="""
+            description=f"""
+            정량 점수표 (팩터 점수는 0-10점 / 나머지 컬럼은 원시 재무 지표):
+            {format_scores(candidates, ["quality", "value", "dividend", *RAW_METRICS["stability"]])}
+
             앞선 분석 결과를 다음 단계에서 활용할 수 있도록 구조화하세요:
 
             다음 JSON 배열 형식으로 정확히 응답해주세요:
@@ -398,18 +468,13 @@ class FundManagerFlow(Flow[FundManagerState]):
                         "주요 안정 요인1",
                         "주요 안정 요인2"
                     ],
-                    "financial_metrics": {{
-                        "debt_to_equity": "부채비율 정보",
-                        "pe_ratio": "P/E 비율 정보",
-                        "roe": "ROE 정보",
-                        "dividend_yield": "배당수익률 정보"
-                    }},
                     "investment_rationale": "안정적 투자 근거"
                 }}
             ]
 
             중요한 주의사항:
-            - stability_score는 숫자 형태 (소수점 1자리)
+            - 점수표의 모든 기업을 포함하고, stability_score는 점수표의 quality 값을 그대로 사용
+            - 부채비율, P/E, ROE, 배당수익률 같은 재무 수치는 점수표 값으로 자동 기록되므로 쓰지 마세요
             - 실제 분석된 내용만 포함
             - 마크다운 코드 블록(```)을 사용하지 말고 순수한 JSON만 반환
             - JSON 앞뒤에 어떤 텍스트도 추가하지 마세요
@@ -417,132 +482,125 @@ class FundManagerFlow(Flow[FundManagerState]):
             """,
             agent=stability_screener,
             expected_output="""A JSON array starting with [ and ending with ]. No markdown formatting, no code blocks, no additional text. Pure JSON only.""",
-            context=[
-                stable_company_discovery_task,
-                financial_stability_task,
-                stability_scoring_task,
-            ],
-            output_file="output/screen_stable_companies.json",
+            context=[stability_narrative_task],
+            guardrail=stage_guardrail(list[StabilityPick]),
         )
 
         stability_screening_crew = Crew(
             agents=[stability_screener],
-            tasks=[
-                stable_company_discovery_task,
-                financial_stability_task,
-                stability_scoring_task,
-                stability_data_structuring_task,
-            ],
+            tasks=[stability_narrative_task, stability_data_structuring_task],
             verbose=True,
         )
 
         self.state.stability_scores = stability_screening_crew.kickoff()
+        self.state.stable_picks = parse_stage_output(
+            self.state.stability_scores, list[StabilityPick]
+        )
+        for pick in self.state.stable_picks:
+            pick.financial_metrics = raw_metrics(
+                self.state.factor_scores, pick.ticker, "stability"
+            )
+        write_stage_output(
+            "output/screen_stable_companies.json",
+            self.state.stable_picks,
+            list[StabilityPick],
+        )
 
-    @listen(screen_stable_companies)
-    def evaluate_value_potential(self):
-        """배당 분석가 - 가치/배당주 분석팀 2단계"""
-
-        dividend_analyst = Agent(
+    def _dividend_analyst(self) -> Agent:
+        return Agent(
             role="배당 정책 전문 분석가",
             backstory="""
             기업의 배당 정책과 배당 지속 가능성을 심층 분석하는 전문가입니다.
-            배당 성장률, 배당 안정성, 배당성향, 배당 이력을 종합적으로 평가하여 장기 배당 투자에 최적화된 종목을 선별합니다.
+            배당 성장 이력, 삭감 이력, 배당 정책 전망을 조사하여 정량 배당 점수의 근거를 설명합니다.
             """,
-            goal="안정성 스크리닝된 기업들의 배당 정책을 심층 분석하여 배당 투자 우선순위를 제공한다.",
-            tools=[web_search_tool, yahoo_finance_tool],
+            goal="정량 배당 점수를 바탕으로 안정성 스크리닝된 기업들의 배당 투자 근거를 설명한다.",
+            tools=[web_search_tool, yahoo_finance_batch_tool, yahoo_finance_tool],
             llm="openai/o4-mini",
         )
 
-        # Task 1: 배당 데이터 수집
-        dividend_data_collection_task = Task(
-            description=f"""
-            안정성 스크리닝 결과: {self.state.stability_scores}
+    def _dividend_group_crew(self, score_table: str) -> Crew:
+        """기업 그룹 하나에 대한 배당 서술 크루 (그룹별로 동시에 실행됩니다)"""
 
-            각 안정적 기업들의 배당 관련 데이터를 수집하세요:
+        dividend_analyst = self._dividend_analyst()
 
-            1. Yahoo Finance 도구로 각 기업의 배당 정보 수집:
-               - 현재 배당수익률 (Dividend Yield)
-               - 배당성향 (Payout Ratio)
-               - 배당 지급 이력
+        # Task 1: 배당 이력 조사 (점수는 factor_scores 에서 이미 계산됨)
+        dividend_narrative_task = Task(
+            description=f"""
+            분석 대상 기업과 정량 점수표
+            (팩터 점수는 0-10점, dividend = 배당수익률 / 5년 평균 배당수익률 / 배당성향 / 베타,
+            나머지 컬럼은 원시 재무 지표):
+            {score_table}
 
-            2. "기업명 배당" 웹 검색으로 추가 배당 정보 수집:
+            점수는 이미 재무 데이터로 계산되어 있습니다. 점수를 새로 매기지 말고,
+            각 기업의 배당 점수를 설명하는 정성 정보를 조사하세요:
+
+            1. "기업명 배당" 웹 검색으로 배당 정보 수집:
                - 배당 성장 이력
                - 배당 삭감/중단 이력
                - 배당 정책 및 전망
 
-            3. "기업명 배당왕", "기업명 배당성장" 검색으로 배당 평판 조사
-
-            Yahoo Finance 도구 활용:
-            - yahoo_finance_tool("KO") - 코카콜라 배당 데이터
-            - yahoo_finance_tool("JNJ") - J&J 배당 데이터
+            2. "기업명 배당왕", "기업명 배당성장" 검색으로 배당 평판 조사
+               - 배당귀족주(25년+), 배당왕(50년+) 여부
 
             결과는 기업별로 정리해주세요:
-            - 현재 배당수익률과 배당성향
             - 배당 지급 연수와 성장 이력
             - 배당 삭감/중단 여부
-            - 배당 지속가능성 평가
+            - 핵심 배당 매력 요소와 리스크 요인
+            - 점수표의 강점 / 약점 팩터에 대한 설명
             """,
             agent=dividend_analyst,
-            expected_output="기업별 배당 데이터 수집 보고서 (배당 이력 및 현황 포함)",
+            expected_output="기업별 배당 이력 및 점수 해설 보고서",
         )
 
-        # Task 2: 배당 품질 평가
-        dividend_quality_assessment_task = Task(
-            description="""
-            수집된 배당 데이터를 바탕으로 배당 품질을 평가하세요:
-
-            평가 기준:
-            1. 배당 지속성 (40% 가중치) - 연속 배당 지급 기간, 삭감 이력 없음
-            2. 배당 성장성 (30% 가중치) - 과거 5년간 배당 성장률
-            3. 배당 수익률 (20% 가중치) - 현재 배당수익률 적정 수준 (2-6%)
-            4. 배당 건전성 (10% 가중치) - 배당성향 60% 이하, 지속가능한 수준
-
-            추가 고려사항:
-            - 배당귀족주(25년+), 배당왕(50년+) 가산점
-            - 경기방어적 섹터 (유틸리티, 소비재) 선호
-            - FCF 대비 배당성향 평가
-
-            각 기업에 대해:
-            - 배당 품질 점수 (1-10점 척도)
-            - 배당 매력 요소
-            - 배당 리스크 요인
-            - 장기 배당 전망
-            """,
-            agent=dividend_analyst,
-            expected_output="기업별 배당 품질 평가 보고서",
-            context=[dividend_data_collection_task],
+        return Crew(
+            agents=[dividend_analyst],
+            tasks=[dividend_narrative_task],
+            verbose=True,
         )
 
-        # Task 3: 배당 매력도 점수 산정
-        dividend_scoring_task = Task(
-            description="""
-            배당 품질 평가 결과를 바탕으로 최종 배당 매력도 점수를 산정하세요:
-
-            종합 평가 기준:
-            1. 배당왕/배당귀족 여부 - 최고 가점
-            2. 배당 성장 일관성 - 5년간 꾸준한 성장
-            3. 배당수익률 매력도 - 시장 대비 적정 수준
-            4. 배당 안전성 - 수익성 대비 지속가능한 배당
-
-            특별 고려사항:
-            - 경기침체기 배당 유지 능력
-            - 현금흐름 대비 배당 부담 정도
-            - 향후 배당 정책 전망
-
-            각 기업에 대해:
-            - 배당 매력도 점수 (1-10점 척도)
-            - 점수 산정 근거
-            - 핵심 배당 매력 요소
-            - 배당 투자 추천 사유
-            """,
-            agent=dividend_analyst,
-            expected_output="기업별 배당 매력도 점수 및 투자 추천 근거",
-            context=[dividend_data_collection_task, dividend_quality_assessment_task],
+    @listen(screen_stable_companies)
+    @timed_step
+    @checkpointed(
+        "divide_scores", "dividend_picks", inputs=("factor_scores", "stable_picks")
+    )
+    async def evaluate_value_potential(self):
+        """배당 분석가 - 가치/배당주 분석팀 2단계"""
+
+        # 스크리닝 단계에서 유니버스 전체로 계산한 점수를 그대로 사용합니다.
+        scores = pd.DataFrame.from_dict(self.state.factor_scores, orient="index")
+        tickers = [pick.ticker for pick in self.state.stable_picks]
+        screened = scores[scores.index.isin(tickers)]
+        if screened.empty:
+            # 스크리닝 결과의 티커가 점수표와 맞지 않으면 배당 점수 상위 기업을 분석합니다.
+            screened = scores.sort_values("dividend", ascending=False).head(
+                STABLE_SCREEN_SIZE
+            )
+
+        # 기업 그룹별 배당 분석은 서로 독립적이므로 동시에 실행하고, 구조화 단계에서 합칩니다.
+        group_results = await kickoff_parallel(
+            [
+                self._dividend_group_crew(
+                    format_scores(
+                        screened.iloc[i : i + DIVIDEND_GROUP_SIZE],
+                        ["dividend", "quality", *RAW_METRICS["dividend"]],
+                    )
+                )
+                for i in range(0, len(screened), DIVIDEND_GROUP_SIZE)
+            ]
         )
+        group_reports = "\n\n".join(result.raw for result in group_results)
+
+        dividend_analyst = self._dividend_analyst()
 
-        # Task 4: 결과 구조화
+        # Task 2: 결과 구조화
         dividend_data_structuring_task = Task(
-            description="""
+            description=f"""
+            정량 점수표 (팩터 점수는 0-10점 / 나머지 컬럼은 원시 재무 지표):
+            {format_scores(screened, ["dividend", "quality", *RAW_METRICS["dividend"]])}
+
+            기업 그룹별 배당 분석 결과:
+            {group_reports}
+
             앞선 분석 결과를 다음 단계에서 활용할 수 있도록 구조화하세요:
 
             다음 JSON 배열 형식으로 정확히 응답해주세요:
@@ -556,8 +614,6 @@ class FundManagerFlow(Flow[FundManagerState]):
                         "주요 배당 매력 요인2"
                     ],
                     "dividend_metrics": {{
-                        "dividend_yield": "현재 배당수익률",
-                        "payout_ratio": "배당성향 정보",
                         "dividend_years": "연속 배당 지급 년수",
                         "dividend_growth": "배당 성장률 정보"
                     }},
@@ -567,7 +623,8 @@ class FundManagerFlow(Flow[FundManagerState]):
             ]
 
             중요한 주의사항:
-            - dividend_score는 숫자 형태 (소수점 1자리)
+            - dividend_score는 점수표의 dividend 값을 그대로 사용
+            - 배당수익률, 배당성향 같은 재무 수치는 점수표 값으로 자동 기록되므로 dividend_metrics 에 쓰지 마세요
             - 실제 분석된 내용만 포함
             - 마크다운 코드 블록(```)을 사용하지 말고 순수한 JSON만 반환
             - JSON 앞뒤에 어떤 텍스트도 추가하지 마세요
@@ -575,28 +632,38 @@ class FundManagerFlow(Flow[FundManagerState]):
             """,
             agent=dividend_analyst,
             expected_output="""A JSON array starting with [ and ending with ]. No markdown formatting, no code blocks, no additional text. Pure JSON only.""",
-            context=[
-                dividend_data_collection_task,
-                dividend_quality_assessment_task,
-                dividend_scoring_task,
-            ],
-            output_file="output/analyze_dividend_policy.json",
+            guardrail=stage_guardrail(list[DividendPick]),
         )
 
         dividend_analysis_crew = Crew(
             agents=[dividend_analyst],
-            tasks=[
-                dividend_data_collection_task,
-                dividend_quality_assessment_task,
-                dividend_scoring_task,
-                dividend_data_structuring_task,
-            ],
+            tasks=[dividend_data_structuring_task],
             verbose=True,
         )
 
-        self.state.divide_scores = dividend_analysis_crew.kickoff()
+        self.state.divide_scores = await dividend_analysis_crew.kickoff_async()
+        self.state.dividend_picks = parse_stage_output(
+            self.state.divide_scores, list[DividendPick]
+        )
+        for pick in self.state.dividend_picks:
+            pick.dividend_metrics = {
+                **pick.dividend_metrics,
+                **raw_metrics(self.state.factor_scores, pick.ticker, "dividend"),
+            }
+        write_stage_output(
+            "output/analyze_dividend_policy.json",
+            self.state.dividend_picks,
+            list[DividendPick],
+        )
 
     @listen(or_(evaluate_growth_potential, evaluate_value_potential))
+    @timed_step
+    @checkpointed(
+        "portfolio",
+        "portfolio_plan",
+        "risk_report",
+        inputs=("strategy_type", "sectors", "growth_picks", "stable_picks", "dividend_picks"),
+    )
     def synthesize_portfolio(self):
         """포트폴리오 매니저 - 최종 포트폴리오 구성"""
 
@@ -611,20 +678,23 @@ class FundManagerFlow(Flow[FundManagerState]):
             llm="openai/o4-mini",
         )
 
-        # 분석 결과에 따른 데이터 준비
+        # 분석 결과에 따른 데이터 준비 (전체 대화 기록 대신 검증된 필드만 넘깁니다)
         if self.state.strategy_type == "growth":
             analysis_data = f"""
             성장주 분석 결과:
-            - 기술 트렌드: {self.state.tech_trends}
-            - 성장 점수: {self.state.growth_scores}
+            - 기술 트렌드: {to_json(self.state.sectors, list[SectorTrend], compact=True)}
+            - 성장 점수: {to_json(self.state.growth_picks, list[GrowthPick], compact=True)}
             """
         else:
             analysis_data = f"""
             가치/배당주 분석 결과:
-            - 안정성 점수: {self.state.stability_scores}
-            - 배당 점수: {self.state.divide_scores}
+            - 안정성 점수: {to_json(self.state.stable_picks, list[StabilityPick], compact=True)}
+            - 배당 점수: {to_json(self.state.dividend_picks, list[DividendPick], compact=True)}
             """
 
+        # 금액은 LLM 이 다시 적은 예산이 아니라 사용자가 입력한 예산으로 계산합니다.
+        budget_context = {"total_budget": self.state.budget}
+
         # Task 1: 포트폴리오 구성
         portfolio_structuring_task = Task(
             description=f"""
@@ -646,6 +716,22 @@ class FundManagerFlow(Flow[FundManagerState]):
             4. 예산 대비 적정 투자 금액 및 비중 계산
             5. 분석 결과의 실제 점수와 근거를 반영한 투자 사유 작성
 
+            다음 JSON 객체 형식으로 정확히 응답해주세요:
+            {{
+                "strategy": "{self.state.strategy_type}",
+                "total_budget": {self.state.budget},
+                "holdings": [
+                    {{
+                        "ticker": "티커심볼",
+                        "company": "회사명",
+                        "allocation": 0.35,
+                        "amount": 7000.0,
+                        "investment_rationale": "분석 점수와 근거를 반영한 투자 사유"
+                    }}
+                ],
+                "portfolio_summary": "포트폴리오 구성 요약 및 리스크 관리 방안"
+            }}
+
             중요한 출력 형식 요구사항:
             - 마크다운 코드 블록(```)을 사용하지 말고 순수한 JSON만 반환
             - JSON 앞뒤에 어떤 텍스트도 추가하지 마세요
@@ -655,7 +741,7 @@ class FundManagerFlow(Flow[FundManagerState]):
             """,
             agent=portfolio_manager,
             expected_output="""A JSON object starting with {{ and ending with }}. No markdown formatting, no code blocks, no additional text. Pure JSON only. Must include allocation calculations that sum to 1.0.""",
-            output_file="output/synthesize_portfolio.json",
+            guardrail=stage_guardrail(PortfolioPlan, budget_context),
         )
 
         portfolio_synthesis_crew = Crew(
@@ -665,10 +751,31 @@ class FundManagerFlow(Flow[FundManagerState]):
         )
 
         self.state.portfolio = portfolio_synthesis_crew.kickoff()
+        self.state.portfolio_plan = parse_stage_output(
+            self.state.portfolio, PortfolioPlan, budget_context
+        )
+        write_stage_output(
+            "output/synthesize_portfolio.json", self.state.portfolio_plan, PortfolioPlan
+        )
+
+        # 추천 비중을 과거 가격으로 검증해 수익률 / 변동성 / 낙폭 / 샤프 비율을 붙입니다.
+        # 같은 티커가 여러 번 나오면 비중을 합칩니다.
+        weights: dict[str, float] = {}
+        for holding in self.state.portfolio_plan.holdings:
+            weights[holding.ticker] = weights.get(holding.ticker, 0.0) + holding.allocation
+        self.state.risk_report = backtest_portfolio(weights)
+        with open("output/portfolio_risk.json", "w", encoding="utf-8") as f:
+            json.dump(self.state.risk_report, f, ensure_ascii=False, indent=2)
 
     @listen(synthesize_portfolio)
     def finalize_investment_recommendation(self):
 
+        print(format_risk_report(self.state.risk_report))
+        print(f"단계별 실행 시간:\n{format_timings(self.state.step_timings)}")
+        print(
+            f"전략 라우팅: {self.state.strategy_type} ({self.state.routing_method}), "
+            f"통계: {strategy_classifier.stats()}"
+        )
         return self.state.portfolio
 
 
@@ -0,0 +1,228 @@
+import json
+import os
+import re
+import threading
+import time
+import pandas as pd
+import yfinance as yf
+
+# 시장 데이터 캐시 설정
+MARKET_DATA_CACHE_DIR = "cache/market_data"
+HISTORY_TTL_SECONDS = 6 * 60 * 60  # 가격 이력 (일봉) 유효 시간
+INFO_TTL_SECONDS = 24 * 60 * 60  # 기업 정보 / 밸류에이션 지표 유효 시간
+FINANCIALS_TTL_SECONDS = 7 * 24 * 60 * 60  # 재무제표는 분기마다 바뀌므로 길게 유지
+
+
+def _safe_name(ticker: str) -> str:
+    # "^GSPC", "BRK/B" 같은 티커도 파일 이름으로 쓸 수 있게 바꿉니다.
+    return re.sub(r"[^A-Za-z0-9.\-]", "_", ticker.upper())
+
+
+class MarketData:
+    """
+    Yahoo Finance 데이터를 (티커, 기간) 단위로 캐시하는 시장 데이터 계층입니다.
+
+    - 가격 이력은 캐시에 없는 티커만 모아 yf.download 한 번으로 일괄 다운로드합니다.
+    - info / financials / history 를 TTL 과 함께 디스크(Parquet, JSON)에 저장하므로
+      같은 플로우 실행 안의 모든 도구 호출과 이후 실행이 캐시를 재사용합니다.
+    - 같은 키를 여러 스레드가 동시에 요청해도 Yahoo 에는 한 번만 요청합니다.
+    """
+
+    def __init__(self, cache_dir: str = MARKET_DATA_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._memory: dict[tuple, tuple[float, object]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple, threading.Lock] = {}
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "downloads": 0}
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+
+    def history(self, tickers: list[str], period: str = "1y") -> dict[str, pd.DataFrame]:
+        """
+        여러 티커의 가격 이력을 반환합니다. 캐시에 없는 티커만 한 번에 다운로드합니다.
+        데이터가 없는 티커는 빈 DataFrame 으로 반환합니다.
+        """
+        tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        result = {}
+        missing = []
+
+        for ticker in tickers:
+            cached = self._get(("history", period, ticker), HISTORY_TTL_SECONDS)
+            if cached is None:
+                missing.append(ticker)
+            else:
+                result[ticker] = cached
+
+        if missing:
+            # 같은 티커 묶음을 동시에 다운로드하지 않도록 기간 단위로 잠급니다.
+            with self._key_lock(("history", period)):
+                still_missing = []
+                for ticker in missing:
+                    cached = self._get(("history", period, ticker), HISTORY_TTL_SECONDS)
+                    if cached is None:
+                        still_missing.append(ticker)
+                    else:
+                        result[ticker] = cached
+
+                if still_missing:
+                    for ticker, frame in self._download_history(
+                        still_missing, period
+                    ).items():
+                        # 데이터가 없는 티커는 잘못된 티커일 수 있으므로 캐시하지 않습니다.
+                        if not frame.empty:
+                            self._set(("history", period, ticker), frame)
+                        result[ticker] = frame
+
+        return {ticker: result.get(ticker, pd.DataFrame()) for ticker in tickers}
+
+    def info(self, ticker: str) -> dict:
+        ticker = ticker.upper()
+        return self._get_or_fetch(
+            ("info", ticker), INFO_TTL_SECONDS, lambda: yf.Ticker(ticker).info or {}
+        )
+
+    def financials(self, ticker: str) -> pd.DataFrame:
+        ticker = ticker.upper()
+        return self._get_or_fetch(
+            ("financials", ticker),
+            FINANCIALS_TTL_SECONDS,
+            lambda: yf.Ticker(ticker).financials,
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    # ------------------------------------------------------------------
+    # 다운로드
+    # ------------------------------------------------------------------
+
+    def _download_history(
+        self, tickers: list[str], period: str
+    ) -> dict[str, pd.DataFrame]:
+        with self._lock:
+            self._stats["downloads"] += 1
+
+        data = yf.download(
+            tickers,
+            period=period,
+            group_by="ticker",
+            auto_adjust=True,
+            threads=True,
+            progress=False,
+        )
+
+        frames = {}
+        for ticker in tickers:
+            if data is None or data.empty:
+                frame = pd.DataFrame()
+            elif isinstance(data.columns, pd.MultiIndex):
+                frame = (
+                    data[ticker]
+                    if ticker in data.columns.get_level_values(0)
+                    else pd.DataFrame()
+                )
+            else:
+                frame = data
+            frames[ticker] = frame.dropna(how="all").copy()
+        return frames
+
+    # ------------------------------------------------------------------
+    # 캐시 계층
+    # ------------------------------------------------------------------
+
+    def _get_or_fetch(self, key: tuple, ttl: float, fetch):
+        cached = self._get(key, ttl)
+        if cached is not None:
+            return cached
+
+        with self._key_lock(key):
+            cached = self._get(key, ttl)
+            if cached is not None:
+                return cached
+
+            with self._lock:
+                self._stats["downloads"] += 1
+            value = fetch()
+            if value is None:
+                value = {} if key[0] == "info" else pd.DataFrame()
+            self._set(key, value)
+            return value
+
+    def _key_lock(self, key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _get(self, key: tuple, ttl: float):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[0] < ttl:
+                self._stats["memory_hits"] += 1
+                return entry[1]
+
+        path = self._path(key)
+        if not os.path.exists(path) or now - os.path.getmtime(path) >= ttl:
+            return None
+
+        try:
+            value = self._read(key, path)
+        except Exception:
+            return None
+
+        with self._lock:
+            self._memory[key] = (os.path.getmtime(path), value)
+            self._stats["disk_hits"] += 1
+        return value
+
+    def _set(self, key: tuple, value) -> None:
+        with self._lock:
+            self._memory[key] = (time.time(), value)
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            self._write(key, path, value)
+        except Exception as e:
+            # 디스크 캐시 실패는 메모리 캐시로 계속 진행합니다.
+            print(f"시장 데이터 캐시 저장 실패 ({key}): {e}")
+
+    def _path(self, key: tuple) -> str:
+        kind = key[0]
+        if kind == "history":
+            _, period, ticker = key
+            return os.path.join(
+                self.cache_dir, "history", period, f"{_safe_name(ticker)}.parquet"
+            )
+        extension = "json" if kind == "info" else "parquet"
+        return os.path.join(self.cache_dir, kind, f"{_safe_name(key[1])}.{extension}")
+
+    @staticmethod
+    def _read(key: tuple, path: str):
+        if key[0] == "info":
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+
+        frame = pd.read_parquet(path)
+        if key[0] == "financials":
+            # 저장할 때 문자열로 바꾼 결산일 컬럼을 되돌립니다.
+            frame.columns = pd.to_datetime(frame.columns)
+        return frame
+
+    @staticmethod
+    def _write(key: tuple, path: str, value) -> None:
+        if key[0] == "info":
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False, default=str)
+            return
+
+        frame = value.copy()
+        if key[0] == "financials":
+            # Parquet 컬럼 이름은 문자열이어야 합니다.
+            frame.columns = [str(column) for column in frame.columns]
+        frame.to_parquet(path)
+
+
+market_data = MarketData()
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+from market_data import market_data
+
+# 백테스트 설정
+BACKTEST_PERIOD = "3y"  # 추천 비중을 검증할 과거 기간
+BENCHMARK_TICKER = "SPY"  # 비교 기준 (S&P 500 ETF)
+RISK_FREE_RATE = 0.04  # 샤프 비율 계산에 쓰는 연 무위험 수익률
+TRADING_DAYS = 252
+
+
+def price_matrix(tickers: list[str], period: str = BACKTEST_PERIOD) -> pd.DataFrame:
+    """티커별 종가를 날짜 x 티커 표로 맞춥니다. 가격 이력이 없는 티커는 빠집니다."""
+    histories = market_data.history(tickers, period)
+    closes = pd.DataFrame(
+        {ticker: frame["Close"] for ticker, frame in histories.items() if not frame.empty}
+    )
+    return closes.sort_index().ffill()
+
+
+def _max_drawdown(values: pd.DataFrame) -> pd.Series:
+    return (values / values.cummax() - 1).min()
+
+
+def portfolio_metrics(
+    closes: pd.DataFrame,
+    weights: dict[str, float],
+    risk_free_rate: float = RISK_FREE_RATE,
+) -> dict:
+    """
+    매수 후 보유 기준으로 추천 비중의 과거 성과와 위험 지표를 계산합니다.
+
+    모든 종목의 가격이 있는 구간만 사용하고, 가격이 없는 종목은 비중에서 빼고 나머지를 다시 맞춥니다.
+    종목별 / 포트폴리오 지표는 날짜 x 티커 행렬 연산 한 번으로 계산합니다.
+    """
+    weights = pd.Series(weights, dtype=float)
+    tickers = [ticker for ticker in weights.index if ticker in closes.columns]
+    missing = [ticker for ticker in weights.index if ticker not in closes.columns]
+    if not tickers or weights[tickers].sum() <= 0:
+        return {"error": "가격 이력이 있는 종목이 없습니다.", "missing_tickers": missing}
+
+    weights = weights[tickers] / weights[tickers].sum()
+    prices = closes[tickers].dropna()
+    if len(prices) < 2:
+        return {"error": "공통 가격 구간이 너무 짧습니다.", "missing_tickers": missing}
+
+    # 종목별 누적 가치 (시작일 = 1.0) 와 비중을 곱해 포트폴리오 가치를 만듭니다.
+    growth = prices / prices.iloc[0]
+    values = growth.assign(portfolio=growth.to_numpy() @ weights.to_numpy())
+    returns = values.pct_change().iloc[1:]
+
+    years = len(returns) / TRADING_DAYS
+    total_return = values.iloc[-1] - 1
+    annual_return = values.iloc[-1] ** (1 / years) - 1
+    annual_volatility = returns.std() * np.sqrt(TRADING_DAYS)
+    sharpe = (annual_return - risk_free_rate) / annual_volatility.replace(0, np.nan)
+    max_drawdown = _max_drawdown(values)
+
+    table = pd.DataFrame(
+        {
+            "weight": weights.reindex(values.columns),
+            "total_return": total_return,
+            "annual_return": annual_return,
+            "annual_volatility": annual_volatility,
+            "max_drawdown": max_drawdown,
+            "sharpe": sharpe,
+        }
+    ).round(4)
+    table = table.astype(object).where(table.notna(), None)
+
+    # 공통 구간만 쓰므로 결측치가 없어 pandas 의 쌍별 계산 대신 numpy 로 한 번에 계산합니다.
+    with np.errstate(invalid="ignore", divide="ignore"):
+        correlation = np.atleast_2d(
+            np.corrcoef(returns[tickers].to_numpy(), rowvar=False)
+        ).round(3)
+
+    return {
+        "start": str(prices.index[0].date()),
+        "end": str(prices.index[-1].date()),
+        "trading_days": len(returns),
+        "portfolio": table.loc["portfolio"].drop("weight").to_dict(),
+        "holdings": table.drop(index="portfolio").to_dict("index"),
+        # 가격이 변하지 않은 종목은 상관계수가 NaN 이므로 JSON 으로 쓸 수 있게 None 으로 바꿉니다.
+        "correlation": {
+            ticker: {other: None if np.isnan(value) else value for other, value in zip(tickers, row)}
+            for ticker, row in zip(tickers, correlation.tolist())
+        },
+        "missing_tickers": missing,
+    }
+
+
+def backtest_portfolio(
+    weights: dict[str, float],
+    period: str = BACKTEST_PERIOD,
+    benchmark: str = BENCHMARK_TICKER,
+) -> dict:
+    """추천 비중을 시장 데이터 캐시의 가격 이력으로 검증하고 벤치마크 성과를 함께 반환합니다."""
+    weights = pd.Series(weights, dtype=float)
+    weights = weights.groupby(weights.index.str.upper()).sum().to_dict()
+    closes = price_matrix([*weights, benchmark], period)
+
+    report = portfolio_metrics(closes, weights)
+    report["period"] = period
+    if benchmark in closes.columns and "error" not in report:
+        # 포트폴리오와 같은 구간으로 맞춰 비교합니다.
+        benchmark_report = portfolio_metrics(
+            closes.loc[report["start"] : report["end"]], {benchmark: 1.0}
+        )
+        if "error" not in benchmark_report:
+            report["benchmark"] = {"ticker": benchmark, **benchmark_report["portfolio"]}
+    return report
+
+
+def format_risk_report(report: dict) -> str:
+    if not report:
+        return "백테스트 결과가 없습니다."
+    if "error" in report:
+        return f"백테스트 실패: {report['error']}"
+
+    def line(label: str, metrics: dict) -> str:
+        def pct(key: str) -> str:
+            value = metrics.get(key)
+            return "N/A" if value is None else f"{value * 100:.1f}%"
+
+        sharpe = metrics.get("sharpe")
+        return (
+            f"- {label}: 연수익률 {pct('annual_return')}, 변동성 {pct('annual_volatility')}, "
+            f"최대낙폭 {pct('max_drawdown')}, 샤프 {'N/A' if sharpe is None else f'{sharpe:.2f}'}"
+        )
+
+    lines = [f"백테스트 ({report['start']} ~ {report['end']}, 매수 후 보유):"]
+    lines.append(line("포트폴리오", report["portfolio"]))
+    if "benchmark" in report:
+        lines.append(line(report["benchmark"]["ticker"], report["benchmark"]))
+    for ticker, metrics in report["holdings"].items():
+        lines.append(line(ticker, metrics))
+    if report["missing_tickers"]:
+        lines.append(f"- 가격 이력 없음: {', '.join(report['missing_tickers'])}")
+    return "\n".join(lines)
@@ -0,0 +1,206 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+# 캐시 설정
+SEARCH_CACHE_TTL_SECONDS = 60 * 60  # 검색 결과 유효 시간
+SEARCH_CACHE_MAX_ENTRIES = 512  # 메모리 LRU 최대 항목 수
+SEARCH_CACHE_DB_PATH = "cache/search_cache.db"  # None 이면 디스크 캐시 미사용
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """
+    (provider, 정규화된 query, limit) 를 키로 검색 결과를 저장하는 TTL + LRU 캐시입니다.
+
+    메모리 계층이 가득 차면 가장 오래 사용하지 않은 항목부터 제거하고,
+    db_path 가 주어지면 SQLite 계층에도 기록하여 봇을 재시작해도 결과를 재사용합니다.
+    에러 문자열 등 dict 가 아닌 결과는 저장하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = SEARCH_CACHE_TTL_SECONDS,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+        db_path: str | None = SEARCH_CACHE_DB_PATH,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "saved_seconds": 0.0,
+        }
+        self._fetch_seconds: dict[tuple, float] = {}
+
+        self._conn: sqlite3.Connection | None = None
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    provider TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    result_limit INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    fetch_seconds REAL NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (provider, query, result_limit)
+                )
+                """
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(provider: str, query: str, limit: int) -> tuple:
+        return (provider, normalize_query(query), int(limit))
+
+    def get(self, provider: str, query: str, limit: int) -> Any | None:
+        key = self.make_key(provider, query, limit)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["saved_seconds"] += self._fetch_seconds.get(key, 0.0)
+                    return value
+                self._remove(key)
+
+            row = self._load_from_disk(key, now)
+            if row is not None:
+                created_at, fetch_seconds, value = row
+                self._store(key, created_at, fetch_seconds, value)
+                self._stats["disk_hits"] += 1
+                self._stats["saved_seconds"] += fetch_seconds
+                return value
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(
+        self,
+        provider: str,
+        query: str,
+        limit: int,
+        value: Any,
+        fetch_seconds: float = 0.0,
+    ) -> None:
+        if not isinstance(value, dict):
+            return
+
+        key = self.make_key(provider, query, limit)
+        created_at = time.time()
+
+        with self._lock:
+            self._store(key, created_at, fetch_seconds, value)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, created_at, fetch_seconds, json.dumps(value, ensure_ascii=False)),
+                )
+                self._conn.commit()
+
+    def get_or_fetch(
+        self, provider: str, query: str, limit: int, fetch: Callable[[], Any]
+    ) -> Any:
+        cached = self.get(provider, query, limit)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        value = fetch()
+        self.set(provider, query, limit, value, time.perf_counter() - started)
+        return value
+
+    async def aget_or_fetch(
+        self,
+        provider: str,
+        query: str,
+        limit: int,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        cached = self.get(provider, query, limit)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        value = await fetch()
+        self.set(provider, query, limit, value, time.perf_counter() - started)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            round((stats["hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        )
+        stats["saved_seconds"] = round(stats["saved_seconds"], 3)
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._fetch_seconds.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM search_cache")
+                self._conn.commit()
+
+    # 아래 메서드들은 self._lock 을 잡은 상태에서만 호출됩니다.
+
+    def _store(self, key: tuple, created_at: float, fetch_seconds: float, value: Any):
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        self._fetch_seconds[key] = fetch_seconds
+        while len(self._entries) > self.max_entries:
+            oldest, _ = self._entries.popitem(last=False)
+            self._fetch_seconds.pop(oldest, None)
+            self._stats["evictions"] += 1
+
+    def _remove(self, key: tuple) -> None:
+        self._entries.pop(key, None)
+        self._fetch_seconds.pop(key, None)
+
+    def _load_from_disk(self, key: tuple, now: float):
+        if self._conn is None:
+            return None
+
+        row = self._conn.execute(
+            "SELECT created_at, fetch_seconds, payload FROM search_cache "
+            "WHERE provider = ? AND query = ? AND result_limit = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+
+        created_at, fetch_seconds, payload = row
+        if now - created_at >= self.ttl_seconds:
+            self._conn.execute(
+                "DELETE FROM search_cache "
+                "WHERE provider = ? AND query = ? AND result_limit = ?",
+                key,
+            )
+            self._conn.commit()
+            return None
+
+        return created_at, fetch_seconds, json.loads(payload)
+
+
+search_cache = SearchCache()
@@ -0,0 +1,204 @@
+import ast
+import json
+import os
+import re
+from typing import Any
+from pydantic import (
+    BaseModel,
+    Field,
+    TypeAdapter,
+    ValidationError,
+    ValidationInfo,
+    field_validator,
+    model_validator,
+)
+
+# 단계별 결과 설정
+ALLOCATION_TOLERANCE = 0.01  # 비중 합계가 1.0 에서 이 이상 벗어나면 다시 맞춥니다.
+MAX_POSITION_WEIGHT = 0.5  # 단일 종목 최대 비중 (포트폴리오 프롬프트의 리스크 분산 원칙)
+
+
+class Pick(BaseModel):
+    ticker: str
+    company: str = ""
+    investment_rationale: str = ""
+
+    @field_validator("ticker")
+    @classmethod
+    def normalize_ticker(cls, ticker: str) -> str:
+        return ticker.strip().upper()
+
+
+class SectorTrend(BaseModel):
+    sector: str
+    companies: list[str] = []
+    growth_potential: str = ""
+    investment_rationale: str = ""
+
+    @field_validator("companies")
+    @classmethod
+    def normalize_companies(cls, companies: list[str]) -> list[str]:
+        return [ticker.strip().upper() for ticker in companies if ticker.strip()]
+
+
+class GrowthPick(Pick):
+    growth_score: float | None = None
+    growth_factors: list[str] = []
+    financial_highlights: dict[str, Any] = {}
+
+
+class StabilityPick(Pick):
+    stability_score: float | None = None
+    stability_factors: list[str] = []
+    financial_metrics: dict[str, Any] = {}
+
+
+class DividendPick(Pick):
+    dividend_score: float | None = None
+    dividend_factors: list[str] = []
+    dividend_metrics: dict[str, Any] = {}
+    dividend_status: str = ""
+
+
+class Holding(Pick):
+    allocation: float = Field(ge=0)
+    amount: float = 0.0
+
+
+class PortfolioPlan(BaseModel):
+    strategy: str = ""
+    total_budget: float
+    holdings: list[Holding]
+    portfolio_summary: str = ""
+
+    @model_validator(mode="before")
+    @classmethod
+    def use_context_budget(cls, data: Any, info: ValidationInfo) -> Any:
+        # 검증 context 로 사용자 예산이 주어지면 LLM 이 적은 total_budget 대신 사용합니다.
+        if isinstance(data, dict) and info.context and "total_budget" in info.context:
+            data = {**data, "total_budget": info.context["total_budget"]}
+        return data
+
+    @model_validator(mode="after")
+    def normalize_allocations(self) -> "PortfolioPlan":
+        # LLM 이 계산한 비중 합계가 1.0 이 아니면 비율을 유지한 채 다시 맞추고,
+        # 금액은 항상 예산 * 비중으로 다시 계산합니다.
+        total = sum(holding.allocation for holding in self.holdings)
+        if total <= 0:
+            raise ValueError("holdings 의 allocation 합계가 0 입니다.")
+        if abs(total - 1.0) > ALLOCATION_TOLERANCE:
+            for holding in self.holdings:
+                holding.allocation = holding.allocation / total
+        for holding in self.holdings:
+            holding.allocation = round(holding.allocation, 4)
+            holding.amount = round(self.total_budget * holding.allocation, 2)
+
+        # 다시 맞춘 뒤에도 한 종목이 상한을 넘으면 guardrail 이 다시 작성하게 합니다.
+        over_limit = [
+            f"{holding.ticker} ({holding.allocation:.1%})"
+            for holding in self.holdings
+            if holding.allocation > MAX_POSITION_WEIGHT + 1e-4
+        ]
+        if over_limit:
+            raise ValueError(
+                f"단일 종목 비중은 {MAX_POSITION_WEIGHT:.0%} 이하여야 합니다: {', '.join(over_limit)}"
+            )
+        return self
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """문자열 밖에서 ] 나 } 바로 앞에 붙은 쉼표만 지웁니다."""
+    result = []
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "]}":
+            # 쉼표와 닫는 괄호 사이의 공백은 남기고 쉼표만 뺍니다.
+            index = len(result) - 1
+            while index >= 0 and result[index].isspace():
+                index -= 1
+            if index >= 0 and result[index] == ",":
+                del result[index]
+        result.append(char)
+    return "".join(result)
+
+
+def repair_json(text: str) -> Any:
+    """
+    LLM 이 만든 JSON 을 추가 호출 없이 고쳐서 읽습니다.
+    코드 블록, 앞뒤 설명, 둥근 따옴표, 끝에 붙은 쉼표, 파이썬 리터럴(None / True / 작은따옴표)을 처리합니다.
+    둥근 따옴표는 문자열 안의 인용 부호일 수 있으므로 그대로 읽지 못할 때만 바꿉니다.
+    """
+    text = re.sub(r"```(?:json)?", "", str(text)).strip().lstrip("﻿")
+
+    starts = [index for index in (text.find("["), text.find("{")) if index != -1]
+    if not starts:
+        raise ValueError("JSON 배열 또는 객체를 찾을 수 없습니다.")
+    start = min(starts)
+    end = text.rfind("]" if text[start] == "[" else "}")
+    if end < start:
+        raise ValueError("JSON 이 닫히지 않았습니다.")
+    candidate = text[start : end + 1]
+    straightened = (
+        candidate.replace("“", '"').replace("”", '"').replace("‘", "'").replace("’", "'")
+    )
+
+    error = None
+    for attempt in dict.fromkeys([candidate, straightened]):
+        try:
+            return json.loads(_strip_trailing_commas(attempt))
+        except json.JSONDecodeError as e:
+            error = error or e
+    try:
+        return ast.literal_eval(straightened)
+    except (ValueError, SyntaxError):
+        raise ValueError(f"JSON 파싱 실패: {error}") from None
+
+
+def parse_stage_output(output, schema, context: dict | None = None):
+    """
+    크루 결과(또는 문자열)를 schema (예: list[GrowthPick]) 로 검증해 반환합니다.
+    context 는 검증기에 전달됩니다 (예: PortfolioPlan 의 total_budget).
+    """
+    return TypeAdapter(schema).validate_python(repair_json(output), context=context)
+
+
+def stage_guardrail(schema, context: dict | None = None):
+    """
+    Task guardrail: 로컬 복구 + 검증에 성공하면 정리된 JSON 으로 결과를 바꾸고,
+    실패할 때만 오류 내용을 돌려주어 LLM 이 다시 작성하게 합니다.
+    """
+
+    def guardrail(task_output) -> tuple[bool, Any]:
+        try:
+            value = parse_stage_output(task_output.raw, schema, context)
+        except (ValueError, ValidationError) as e:
+            return False, f"출력 형식이 올바르지 않습니다. 요구된 JSON 형식으로 다시 작성하세요: {e}"
+        return True, to_json(value, schema)
+
+    return guardrail
+
+
+def to_json(value, schema, compact: bool = False) -> str:
+    """
+    검증된 값을 JSON 문자열로 바꿉니다.
+    compact 이면 다음 단계 프롬프트용으로 공백과 기본값(빈 문자열 / 빈 목록) 필드를 뺍니다.
+    """
+    data = TypeAdapter(schema).dump_python(value, mode="json", exclude_defaults=compact)
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def write_stage_output(path: str, value, schema) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(to_json(value, schema))
@@ -0,0 +1,124 @@
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import time
+from typing import Any
+from pydantic import BaseModel, TypeAdapter
+
+# 체크포인트 설정
+CHECKPOINT_DIR = "cache/checkpoints"
+CHECKPOINT_TTL_SECONDS = 24 * 60 * 60  # 시장 데이터가 바뀌므로 하루가 지나면 다시 계산합니다.
+CHECKPOINT_INPUT_FIELDS = ("investment_goal", "risk_preference", "budget")
+
+# CrewOutput / TaskOutput 의 pydantic 결과는 클래스 정보 없이 되살릴 수 없으므로 저장하지 않습니다.
+_UNRESTORABLE_FIELDS = {"pydantic": True, "tasks_output": {"__all__": {"pydantic"}}}
+
+
+def _dump(state: BaseModel, field: str) -> Any:
+    value = getattr(state, field)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude=_UNRESTORABLE_FIELDS)
+    annotation = type(state).model_fields[field].annotation
+    return TypeAdapter(annotation).dump_python(value, mode="json")
+
+
+def checkpoint_key(step: str, state: BaseModel, inputs: tuple[str, ...] = ()) -> str:
+    """
+    단계 이름 + 사용자 입력 + 단계가 읽는 앞 단계 state 필드로 만든 콘텐츠 주소 (sha256)
+    앞 단계 결과가 바뀌면 키도 바뀌므로 예전 결과로 만든 체크포인트는 복원되지 않습니다.
+    """
+    payload = {"step": step}
+    payload.update(
+        {field: _dump(state, field) for field in (*CHECKPOINT_INPUT_FIELDS, *inputs)}
+    )
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _path(key: str) -> str:
+    return os.path.join(CHECKPOINT_DIR, f"{key}.json")
+
+
+def _load(key: str) -> dict | None:
+    path = _path(key)
+    if not os.path.exists(path) or time.time() - os.path.getmtime(path) >= CHECKPOINT_TTL_SECONDS:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["fields"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save(key: str, step: str, state: BaseModel, fields: tuple[str, ...]) -> None:
+    values = {field: _dump(state, field) for field in fields}
+
+    path = _path(key)
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    try:
+        # 중간에 실패해도 깨진 체크포인트가 남지 않도록 임시 파일에 쓰고 교체합니다.
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"step": step, "fields": values}, f, ensure_ascii=False, default=str)
+        os.replace(f"{path}.tmp", path)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"체크포인트 저장 실패 ({step}): {e}")
+
+
+def _restore(state: BaseModel, values: dict) -> None:
+    for field, value in values.items():
+        annotation = type(state).model_fields[field].annotation
+        setattr(state, field, TypeAdapter(annotation).validate_python(value))
+
+
+def checkpointed(*fields: str, inputs: tuple[str, ...] = ()):
+    """
+    플로우 단계가 끝나면 지정한 state 필드를 체크포인트로 저장하고,
+    같은 입력으로 다시 실행하면 단계를 건너뛰고 저장된 값을 복원합니다.
+    inputs 에는 단계가 읽는 앞 단계 state 필드를 적어 키에 포함시킵니다.
+    실패한 단계는 저장되지 않으므로 재실행은 마지막으로 완료된 단계 다음부터 이어집니다.
+    @timed_step 아래에 붙여 사용합니다.
+    """
+
+    def decorator(method):
+        step = method.__name__
+
+        def resume(flow, key: str) -> bool:
+            values = _load(key)
+            if values is None:
+                return False
+            try:
+                _restore(flow.state, values)
+            except Exception as e:
+                print(f"체크포인트 복원 실패 ({step}): {e}")
+                return False
+            print(f"♻️ {step}: 체크포인트에서 복원했습니다.")
+            return True
+
+        if asyncio.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                # 키는 단계 실행 전 입력으로 만들어 저장 / 복원에 같은 키를 씁니다.
+                key = checkpoint_key(step, self.state, inputs)
+                if resume(self, key):
+                    return None
+                result = await method(self, *args, **kwargs)
+                _save(key, step, self.state, fields)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = checkpoint_key(step, self.state, inputs)
+            if resume(self, key):
+                return None
+            result = method(self, *args, **kwargs)
+            _save(key, step, self.state, fields)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,44 @@
+import asyncio
+import functools
+import time
+
+
+def timed_step(method):
+    """
+    플로우 단계의 실행 시간을 self.state.step_timings 에 초 단위로 기록합니다.
+    동기 / 비동기 메서드 모두 지원하며, @listen / @start 아래에 붙여 사용합니다.
+    """
+
+    def record(flow, started: float) -> None:
+        elapsed = round(time.perf_counter() - started, 2)
+        flow.state.step_timings[method.__name__] = elapsed
+        print(f"⏱️ {method.__name__}: {elapsed:.2f}s")
+
+    if asyncio.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                record(self, started)
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            record(self, started)
+
+    return wrapper
+
+
+def format_timings(step_timings: dict[str, float]) -> str:
+    total = sum(step_timings.values())
+    lines = [f"- {name}: {seconds:.2f}s" for name, seconds in step_timings.items()]
+    lines.append(f"- total: {total:.2f}s")
+    return "\n".join(lines)
@@ -0,0 +1,128 @@
+import re
+import threading
+import time
+
+# 전략 분류 설정
+MIN_KEYWORD_MARGIN = 2  # 한쪽 점수가 이만큼 앞서야 LLM 없이 결정합니다.
+RISK_PREFERENCE_WEIGHT = 2  # 투자 성향 키워드는 목표 키워드보다 강한 신호로 봅니다.
+
+# 전략 -> 투자 목표에서 찾을 키워드
+GOAL_KEYWORDS = {
+    "growth": [
+        "성장", "기술", "첨단", "혁신", "ai", "인공지능", "반도체", "클라우드", "전기차",
+        "바이오", "로봇", "빅테크", "테크", "나스닥", "고수익", "수익 극대화",
+        "growth", "tech", "innovation", "momentum",
+    ],
+    "value": [
+        "배당", "안정", "은퇴", "노후", "연금", "현금흐름", "원금", "보존", "저평가",
+        "가치주", "우량", "방어", "인컴", "채권", "꾸준",
+        "dividend", "value", "income", "retirement", "stable", "defensive",
+    ],
+}
+
+# 전략 -> 투자 성향에서 찾을 키워드
+RISK_KEYWORDS = {
+    "growth": ["공격", "적극", "고위험", "위험 감수", "aggressive", "high risk"],
+    "value": ["보수", "안정", "저위험", "위험 회피", "conservative", "low risk"],
+}
+
+
+def _pattern(keyword: str) -> re.Pattern:
+    # 영어 키워드는 "ai" 가 "maintain" 에 걸리지 않도록 단어 단위로만 찾습니다.
+    if keyword.isascii():
+        return re.compile(rf"(?<![a-z]){re.escape(keyword)}(?![a-z])")
+    return re.compile(re.escape(keyword))
+
+
+def _compile(keywords: dict[str, list[str]]) -> dict[str, list[re.Pattern]]:
+    return {strategy: [_pattern(k) for k in words] for strategy, words in keywords.items()}
+
+
+_GOAL_PATTERNS = _compile(GOAL_KEYWORDS)
+_RISK_PATTERNS = _compile(RISK_KEYWORDS)
+
+
+def _count(text: str, patterns: list[re.Pattern]) -> int:
+    return sum(1 for pattern in patterns if pattern.search(text))
+
+
+class StrategyClassifier:
+    """
+    투자 목표와 성향의 키워드로 growth / value 전략을 고르는 빠른 경로 분류기입니다.
+
+    두 전략의 키워드 점수 차이가 MIN_KEYWORD_MARGIN 이상이면 바로 결정하고,
+    애매하면 None 을 반환해 호출하는 쪽이 LLM 라우터로 넘어가게 합니다.
+    경로별 호출 수와 지연 시간은 stats() 로 확인합니다.
+    """
+
+    def __init__(self, min_margin: int = MIN_KEYWORD_MARGIN):
+        self.min_margin = min_margin
+        self._lock = threading.Lock()
+        self._stats = {
+            "rule_hits": 0,
+            "llm_fallbacks": 0,
+            "rule_seconds": 0.0,
+            "llm_seconds": 0.0,
+        }
+
+    def scores(self, investment_goal: str, risk_preference: str) -> dict[str, int]:
+        goal = investment_goal.lower()
+        risk = risk_preference.lower()
+        return {
+            strategy: _count(goal, _GOAL_PATTERNS[strategy])
+            + RISK_PREFERENCE_WEIGHT * _count(risk, _RISK_PATTERNS[strategy])
+            for strategy in GOAL_KEYWORDS
+        }
+
+    def classify(self, investment_goal: str, risk_preference: str) -> str | None:
+        started = time.perf_counter()
+        scores = self.scores(investment_goal, risk_preference)
+        margin = scores["growth"] - scores["value"]
+        if margin >= self.min_margin:
+            strategy = "growth"
+        elif -margin >= self.min_margin:
+            strategy = "value"
+        else:
+            strategy = None
+
+        if strategy is not None:
+            self._record("rule", time.perf_counter() - started)
+        return strategy
+
+    def record_llm(self, seconds: float) -> None:
+        self._record("llm", seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        rule_seconds = stats.pop("rule_seconds")
+        llm_seconds = stats.pop("llm_seconds")
+        routed = stats["rule_hits"] + stats["llm_fallbacks"]
+        stats["rule_hit_rate"] = round(stats["rule_hits"] / routed, 3) if routed else 0.0
+        stats["avg_rule_ms"] = (
+            round(rule_seconds / stats["rule_hits"] * 1000, 3) if stats["rule_hits"] else 0.0
+        )
+        stats["avg_llm_ms"] = (
+            round(llm_seconds / stats["llm_fallbacks"] * 1000, 1)
+            if stats["llm_fallbacks"]
+            else 0.0
+        )
+        return stats
+
+    def _record(self, route: str, seconds: float) -> None:
+        with self._lock:
+            if route == "rule":
+                self._stats["rule_hits"] += 1
+                self._stats["rule_seconds"] += seconds
+            else:
+                self._stats["llm_fallbacks"] += 1
+                self._stats["llm_seconds"] += seconds
+
+
+def parse_strategy(text: str) -> str:
+    """LLM 라우터 응답에서 처음 나오는 growth / value 를 전략으로 사용합니다 (없으면 value)."""
+    match = re.search(r"\b(growth|value)\b", text.lower())
+    return match.group(1) if match else "value"
+
+
+strategy_classifier = StrategyClassifier()
@@ -1,28 +1,54 @@
-import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
 from typing import Type
+import numpy as np
+import pandas as pd
 from crewai.tools import BaseTool
-from firecrawl import Firecrawl
 from pydantic import BaseModel, Field
-from env import FIRECRAWL_API_KEY
+from search_cache import search_cache
+from firecrawl_client import get_firecrawl
+from market_data import market_data
+
+WEB_SEARCH_LIMIT = 5
+MAX_FUNDAMENTAL_WORKERS = 8  # info / financials 동시 조회 수
+MAX_BATCH_TICKERS = 30
+
+_fundamental_executor = ThreadPoolExecutor(
+    max_workers=MAX_FUNDAMENTAL_WORKERS, thread_name_prefix="yahoo-finance"
+)
+
+# info 키 -> 비교표 컬럼 이름
+INFO_COLUMNS = {
+    "longName": "name",
+    "sector": "sector",
+    "marketCap": "market_cap",
+    "trailingPE": "pe",
+    "forwardPE": "forward_pe",
+    "priceToBook": "pb",
+    "profitMargins": "profit_margin",
+    "operatingMargins": "operating_margin",
+    "returnOnEquity": "roe",
+    "debtToEquity": "debt_to_equity",
+    "dividendYield": "dividend_yield",
+}
 
 
 def _yahoo_finance(ticker: str, period: str = "1y"):
 
     try:
-        stock = yf.Ticker(ticker)
-        history = stock.history(period=period)
-        info = stock.info
+        # 가격 이력 / 기업 정보 / 재무제표는 모두 시장 데이터 캐시에서 가져옵니다.
+        history = market_data.history([ticker], period)[ticker.upper()]
 
         if history.empty:
             return f"No historical data found for ticker: {ticker}"
 
+        info = market_data.info(ticker)
         current_price = history["Close"].iloc[-1] if not history.empty else None
         year_high = history["High"].max()
         year_low = history["Low"].min()
 
         revenue_growth = "N/A"
         try:
-            financials = stock.financials
+            financials = market_data.financials(ticker)
             if not financials.empty and "Total Revenue" in financials.index:
                 revenues = financials.loc["Total Revenue"].dropna()
                 if len(revenues) >= 2:
@@ -66,6 +92,107 @@ def _yahoo_finance(ticker: str, period: str = "1y"):
         return f"Error retrieving data for {ticker}: {e}"
 
 
+def _fetch_fundamentals(ticker: str) -> tuple[dict, pd.DataFrame]:
+    try:
+        return market_data.info(ticker), market_data.financials(ticker)
+    except Exception:
+        return {}, pd.DataFrame()
+
+
+def _latest_revenues(financials: pd.DataFrame) -> tuple[float, float]:
+    if financials.empty or "Total Revenue" not in financials.index:
+        return np.nan, np.nan
+    revenues = financials.loc["Total Revenue"].dropna()
+    if len(revenues) < 2:
+        return np.nan, np.nan
+    return float(revenues.iloc[0]), float(revenues.iloc[1])
+
+
+def _yahoo_finance_batch(tickers: list[str], period: str = "1y"):
+    """
+    여러 티커를 한 번에 조회해 하나의 비교표로 반환합니다.
+    가격 이력은 일괄 다운로드하고, info / financials 는 동시에 가져온 뒤
+    지표는 티커 전체에 대해 벡터 연산으로 계산합니다.
+    """
+    tickers = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers if ticker.strip()))
+    if not tickers:
+        return "No tickers provided."
+    # 한도를 넘는 티커는 조회하지 않고 결과에 알려 에이전트가 나눠서 다시 호출하게 합니다.
+    skipped = tickers[MAX_BATCH_TICKERS:]
+    tickers = tickers[:MAX_BATCH_TICKERS]
+    skipped_note = (
+        f" Only the first {MAX_BATCH_TICKERS} tickers were processed; "
+        f"call again for the skipped tickers: {', '.join(skipped)}"
+        if skipped
+        else ""
+    )
+
+    try:
+        histories = market_data.history(tickers, period)
+        fundamentals = dict(
+            zip(tickers, _fundamental_executor.map(_fetch_fundamentals, tickers))
+        )
+    except Exception as e:
+        return f"Error retrieving data for {', '.join(tickers)}: {e}{skipped_note}"
+
+    missing = [ticker for ticker in tickers if histories[ticker].empty]
+    available = [ticker for ticker in tickers if ticker not in missing]
+    if not available:
+        return f"No historical data found for tickers: {', '.join(tickers)}{skipped_note}"
+
+    # 가격 지표: 티커별 컬럼으로 맞춘 뒤 한 번에 계산
+    closes = pd.DataFrame({ticker: histories[ticker]["Close"] for ticker in available})
+    highs = pd.DataFrame({ticker: histories[ticker]["High"] for ticker in available})
+    lows = pd.DataFrame({ticker: histories[ticker]["Low"] for ticker in available})
+
+    first_close = closes.bfill().iloc[0]
+    last_close = closes.ffill().iloc[-1]
+    table = pd.DataFrame(
+        {
+            "price": last_close,
+            "period_high": highs.max(),
+            "period_low": lows.min(),
+            "return_pct": (last_close / first_close - 1) * 100,
+            "volatility_pct": closes.pct_change().std() * np.sqrt(252) * 100,
+        }
+    )
+    table["from_high_pct"] = (table["price"] / table["period_high"] - 1) * 100
+
+    # 재무 지표: info 와 매출을 표로 모아 한 번에 계산
+    info_frame = pd.DataFrame.from_records(
+        [
+            {column: fundamentals[ticker][0].get(key) for key, column in INFO_COLUMNS.items()}
+            for ticker in available
+        ],
+        index=available,
+    )
+    for column in info_frame.columns.difference(["name", "sector"]):
+        info_frame[column] = pd.to_numeric(info_frame[column], errors="coerce")
+    info_frame["market_cap_b"] = info_frame.pop("market_cap") / 1e9
+
+    revenues = pd.DataFrame(
+        [_latest_revenues(fundamentals[ticker][1]) for ticker in available],
+        index=available,
+        columns=["latest", "previous"],
+    )
+    table["revenue_growth_pct"] = (revenues["latest"] / revenues["previous"] - 1) * 100
+
+    # 모든 티커에서 값이 없는 컬럼은 표를 짧게 유지하기 위해 제외합니다.
+    table = info_frame.join(table).dropna(axis=1, how="all")
+    table.index.name = "ticker"
+
+    result = {
+        "period": period,
+        "tickers": available,
+        "missing_tickers": missing,
+        "table": table.round(2).to_string(na_rep="N/A"),
+    }
+    if skipped:
+        result["skipped_tickers"] = skipped
+        result["note"] = skipped_note.strip()
+    return result
+
+
 class YahooFinanceInput(BaseModel):
     ticker: str = Field(
         ...,
@@ -77,6 +204,17 @@ class YahooFinanceInput(BaseModel):
     )
 
 
+class YahooFinanceBatchInput(BaseModel):
+    tickers: list[str] = Field(
+        ...,
+        description="A list of stock ticker symbols to compare in one call. For example, ['NVDA', 'MSFT', '005930.KS'].",
+    )
+    period: str = Field(
+        "1y",
+        description="The time period for historical data. Defaults to '1y'. Valid formats: '1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'ytd', 'max'.",
+    )
+
+
 class YahooFinanceTool(BaseTool):
     name: str = "yahoo_finance_tool"
     description: str = """
@@ -90,10 +228,30 @@ class YahooFinanceTool(BaseTool):
         return _yahoo_finance(ticker, period)
 
 
+class YahooFinanceBatchTool(BaseTool):
+    name: str = "yahoo_finance_batch_tool"
+    description: str = f"""
+    Use this tool to compare several stock tickers from Yahoo Finance in a single call.
+    It returns one compact table with price, period high/low, return, volatility, revenue growth, margins, P/E, P/B, ROE, debt-to-equity and dividend yield for every ticker.
+    Prefer this tool over calling yahoo_finance_tool once per company whenever you need data for more than one ticker.
+    At most {MAX_BATCH_TICKERS} tickers are processed per call; any extra tickers are listed in skipped_tickers.
+    """
+    args_schema: Type[BaseModel] = YahooFinanceBatchInput
+
+    def _run(self, tickers: list[str], period: str = "1y"):
+        return _yahoo_finance_batch(tickers, period)
+
+
 def _web_search(query: str):
-    firecrawl = Firecrawl(api_key=FIRECRAWL_API_KEY)
+    return search_cache.get_or_fetch(
+        "firecrawl", query, WEB_SEARCH_LIMIT, lambda: _fetch_web_search(query)
+    )
+
+
+def _fetch_web_search(query: str):
+    firecrawl = get_firecrawl()
 
-    response = firecrawl.search(query, limit=5, integration="crewai")
+    response = firecrawl.search(query, limit=WEB_SEARCH_LIMIT, integration="crewai")
 
     if not response:
         return f"No search results found for query: {query}"
@@ -140,6 +298,7 @@ class WebSearchTool(BaseTool):
 
 web_search_tool = WebSearchTool()
 yahoo_finance_tool = YahooFinanceTool()
+yahoo_finance_batch_tool = YahooFinanceBatchTool()
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from datetime import datetime
 from typing import List
@@ -11,6 +12,19 @@ from tools import web_search_tool
 
 os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
 
+# 초안 생성 설정
+DRAFT_CANDIDATES = 3  # 라운드마다 동시에 만들고 채점할 초안 수 (best-of-N)
+MAX_REMAKE_ROUNDS = 3  # 목표 점수에 못 미쳐도 이 라운드 수에서 멈춥니다.
+TARGET_SEO_SCORE = 80
+
+# 초안마다 다른 관점을 주어 후보끼리 겹치지 않게 합니다.
+DRAFT_ANGLES = [
+    "실용적인 활용 방법과 가이드 중심",
+    "최신 사례와 데이터 중심",
+    "입문자도 이해하기 쉬운 개념 설명 중심",
+    "미래 전망과 전문가 인사이트 중심",
+]
+
 
 class Post(BaseModel):
     title: str
@@ -31,6 +45,12 @@ class BlogContentMakerState(BaseModel):
     score_manager: ScoreManager | None = None
     post: Post | None = None
 
+    # best-of-N 라운드 상태
+    drafts: List[Post] = []
+    rounds: int = 0  # 지금까지 진행한 생성 라운드 수
+    max_rounds: int = MAX_REMAKE_ROUNDS
+    candidates: int = DRAFT_CANDIDATES
+
 
 @CrewBase
 class SEOManagerCrew:
@@ -134,15 +154,15 @@ class BlogContentMakerFlow(Flow[BlogContentMakerState]):
         )
 
     @listen(or_(research_by_topic, "remake"))
-    def handle_make_blog(self):
+    async def handle_make_blog(self):
         llm = LLM(model="openai/o4-mini")
+        self.state.rounds += 1
 
         score_reason = (
             self.state.score_manager.reason if self.state.score_manager else ""
         )
         if self.state.post is None:
-            result = llm.call(
-                f"""
+            prompt = f"""
                 다음 리서치 데이터(resarch data)를 기반으로 '{self.state.topic}' 주제에 대한 고품질 SEO 최적화 블로그 글을 작성해 주세요.
 
                 ## 작성 가이드라인:
@@ -174,11 +194,9 @@ class BlogContentMakerFlow(Flow[BlogContentMakerState]):
                 -----------------------------
                 </research data>
                 """
-            )
         else:
-            # 블로그 remake
-            result = llm.call(
-                f"""
+            # 블로그 remake (지금까지 가장 높은 점수를 받은 게시물을 개선합니다)
+            prompt = f"""
             SEO 전문가의 분석에 따르면 '{self.state.topic}' 주제의 블로그 게시물(post)이 다음과 같은 이유로 개선이 필요합니다:
             **SEO 분석 결과**: {score_reason}
 
@@ -216,35 +234,81 @@ class BlogContentMakerFlow(Flow[BlogContentMakerState]):
             -----------------------------
             </research data>
             """
-            )
 
-        self.state.post = Post.model_validate_json(result)
+        # 관점만 다른 초안 N개를 동시에 생성하고, 형식이 깨진 초안은 버립니다.
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    llm.call,
+                    f"{prompt}\n\n이번 초안의 관점: {DRAFT_ANGLES[i % len(DRAFT_ANGLES)]}",
+                )
+                for i in range(self.state.candidates)
+            ),
+            return_exceptions=True,
+        )
+        self.state.drafts = []
+        for result in results:
+            try:
+                self.state.drafts.append(Post.model_validate_json(result))
+            except Exception as e:
+                print(f"초안 생성 실패: {e}")
 
     @listen(handle_make_blog)
-    def manage_seo(self):
+    async def manage_seo(self):
+
+        if not self.state.drafts:
+            print("평가할 초안이 없습니다.")
+
+        # 초안들을 동시에 채점합니다.
+        results = await asyncio.gather(
+            *(
+                SEOManagerCrew()
+                .crew()
+                .kickoff_async(
+                    inputs={
+                        "topic": self.state.topic,
+                        "post": draft.model_dump_json(),
+                    }
+                )
+                for draft in self.state.drafts
+            ),
+            return_exceptions=True,
+        )
 
-        if self.state.post is None:
-            raise ValueError("post가 없습니다.")
-
-        result = (
-            SEOManagerCrew()
-            .crew()
-            .kickoff(
-                inputs={
-                    "topic": self.state.topic,
-                    "post": self.state.post.model_dump_json(),
-                }
-            )
+        # 이전 라운드의 최고 게시물보다 나은 초안이 있을 때만 교체합니다.
+        for draft, result in zip(self.state.drafts, results):
+            if isinstance(result, BaseException) or result.pydantic is None:
+                print(f"SEO 채점 실패: {result}")
+                continue
+            score_manager: ScoreManager = result.pydantic  # type:ignore
+            if (
+                self.state.score_manager is None
+                or score_manager.score > self.state.score_manager.score
+            ):
+                self.state.post = draft
+                self.state.score_manager = score_manager
+
+        print(
+            f"라운드 {self.state.rounds}/{self.state.max_rounds}: "
+            f"초안 {len(self.state.drafts)}개, 최고 점수 "
+            f"{self.state.score_manager.score if self.state.score_manager else '-'}"
         )
-        self.state.score_manager = result.pydantic  # type:ignore
 
     @router(manage_seo)
     def manage_score_router(self):
 
         if self.state.score_manager is None:
-            raise ValueError("score_manager가 없습니다.")
+            if self.state.rounds >= self.state.max_rounds:
+                raise ValueError("score_manager가 없습니다.")
+            return "remake"
+
+        if self.state.score_manager.score >= TARGET_SEO_SCORE:
+            self._save_to_markdown()
+            return None
 
-        if self.state.score_manager.score >= 80:
+        elif self.state.rounds >= self.state.max_rounds:
+            # 무한 반복을 막기 위해 최대 라운드에 도달하면 가장 좋은 게시물을 저장하고 끝냅니다.
+            print(f"최대 라운드({self.state.max_rounds})에 도달하여 최고 점수 게시물을 저장합니다.")
             self._save_to_markdown()
             return None
 
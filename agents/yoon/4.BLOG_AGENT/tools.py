@@ -1,14 +1,22 @@
 from typing import Type
 from crewai.tools import BaseTool
-from firecrawl import Firecrawl
 from pydantic import BaseModel, Field
-from env import FIRECRAWL_API_KEY
+from search_cache import search_cache
+from firecrawl_client import get_firecrawl
+
+WEB_SEARCH_LIMIT = 5
 
 
 def _web_search(query: str):
-    firecrawl = Firecrawl(api_key=FIRECRAWL_API_KEY)
+    return search_cache.get_or_fetch(
+        "firecrawl", query, WEB_SEARCH_LIMIT, lambda: _fetch_web_search(query)
+    )
+
+
+def _fetch_web_search(query: str):
+    firecrawl = get_firecrawl()
 
-    response = firecrawl.search(query, limit=5, integration="crewai")
+    response = firecrawl.search(query, limit=WEB_SEARCH_LIMIT, integration="crewai")
 
     if not response:
         return f"No search results found for query: {query}"